@@ -5,14 +5,24 @@ Comprehensive simulation of global resource optimization and crisis response
 """
 
 import numpy as np
+import pandas as pd
 import random
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any
 from dataclasses import dataclass, field
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from collections import defaultdict, deque
 import math
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import networkx as nx
+from scipy import sparse
+from scipy.optimize import linprog
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class GlobalResource:
@@ -63,6 +73,27 @@ class Bioregion:
         resilience_change = adaptation_factor * 0.1 - crisis_impact * 0.05
         self.resilience_score = max(0.1, min(1.0, self.resilience_score + resilience_change))
 
+@dataclass
+class BioregionBaseData:
+    """Immutable bioregion characteristics shared by every trajectory of an ensemble"""
+    region_names: Tuple[str, ...]
+    resource_names: Tuple[str, ...]
+    profile: np.ndarray  # regions × (population, cooperation, resilience, innovation)
+    needs: np.ndarray  # regions × resources
+    production: np.ndarray  # regions × resources
+    
+    def pack(self) -> np.ndarray:
+        """Single regions × columns float table, the layout placed in shared memory"""
+        return np.hstack([self.profile, self.needs, self.production])
+    
+    @classmethod
+    def unpack(cls, table: np.ndarray, region_names: Tuple[str, ...],
+               resource_names: Tuple[str, ...]) -> 'BioregionBaseData':
+        """Build base data as views onto a packed table without copying it"""
+        num_resources = len(resource_names)
+        return cls(region_names, resource_names, table[:, :4], table[:, 4:4 + num_resources],
+                   table[:, 4 + num_resources:4 + 2 * num_resources])
+
 @dataclass
 class GlobalCrisis:
     """Represents a planetary crisis requiring coordinated response"""
@@ -80,132 +111,572 @@ class GlobalCrisis:
             return self.severity * (1.0 - self.response_effectiveness)
         return self.severity * 0.3 * (1.0 - self.response_effectiveness)
 
+class OptimizationHistory:
+    """
+    Append-only columnar record of optimization cycles.
+    
+    Allocations are kept in one cycles × resources × regions float array and
+    metrics in a cycles × metrics array, grown by doubling. With stride > 1
+    only every stride-th cycle is recorded; with max_records set, a full
+    history keeps every other record and doubles its stride, so memory stays
+    bounded however long the run.
+    """
+    
+    def __init__(self, resource_names: List[str], region_names: List[str],
+                 stride: int = 1, max_records: int = None, initial_capacity: int = 64):
+        if max_records is not None and max_records < 2:
+            raise ValueError("max_records must be at least 2")
+        
+        self.resource_names = list(resource_names)
+        self.region_names = list(region_names)
+        self.stride = stride
+        self.max_records = max_records
+        self.cycles_seen = 0
+        self.metric_names = []
+        self.labels = {}  # metric name -> interned string values, e.g. solver names
+        
+        capacity = initial_capacity if max_records is None else min(initial_capacity, max_records)
+        self._days = np.zeros(capacity, dtype=np.int64)
+        self._allocations = np.zeros((capacity, len(self.resource_names), len(self.region_names)))
+        self._metrics = np.zeros((capacity, 0))
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def days(self) -> np.ndarray:
+        return self._days[:self._size]
+    
+    @property
+    def allocations(self) -> np.ndarray:
+        """Recorded cycles × resources × regions allocations (a view, not a copy)"""
+        return self._allocations[:self._size]
+    
+    @property
+    def metrics(self) -> np.ndarray:
+        return self._metrics[:self._size]
+    
+    def metric(self, name: str) -> np.ndarray:
+        """One metric column across recorded cycles"""
+        return self.metrics[:, self.metric_names.index(name)]
+    
+    def append(self, day: int, allocations: np.ndarray, metrics: Dict[str, Any]):
+        """Record one cycle from a regions × resources allocation matrix"""
+        self.cycles_seen += 1
+        if (self.cycles_seen - 1) % self.stride:
+            return
+        
+        if self._size == len(self._days):
+            if self.max_records is not None and self._size >= self.max_records:
+                self._decimate()
+            else:
+                self._grow()
+        
+        for name in metrics:
+            if name not in self.metric_names:
+                self.metric_names.append(name)
+                self._metrics = np.hstack([self._metrics, np.zeros((len(self._metrics), 1))])
+        
+        row = self._metrics[self._size]
+        for name, value in metrics.items():
+            if isinstance(value, str):
+                labels = self.labels.setdefault(name, [])
+                if value not in labels:
+                    labels.append(value)
+                value = labels.index(value)
+            row[self.metric_names.index(name)] = value
+        
+        self._days[self._size] = day
+        self._allocations[self._size] = allocations.T
+        self._size += 1
+    
+    def _grow(self):
+        capacity = len(self._days) * 2
+        if self.max_records is not None:
+            capacity = min(capacity, self.max_records)
+        
+        self._days = np.resize(self._days, capacity)
+        self._allocations = np.concatenate([self._allocations, np.zeros_like(self._allocations[:capacity - self._size])])
+        self._metrics = np.concatenate([self._metrics, np.zeros((capacity - self._size, self._metrics.shape[1]))])
+    
+    def _decimate(self):
+        """Keep every other record and halve the recording rate from here on"""
+        keep = self._size // 2 + self._size % 2
+        self._days[:keep] = self._days[:self._size:2]
+        self._allocations[:keep] = self._allocations[:self._size:2]
+        self._metrics[:keep] = self._metrics[:self._size:2]
+        self._size = keep
+        self.stride *= 2
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Metrics per recorded cycle, indexed by day"""
+        frame = pd.DataFrame(self.metrics, columns=self.metric_names, index=pd.Index(self.days, name='day'))
+        for name, labels in self.labels.items():
+            frame[name] = np.array(labels)[frame[name].to_numpy(dtype=int)]
+        return frame
+
+class CrisisHistory:
+    """
+    Append-only columnar record of crisis responses.
+    
+    Crisis names and types are interned to integer codes; affected regions are
+    a boolean mask and reallocations are kept as per-resource totals, so no
+    crisis or response objects are retained. Columns are preallocated arrays
+    grown by doubling, like OptimizationHistory.
+    """
+    
+    def __init__(self, resource_names: List[str], region_names: List[str], initial_capacity: int = 64):
+        self.resource_names = list(resource_names)
+        self.region_names = list(region_names)
+        self.crisis_types = []
+        self.crisis_names = []
+        self._region_index = {name: i for i, name in enumerate(self.region_names)}
+        self._resource_index = {name: j for j, name in enumerate(self.resource_names)}
+        
+        self._days = np.zeros(initial_capacity, dtype=np.int64)
+        self._type_codes = np.zeros(initial_capacity, dtype=np.int64)
+        self._name_codes = np.zeros(initial_capacity, dtype=np.int64)
+        self._severities = np.zeros(initial_capacity)
+        self._effectiveness = np.zeros(initial_capacity)
+        self._affected = np.zeros((initial_capacity, len(self.region_names)), dtype=bool)
+        self._reallocations = np.zeros((initial_capacity, len(self.resource_names)))
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _intern(self, table: List[str], value: str) -> int:
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+    
+    def append(self, day: int, crisis: GlobalCrisis, response: Dict[str, Any]):
+        """Record one crisis response as a fixed-width row"""
+        if self._size == len(self._days):
+            self._grow()
+        
+        row = self._size
+        self._days[row] = day
+        self._type_codes[row] = self._intern(self.crisis_types, crisis.crisis_type)
+        self._name_codes[row] = self._intern(self.crisis_names, crisis.name)
+        self._severities[row] = crisis.severity
+        self._effectiveness[row] = response['effectiveness_score']
+        
+        affected = [self._region_index[name] for name in crisis.affected_regions if name in self._region_index]
+        self._affected[row, affected] = True
+        
+        for name, allocation in response['resource_reallocations'].items():
+            if name in self._resource_index:
+                self._reallocations[row, self._resource_index[name]] = sum(allocation.values())
+        self._size += 1
+    
+    def _grow(self):
+        capacity = len(self._days) * 2
+        self._days = np.resize(self._days, capacity)
+        self._type_codes = np.resize(self._type_codes, capacity)
+        self._name_codes = np.resize(self._name_codes, capacity)
+        self._severities = np.resize(self._severities, capacity)
+        self._effectiveness = np.resize(self._effectiveness, capacity)
+        self._affected = np.concatenate([self._affected, np.zeros_like(self._affected[:capacity - self._size])])
+        self._reallocations = np.concatenate([self._reallocations,
+                                              np.zeros_like(self._reallocations[:capacity - self._size])])
+    
+    @property
+    def days(self) -> np.ndarray:
+        return self._days[:self._size]
+    
+    @property
+    def severities(self) -> np.ndarray:
+        return self._severities[:self._size]
+    
+    @property
+    def effectiveness(self) -> np.ndarray:
+        return self._effectiveness[:self._size]
+    
+    @property
+    def type_codes(self) -> np.ndarray:
+        return self._type_codes[:self._size]
+    
+    @property
+    def name_codes(self) -> np.ndarray:
+        return self._name_codes[:self._size]
+    
+    @property
+    def affected_masks(self) -> np.ndarray:
+        """Recorded crises × regions affected mask (a view, not a copy)"""
+        return self._affected[:self._size]
+    
+    @property
+    def reallocations(self) -> np.ndarray:
+        """Recorded crises × resources reallocation totals (a view, not a copy)"""
+        return self._reallocations[:self._size]
+    
+    def recent_effectiveness(self, count: int) -> np.ndarray:
+        return self.effectiveness[-count:]
+    
+    def effectiveness_by_type(self) -> Dict[str, float]:
+        """Mean response effectiveness per crisis type"""
+        type_codes = self.type_codes
+        effectiveness = self.effectiveness
+        return {
+            crisis_type: float(effectiveness[type_codes == code].mean())
+            for code, crisis_type in enumerate(self.crisis_types)
+        }
+    
+    def to_frame(self) -> pd.DataFrame:
+        """One row per crisis with its type, severity, effectiveness and reallocation totals"""
+        frame = pd.DataFrame({
+            'day': self.days,
+            'crisis': np.array(self.crisis_names, dtype=object)[self.name_codes],
+            'crisis_type': np.array(self.crisis_types, dtype=object)[self.type_codes],
+            'severity': self.severities,
+            'affected_regions': self.affected_masks.sum(axis=1),
+            'effectiveness_score': self.effectiveness
+        })
+        for j, name in enumerate(self.resource_names):
+            frame[f'reallocated_{name}'] = self.reallocations[:, j]
+        return frame
+
 class WorldGameOptimizer:
     """Advanced optimization engine for planetary resource allocation"""
     
-    def __init__(self):
+    SOLVERS = ('greedy', 'lp', 'flow')
+    
+    def __init__(self, solver: str = 'greedy', time_budget: float = 1.0, reserve_fraction: float = 0.2):
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {self.SOLVERS}")
+        
+        self.solver = solver
+        self.time_budget = time_budget  # Seconds allowed for exact solvers
+        self.reserve_fraction = reserve_fraction
         self.optimization_history = []
         self.efficiency_metrics = {}
+        self.last_allocations = None  # regions × resources matrix from the latest cycle
         
     def optimize_global_allocation(self, resources: Dict[str, GlobalResource], 
                                  bioregions: Dict[str, Bioregion]) -> Dict[str, Dict[str, float]]:
         """Optimize resource allocation across all bioregions"""
-        allocation_plan = {}
+        region_names = list(bioregions.keys())
+        needs, priorities, supply = self._build_allocation_arrays(resources, bioregions)
         
-        for resource_name, resource in resources.items():
-            allocation_plan[resource_name] = self._optimize_single_resource(
-                resource, bioregions
-            )
+        if self.solver == 'greedy':
+            allocations, allocated, self.efficiency_metrics = self.solve_greedy(needs, priorities, supply)
+        else:
+            allocations, allocated, self.efficiency_metrics = self.solve_exact(needs, priorities, supply)
+        self.last_allocations = allocations
         
-        # Calculate and store efficiency metrics
-        self._calculate_efficiency_metrics(allocation_plan, resources, bioregions)
+        allocation_plan = {}
+        for j, resource_name in enumerate(resources):
+            rows = np.flatnonzero(allocated[:, j])
+            allocation_plan[resource_name] = {
+                region_names[i]: amount for i, amount in zip(rows.tolist(), allocations[rows, j].tolist())
+            }
         
         return allocation_plan
     
-    def _optimize_single_resource(self, resource: GlobalResource, 
-                                bioregions: Dict[str, Bioregion]) -> Dict[str, float]:
-        """Optimize allocation for a single resource using multi-objective optimization"""
-        total_need = sum(region.resource_needs.get(resource.name, 0) 
-                        for region in bioregions.values())
-        
-        if total_need == 0:
-            return {}
-        
-        allocation = {}
-        remaining_resource = resource.total_available
-        
-        # Priority-based allocation considering need, cooperation, and resilience
-        region_priorities = []
-        for region_name, region in bioregions.items():
-            need = region.resource_needs.get(resource.name, 0)
-            if need > 0:
-                # Multi-criteria priority calculation
-                priority = (
-                    need * 0.4 +  # Basic need weight
-                    (1.0 - region.cooperation_level) * need * 0.3 +  # Support struggling regions
-                    region.resilience_score * need * 0.2 +  # Reward resilient regions
-                    region.innovation_capacity * need * 0.1  # Support innovation
-                )
-                region_priorities.append((region_name, priority, need))
-        
-        # Sort by priority (highest first)
-        region_priorities.sort(key=lambda x: x[1], reverse=True)
-        
-        # Allocate resources based on priority and availability
-        for region_name, priority, need in region_priorities:
-            if remaining_resource <= 0:
-                break
-                
-            # Calculate fair allocation considering global constraints
-            allocation_amount = min(need, remaining_resource * 0.8)  # Reserve 20% for emergencies
-            allocation[region_name] = allocation_amount
-            remaining_resource -= allocation_amount
-        
-        return allocation
-    
-    def _calculate_efficiency_metrics(self, allocation_plan: Dict[str, Dict[str, float]], 
-                                    resources: Dict[str, GlobalResource], 
-                                    bioregions: Dict[str, Bioregion]):
-        """Calculate comprehensive efficiency metrics"""
-        total_efficiency = 0
-        resource_count = 0
-        
-        for resource_name, allocations in allocation_plan.items():
-            resource = resources[resource_name]
-            total_allocated = sum(allocations.values())
-            utilization_efficiency = total_allocated / resource.total_available
-            
-            # Calculate needs fulfillment efficiency
-            total_need = sum(region.resource_needs.get(resource_name, 0) 
-                           for region in bioregions.values())
-            fulfillment_efficiency = total_allocated / total_need if total_need > 0 else 1.0
-            
-            # Combined efficiency score
-            resource_efficiency = (utilization_efficiency + fulfillment_efficiency) / 2
-            total_efficiency += resource_efficiency
-            resource_count += 1
-        
-        self.efficiency_metrics['overall_efficiency'] = total_efficiency / resource_count if resource_count > 0 else 0
-        self.efficiency_metrics['waste_reduction'] = self._calculate_waste_reduction(allocation_plan, resources)
-        self.efficiency_metrics['needs_fulfillment'] = self._calculate_needs_fulfillment(allocation_plan, bioregions)
-
-    def _calculate_waste_reduction(self, allocation_plan: Dict[str, Dict[str, float]], 
-                                 resources: Dict[str, GlobalResource]) -> float:
-        """Calculate waste reduction percentage"""
-        total_waste = 0
-        total_available = 0
-        
-        for resource_name, allocations in allocation_plan.items():
-            resource = resources[resource_name]
-            allocated = sum(allocations.values())
-            waste = resource.total_available - allocated
-            total_waste += waste
-            total_available += resource.total_available
-        
-        waste_percentage = total_waste / total_available if total_available > 0 else 0
-        return (1.0 - waste_percentage) * 100  # Convert to waste reduction percentage
-
-    def _calculate_needs_fulfillment(self, allocation_plan: Dict[str, Dict[str, float]], 
-                                   bioregions: Dict[str, Bioregion]) -> float:
-        """Calculate overall needs fulfillment percentage"""
-        total_need = 0
-        total_fulfilled = 0
-        
-        for resource_name, allocations in allocation_plan.items():
-            for region_name, allocation in allocations.items():
-                region = bioregions[region_name]
-                need = region.resource_needs.get(resource_name, 0)
-                total_need += need
-                total_fulfilled += min(allocation, need)
+    def _build_allocation_arrays(self, resources: Dict[str, GlobalResource], 
+                                 bioregions: Dict[str, Bioregion]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build the bioregions × resources need and priority matrices and the supply vector"""
+        regions = list(bioregions.values())
+        needs = np.array([[region.resource_needs.get(name, 0) for name in resources] for region in regions],
+                         dtype=float).reshape(len(regions), len(resources))
+        
+        # Multi-criteria priority: basic need, support for struggling regions,
+        # reward for resilient regions and support for innovation
+        cooperation = np.array([region.cooperation_level for region in regions])
+        resilience = np.array([region.resilience_score for region in regions])
+        innovation = np.array([region.innovation_capacity for region in regions])
+        weights = 0.4 + (1.0 - cooperation) * 0.3 + resilience * 0.2 + innovation * 0.1
+        priorities = needs * weights[:, None]
+        
+        supply = np.array([resource.total_available for resource in resources.values()], dtype=float)
+        
+        return needs, priorities, supply
+    
+    def solve_greedy(self, needs: np.ndarray, priorities: np.ndarray,
+                     supply: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
+        """Greedy priority allocation with solver metrics against the common optimal bound"""
+        start = time.perf_counter()
+        allocations, allocated, metrics = self.allocate_arrays(needs, priorities, supply, self.reserve_fraction)
+        
+        metrics.update(self._solver_metrics('greedy', start, needs, priorities, supply, allocations))
+        return allocations, allocated, metrics
+    
+    def _allocatable_supply(self, needs: np.ndarray, supply: np.ndarray) -> np.ndarray:
+        """
+        Most of each resource the reserve rule can ever hand out.
+        
+        Every region served keeps reserve_fraction of what remains, so serving all
+        k regions that need a resource leaves supply * reserve_fraction**k behind.
+        This is a relaxation of the rule, not the rule itself: it caps the flow
+        network and the optimality bound, never a final allocation.
+        """
+        regions_in_need = (needs > 0).sum(axis=0)
+        return supply * (1.0 - self.reserve_fraction ** regions_in_need)
+    
+    def solve_exact(self, needs: np.ndarray, priorities: np.ndarray,
+                    supply: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
+        """
+        Exact allocation maximizing priority-weighted supply over regions × resources.
+        
+        Each unit given to a region is worth its priority weight, capped by the
+        region's need and by the greedy reserve rule: taking regions in the same
+        priority order, none receives more than (1 - reserve_fraction) of what the
+        regions before it left. The LP solves under that rule; the flow network
+        cannot express it, so its flow is cut back to the rule afterwards. Falls
+        back to the greedy allocator if the solver fails or the time budget runs out.
+        """
+        start = time.perf_counter()
+        weights = self._priority_weights(needs, priorities)
+        order = np.argsort(-priorities, axis=0, kind='stable')
+        
+        try:
+            if self.solver == 'lp':
+                allocations = self._solve_lp(needs, weights, supply, order)
+            else:
+                allocations = self._solve_min_cost_flow(needs, weights, self._allocatable_supply(needs, supply))
+                if allocations is not None:
+                    allocations = self._apply_reserve_rule(allocations, supply, order)
+        except Exception as e:
+            logger.warning(f"{self.solver} allocation solver failed, falling back to greedy: {e}")
+            allocations = None
+        
+        if allocations is None:
+            allocations, allocated, metrics = self.allocate_arrays(needs, priorities, supply, self.reserve_fraction)
+            metrics.update(self._solver_metrics('greedy_fallback', start, needs, priorities, supply, allocations))
+            return allocations, allocated, metrics
+        
+        allocated = allocations > 1e-9
+        metrics = self._calculate_efficiency_metrics(allocations, allocated, needs, supply)
+        metrics.update(self._solver_metrics(self.solver, start, needs, priorities, supply, allocations))
+        return allocations, allocated, metrics
+    
+    def _apply_reserve_rule(self, allocations: np.ndarray, supply: np.ndarray, order: np.ndarray) -> np.ndarray:
+        """Cut allocations back so that, in priority order, each keeps reserve_fraction of what remains"""
+        share = 1.0 - self.reserve_fraction
+        sorted_allocations = np.take_along_axis(allocations, order, axis=0)
+        remaining = np.asarray(supply, dtype=float).copy()
+        for rank in range(len(sorted_allocations)):
+            amount = np.clip(sorted_allocations[rank], 0.0, np.maximum(share * remaining, 0.0))
+            sorted_allocations[rank] = amount
+            remaining -= amount
+        
+        result = np.zeros_like(allocations)
+        np.put_along_axis(result, order, sorted_allocations, axis=0)
+        return result
+    
+    def _priority_weights(self, needs: np.ndarray, priorities: np.ndarray) -> np.ndarray:
+        """Per-unit priority weight of each region/resource cell"""
+        return np.divide(priorities, needs, out=np.zeros_like(priorities), where=needs > 0)
+    
+    def _solve_lp(self, needs: np.ndarray, weights: np.ndarray, supply: np.ndarray,
+                  order: np.ndarray) -> np.ndarray:
+        """
+        Solve the allocation LP under the reserve rule with HiGHS; returns None if the time budget ran out.
+        
+        Besides x[i, j] the LP carries cumulative variables c[r, j], the amount
+        of resource j given to the regions ranked 0..r in priority order. The
+        rule x[r] <= share * (supply - c[r-1]) then reads
+        c[r] - reserve_fraction * c[r-1] <= share * supply, keeping every row
+        at two or three nonzeros.
+        """
+        num_regions, num_resources = needs.shape
+        num_cells = num_regions * num_resources
+        share = 1.0 - self.reserve_fraction
+        
+        # x[i, j] is flattened row-major at i * num_resources + j; c[r, j] follows at num_cells + r * num_resources + j
+        ranks, resource_ids = np.divmod(np.arange(num_cells), num_resources)
+        x_columns = order.ravel() * num_resources + resource_ids
+        c_columns = num_cells + np.arange(num_cells)
+        has_previous = ranks > 0
+        previous_columns = c_columns[has_previous] - num_resources
+        rows = np.arange(num_cells)
+        
+        # c[r] - c[r-1] - x[order[r]] == 0
+        A_eq = sparse.csr_matrix(
+            (np.concatenate([np.ones(num_cells), -np.ones(num_cells), -np.ones(len(previous_columns))]),
+             (np.concatenate([rows, rows, rows[has_previous]]),
+              np.concatenate([c_columns, x_columns, previous_columns]))),
+            shape=(num_cells, 2 * num_cells))
+        
+        # c[r] - reserve_fraction * c[r-1] <= share * supply
+        A_ub = sparse.csr_matrix(
+            (np.concatenate([np.ones(num_cells), np.full(len(previous_columns), -self.reserve_fraction)]),
+             (np.concatenate([rows, rows[has_previous]]), np.concatenate([c_columns, previous_columns]))),
+            shape=(num_cells, 2 * num_cells))
+        b_ub = share * np.asarray(supply, dtype=float)[resource_ids]
+        
+        bounds = np.column_stack([np.zeros(2 * num_cells), np.concatenate([needs.ravel(), np.full(num_cells, np.inf)])])
+        objective = np.concatenate([-weights.ravel(), np.zeros(num_cells)])
+        
+        result = linprog(objective, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=np.zeros(num_cells), bounds=bounds,
+                         method='highs', options={'time_limit': self.time_budget})
+        
+        if not result.success:
+            logger.warning(f"Allocation LP did not solve within budget: {result.message}")
+            return None
+        return result.x[:num_cells].reshape(num_regions, num_resources)
+    
+    def _solve_min_cost_flow(self, needs: np.ndarray, weights: np.ndarray, capacity: np.ndarray,
+                             weight_scale: float = 1e6) -> np.ndarray:
+        """
+        Solve the allocation as a min-cost flow: source → resource → region → sink.
+        
+        networkx needs integral data, so quantities are floored to whole units and
+        weights scaled to integers. The solver cannot be interrupted, so a solve
+        that overruns the time budget is discarded in favour of the fallback.
+        """
+        num_regions, num_resources = needs.shape
+        start = time.perf_counter()
+        
+        graph = nx.DiGraph()
+        for j in range(num_resources):
+            graph.add_edge('source', ('resource', j), capacity=int(capacity[j]), weight=0)
+        
+        rows, cols = np.nonzero(needs >= 1)
+        costs = -np.round(weights[rows, cols] * weight_scale).astype(int)
+        graph.add_edges_from(
+            (('resource', j), ('region', i), {'capacity': int(need), 'weight': int(cost)})
+            for i, j, need, cost in zip(rows.tolist(), cols.tolist(), needs[rows, cols].tolist(), costs.tolist())
+        )
+        for i in np.unique(rows).tolist():
+            graph.add_edge(('region', i), 'sink', weight=0)
+        
+        if not graph.has_node('sink'):
+            return np.zeros_like(needs)
+        
+        flow = nx.max_flow_min_cost(graph, 'source', 'sink')
+        if time.perf_counter() - start > self.time_budget:
+            logger.warning("Min-cost flow allocation overran its time budget")
+            return None
+        
+        allocations = np.zeros_like(needs)
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            allocations[i, j] = flow[('resource', j)][('region', i)]
+        return allocations
+    
+    def _solver_metrics(self, solver: str, start: float, needs: np.ndarray, priorities: np.ndarray,
+                        supply: np.ndarray, allocations: np.ndarray) -> Dict[str, Any]:
+        """
+        Solve time, objective value and optimality gap against an upper bound.
+        
+        The bound relaxes the reserve rule to the per-resource cap of
+        _allocatable_supply, so it holds for every solver but is not attained in
+        general: even the LP, which is optimal under the rule, can show a gap.
+        """
+        weights = self._priority_weights(needs, priorities)
+        objective = float((weights * allocations).sum())
+        bound = self._optimal_objective(needs, weights, self._allocatable_supply(needs, supply))
+        gap = max(float((bound - objective) / bound), 0.0) if bound > 0 else 0.0
+        
+        return {
+            'solver': solver,
+            'solve_time': time.perf_counter() - start,
+            'objective_value': objective,
+            'optimality_gap': gap
+        }
+    
+    @staticmethod
+    def _optimal_objective(needs: np.ndarray, weights: np.ndarray, capacity: np.ndarray) -> float:
+        """
+        Optimal priority-weighted objective when each resource is only capped by capacity.
+        
+        Resources only share regions through the objective, so the problem splits
+        into one fractional knapsack per resource: fill needs in descending weight
+        order until the capacity runs out.
+        """
+        order = np.argsort(-weights, axis=0, kind='stable')
+        sorted_needs = np.take_along_axis(needs, order, axis=0)
+        sorted_weights = np.take_along_axis(weights, order, axis=0)
+        needs_before = np.cumsum(sorted_needs, axis=0) - sorted_needs
+        taken = np.clip(capacity[None, :] - needs_before, 0.0, sorted_needs)
+        return float((sorted_weights * taken).sum())
+    
+    def allocate_arrays(self, needs: np.ndarray, priorities: np.ndarray, supply: np.ndarray,
+                        reserve_fraction: float = 0.2) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
+        """
+        Priority allocation for all resources at once.
+        
+        Each column (resource) serves regions in descending priority order; a
+        region receives min(need, (1 - reserve_fraction) * remaining supply).
+        Returns the regions × resources allocation matrix, a mask of regions
+        that were served, and the efficiency metrics.
+        """
+        num_regions, num_resources = needs.shape
+        share = 1.0 - reserve_fraction
+        
+        order = np.argsort(-priorities, axis=0, kind='stable')
+        sorted_needs = np.take_along_axis(needs, order, axis=0)
+        has_need = sorted_needs > 0
+        
+        # Leading regions whose need fits inside the share of remaining supply
+        # are served in full, so that prefix is a single cumulative sum
+        needs_before = np.cumsum(sorted_needs, axis=0) - sorted_needs
+        fits = ~has_need | (sorted_needs < share * (supply - needs_before))
+        prefix_length = np.where(fits.all(axis=0), num_regions, np.argmin(fits, axis=0))
+        in_prefix = np.arange(num_regions)[:, None] < prefix_length[None, :]
+        
+        sorted_allocations = np.where(in_prefix, sorted_needs, 0.0)
+        served = in_prefix & has_need
+        remaining = supply - sorted_allocations.sum(axis=0)
+        
+        # Past the first binding region the reserve rule compounds, so walk the
+        # remaining ranks with one vector step across all resources per rank
+        for rank in range(int(prefix_length.min(initial=num_regions)), num_regions):
+            active = (rank >= prefix_length) & has_need[rank] & (remaining > 0)
+            if not active.any():
+                continue
+            amount = np.where(active, np.minimum(sorted_needs[rank], share * remaining), 0.0)
+            sorted_allocations[rank, active] = amount[active]
+            served[rank] |= active
+            remaining -= amount
+        
+        allocations = np.zeros_like(sorted_allocations)
+        allocated = np.zeros_like(served)
+        np.put_along_axis(allocations, order, sorted_allocations, axis=0)
+        np.put_along_axis(allocated, order, served, axis=0)
+        
+        return allocations, allocated, self._calculate_efficiency_metrics(allocations, allocated, needs, supply)
+    
+    def _calculate_efficiency_metrics(self, allocations: np.ndarray, allocated: np.ndarray,
+                                      needs: np.ndarray, supply: np.ndarray) -> Dict[str, float]:
+        """Calculate efficiency, waste reduction and needs fulfillment from the allocation matrix"""
+        total_allocated = allocations.sum(axis=0)
+        total_need = needs.sum(axis=0)
         
-        return (total_fulfilled / total_need * 100) if total_need > 0 else 100
+        utilization_efficiency = np.divide(total_allocated, supply, out=np.zeros_like(supply), where=supply > 0)
+        fulfillment_efficiency = np.divide(total_allocated, total_need, out=np.ones_like(total_need),
+                                           where=total_need > 0)
+        resource_efficiency = (utilization_efficiency + fulfillment_efficiency) / 2
+        
+        total_available = supply.sum()
+        waste_percentage = (total_available - total_allocated.sum()) / total_available if total_available > 0 else 0
+        
+        # Needs fulfillment only counts regions that received an allocation
+        served_need = needs[allocated].sum()
+        served_fulfilled = np.minimum(allocations, needs)[allocated].sum()
+        
+        return {
+            'overall_efficiency': float(resource_efficiency.mean()) if resource_efficiency.size else 0,
+            'waste_reduction': float(1.0 - waste_percentage) * 100,  # Convert to waste reduction percentage
+            'needs_fulfillment': float(served_fulfilled / served_need * 100) if served_need > 0 else 100
+        }
 
 class CrisisResponseSystem:
     """Advanced crisis response and management system"""
     
-    def __init__(self):
+    # Crisis types with response protocols, and the resources each protocol reallocates
+    CRISIS_TYPES = ('pandemic', 'climate', 'conflict')
+    REALLOCATION_RESOURCES = {
+        'pandemic': ('medical_supplies',),
+        'climate': ('renewable_energy', 'infrastructure_materials'),
+        'conflict': ('food_security', 'water_access', 'communication_infrastructure')
+    }
+    
+    def __init__(self, history_limit: int = 100):
         self.response_protocols = {}
-        self.response_history = []
+        self.response_history = deque(maxlen=history_limit)  # Recent responses only
         
     def respond_to_crisis(self, crisis: GlobalCrisis, resources: Dict[str, GlobalResource], 
                          bioregions: Dict[str, Bioregion]) -> Dict[str, Any]:
@@ -323,7 +794,7 @@ class CrisisResponseSystem:
                 reallocation[resource_name] = {}
                 
                 # Equal distribution to reduce resource-based conflicts
-                allocation_per_region = resource.total_available * 0.5 / len(crisis.affected_regions)
+                allocation_per_region = resource.total_available * 0.5 / max(len(crisis.affected_regions), 1)
                 for region_name in crisis.affected_regions:
                     reallocation[resource_name][region_name] = allocation_per_region
         
@@ -332,6 +803,9 @@ class CrisisResponseSystem:
     def _calculate_response_effectiveness(self, crisis: GlobalCrisis, response_plan: Dict[str, Any], 
                                         bioregions: Dict[str, Bioregion]) -> float:
         """Calculate overall response effectiveness score"""
+        if not crisis.affected_regions:
+            return 0.0  # A crisis that affects no region gets no response
+        
         effectiveness_factors = []
         
         # Response speed factor (immediate actions)
@@ -358,14 +832,186 @@ class CrisisResponseSystem:
         # Calculate weighted average
         return np.mean(effectiveness_factors)
 
+    def generate_crisis_scenarios(self, num_scenarios: int, region_names: List[str],
+                                  seed: int = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw crisis scenarios with the same distributions as the simulation's
+        crisis schedule: crisis type codes, severities and affected-region masks.
+        """
+        rng = np.random.default_rng(seed)
+        num_regions = len(region_names)
+        
+        crisis_types = rng.integers(0, len(self.CRISIS_TYPES), num_scenarios)
+        severity_ranges = np.array([[0.6, 0.9], [0.5, 0.8], [0.4, 0.7]])[crisis_types]
+        severities = rng.uniform(severity_ranges[:, 0], severity_ranges[:, 1])
+        
+        # 2-4 distinct affected regions per scenario
+        num_affected = rng.integers(2, min(4, num_regions) + 1, num_scenarios)
+        region_rank = np.argsort(rng.random((num_scenarios, num_regions)), axis=1)
+        affected_masks = region_rank < num_affected[:, None]
+        
+        return crisis_types, severities, affected_masks
+    
+    def evaluate_crisis_batch(self, crisis_types: np.ndarray, severities: np.ndarray,
+                              affected_masks: np.ndarray, resources: Dict[str, GlobalResource],
+                              bioregions: Dict[str, Bioregion], n_workers: int = 1,
+                              chunk_size: int = 50000) -> pd.DataFrame:
+        """
+        Evaluate many independent crisis scenarios against the current planetary state.
+        
+        crisis_types holds indices into CRISIS_TYPES (or the type names), severities
+        one value per scenario and affected_masks a scenarios × bioregions boolean
+        matrix in bioregion order. Returns one row per scenario with the
+        effectiveness score, its factors, total reallocation per resource and the
+        projected resilience after the crisis. Large sweeps are split into chunks
+        across a process pool when n_workers > 1.
+        """
+        crisis_types = np.asarray(crisis_types)
+        if crisis_types.dtype.kind in 'US':
+            type_index = {name: i for i, name in enumerate(self.CRISIS_TYPES)}
+            crisis_types = np.array([type_index.get(name, -1) for name in crisis_types.tolist()])
+        
+        regions = list(bioregions.values())
+        state = {
+            'resource_names': list(resources.keys()),
+            'resource_totals': np.array([r.total_available for r in resources.values()], dtype=float),
+            'population': np.array([r.population for r in regions], dtype=float),
+            'cooperation': np.array([r.cooperation_level for r in regions]),
+            'resilience': np.array([r.resilience_score for r in regions]),
+            'innovation': np.array([r.innovation_capacity for r in regions])
+        }
+        
+        chunks = [
+            (crisis_types[i:i + chunk_size], np.asarray(severities, dtype=float)[i:i + chunk_size],
+             np.asarray(affected_masks, dtype=bool)[i:i + chunk_size], state)
+            for i in range(0, len(crisis_types), chunk_size)
+        ]
+        
+        if n_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(_evaluate_crisis_chunk, chunks))
+        else:
+            results = [_evaluate_crisis_chunk(chunk) for chunk in chunks]
+        
+        if not results:
+            return pd.DataFrame()
+        
+        table = pd.concat([pd.DataFrame(result) for result in results], ignore_index=True)
+        table.index.name = 'scenario'
+        return table
+    
+    @classmethod
+    def compute_batch_reallocations(cls, crisis_types: np.ndarray, affected_masks: np.ndarray,
+                                    resource_names: List[str], resource_totals: np.ndarray,
+                                    population: np.ndarray, resilience: np.ndarray) -> np.ndarray:
+        """
+        Vectorized form of the per-type reallocation rules.
+        
+        Returns a scenarios × resources × bioregions tensor of emergency allocations.
+        """
+        num_scenarios, num_regions = affected_masks.shape
+        reallocations = np.zeros((num_scenarios, len(resource_names), num_regions))
+        resource_index = {name: j for j, name in enumerate(resource_names)}
+        affected = affected_masks.astype(float)
+        
+        pandemic = crisis_types == cls.CRISIS_TYPES.index('pandemic')
+        if pandemic.any() and 'medical_supplies' in resource_index:
+            # Medical supplies shared by population across affected regions
+            affected_population = affected[pandemic] * population[None, :]
+            total_population = affected_population.sum(axis=1, keepdims=True)
+            shares = np.divide(affected_population, total_population, out=np.zeros_like(affected_population),
+                               where=total_population > 0)
+            j = resource_index['medical_supplies']
+            reallocations[pandemic, j, :] = resource_totals[j] * 0.6 * shares
+        
+        climate = crisis_types == cls.CRISIS_TYPES.index('climate')
+        if climate.any():
+            # Energy and infrastructure weighted by regional vulnerability
+            vulnerability = affected[climate] * (1.0 - resilience)[None, :]
+            for name in cls.REALLOCATION_RESOURCES['climate']:
+                if name in resource_index:
+                    j = resource_index[name]
+                    reallocations[climate, j, :] = resource_totals[j] * 0.4 * vulnerability
+        
+        conflict = crisis_types == cls.CRISIS_TYPES.index('conflict')
+        if conflict.any():
+            # Equal distribution to reduce resource-based conflicts
+            equal_shares = affected[conflict] / np.maximum(affected[conflict].sum(axis=1, keepdims=True), 1)
+            for name in cls.REALLOCATION_RESOURCES['conflict']:
+                if name in resource_index:
+                    j = resource_index[name]
+                    reallocations[conflict, j, :] = resource_totals[j] * 0.5 * equal_shares
+        
+        return reallocations
+
+def _evaluate_crisis_chunk(chunk: Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Evaluate one chunk of crisis scenarios; module-level so process pools can pickle it"""
+    crisis_types, severities, affected_masks, state = chunk
+    resource_names = state['resource_names']
+    
+    reallocations = CrisisResponseSystem.compute_batch_reallocations(
+        crisis_types, affected_masks, resource_names, state['resource_totals'],
+        state['population'], state['resilience']
+    )
+    
+    # Response speed factor: every known crisis type has four immediate actions
+    known_type = crisis_types >= 0
+    speed_factor = np.where(known_type, 1.0, 0.0)
+    
+    # Resource allocation factor from the number of protocol resources available
+    reallocated_counts = np.array([
+        sum(name in resource_names for name in CrisisResponseSystem.REALLOCATION_RESOURCES[crisis_type])
+        for crisis_type in CrisisResponseSystem.CRISIS_TYPES
+    ])
+    counts = np.where(known_type, reallocated_counts[np.clip(crisis_types, 0, None)], 0)
+    allocation_factor = np.where(counts > 0, np.minimum(1.0, counts / 3.0), 0.5)
+    
+    # Regional cooperation and severity adjustment
+    affected = affected_masks.astype(float)
+    num_affected = affected.sum(axis=1)
+    cooperation_factor = (affected @ state['cooperation']) / np.maximum(num_affected, 1)
+    severity_adjustment = 1.0 - severities * 0.3
+    
+    # A crisis that affects no region gets no response
+    effectiveness = np.where(num_affected > 0,
+                             (speed_factor + allocation_factor + cooperation_factor + severity_adjustment) / 4, 0.0)
+    
+    # Projected resilience after applying the crisis impact to every region
+    impact = severities[:, None] * (1.0 - effectiveness)[:, None] * np.where(affected_masks, 1.0, 0.3)
+    adaptation = (state['cooperation'] * state['innovation'])[None, :]
+    resilience_after = np.clip(state['resilience'][None, :] + adaptation * 0.1 - impact * 0.05, 0.1, 1.0)
+    
+    crisis_type_names = np.array(CrisisResponseSystem.CRISIS_TYPES + ('unknown',))
+    columns = {
+        'crisis_type': crisis_type_names[np.where(known_type, crisis_types, -1)],
+        'severity': severities,
+        'affected_regions': num_affected.astype(int),
+        'speed_factor': speed_factor,
+        'allocation_factor': allocation_factor,
+        'cooperation_factor': cooperation_factor,
+        'severity_adjustment': severity_adjustment,
+        'effectiveness_score': effectiveness,
+        'mean_resilience_after': resilience_after.mean(axis=1),
+        'min_resilience_after': resilience_after.min(axis=1)
+    }
+    totals = reallocations.sum(axis=2)
+    for j, name in enumerate(resource_names):
+        columns[f'reallocated_{name}'] = totals[:, j]
+    
+    return columns
+
 class PlanetaryCoordinationSimulation:
     """Comprehensive planetary coordination and World Game simulation"""
     
-    def __init__(self):
+    def __init__(self, allocation_solver: str = 'greedy', solver_time_budget: float = 1.0,
+                 bioregion_data: 'BioregionBaseData' = None, rng: random.Random = None):
+        self.rng = rng if rng is not None else random  # The module-level generator unless given a local one
         self.resources = self._initialize_global_resources()
-        self.bioregions = self._initialize_bioregions()
-        self.world_game = WorldGameOptimizer()
+        self.bioregions = self._initialize_bioregions(bioregion_data)
+        self.world_game = WorldGameOptimizer(allocation_solver, solver_time_budget)
         self.crisis_system = CrisisResponseSystem()
+        self.optimization_history = OptimizationHistory(list(self.resources), list(self.bioregions))
+        self.crisis_history = CrisisHistory(list(self.resources), list(self.bioregions))
         self.simulation_history = []
         self.current_day = 0
         
@@ -410,9 +1056,32 @@ class PlanetaryCoordinationSimulation:
             )
         }
     
-    def _initialize_bioregions(self) -> Dict[str, Bioregion]:
-        """Initialize bioregional networks with diverse characteristics"""
+    def _initialize_bioregions(self, base_data: 'BioregionBaseData' = None) -> Dict[str, Bioregion]:
+        """Initialize bioregional networks, drawing new characteristics unless base data is given"""
+        if base_data is None:
+            base_data = self.generate_bioregion_base_data(self.rng)
+        
         bioregions = {}
+        for i, name in enumerate(base_data.region_names):
+            population, cooperation, resilience, innovation = base_data.profile[i].tolist()
+            bioregions[name] = Bioregion(
+                name=name,
+                population=int(population),
+                communities=[f"{name}_community_{k}" for k in range(1, 6)],
+                resource_needs=dict(zip(base_data.resource_names, base_data.needs[i].tolist())),
+                resource_production=dict(zip(base_data.resource_names, base_data.production[i].tolist())),
+                cooperation_level=cooperation,
+                resilience_score=resilience,
+                innovation_capacity=innovation
+            )
+        
+        return bioregions
+    
+    @staticmethod
+    def generate_bioregion_base_data(rng: random.Random = None) -> 'BioregionBaseData':
+        """Generate bioregional characteristics with randomized needs and production"""
+        if rng is None:
+            rng = random
         
         # Define bioregional characteristics
         region_configs = [
@@ -426,49 +1095,56 @@ class PlanetaryCoordinationSimulation:
             ('Middle_East', 200000000, 0.65, 0.6, 0.7)
         ]
         
+        # Generate realistic resource needs based on population
+        base_need_per_capita = {
+            'renewable_energy': 0.08,
+            'fresh_water': 0.05,
+            'food_security': 0.06,
+            'medical_supplies': 0.02,
+            'infrastructure_materials': 0.04,
+            'communication_infrastructure': 0.03
+        }
+        
+        needs = []
+        production = []
         for name, population, cooperation, resilience, innovation in region_configs:
-            # Generate realistic resource needs based on population
-            base_need_per_capita = {
-                'renewable_energy': 0.08,
-                'fresh_water': 0.05,
-                'food_security': 0.06,
-                'medical_supplies': 0.02,
-                'infrastructure_materials': 0.04,
-                'communication_infrastructure': 0.03
-            }
-            
-            resource_needs = {
-                resource: population * per_capita * random.uniform(0.8, 1.2)
-                for resource, per_capita in base_need_per_capita.items()
-            }
+            region_needs = [population * per_capita * rng.uniform(0.8, 1.2)
+                            for per_capita in base_need_per_capita.values()]
             
             # Generate resource production (some regions are net producers)
-            resource_production = {}
-            for resource in resource_needs:
-                production_factor = random.uniform(0.3, 1.5)  # Some regions produce more than they need
-                resource_production[resource] = resource_needs[resource] * production_factor
-            
-            bioregions[name] = Bioregion(
-                name=name,
-                population=population,
-                communities=[f"{name}_community_{i}" for i in range(1, 6)],
-                resource_needs=resource_needs,
-                resource_production=resource_production,
-                cooperation_level=cooperation,
-                resilience_score=resilience,
-                innovation_capacity=innovation
-            )
-        
-        return bioregions
+            production.append([need * rng.uniform(0.3, 1.5) for need in region_needs])
+            needs.append(region_needs)
+        
+        return BioregionBaseData(
+            region_names=tuple(config[0] for config in region_configs),
+            resource_names=tuple(base_need_per_capita),
+            profile=np.array([config[1:] for config in region_configs], dtype=float),
+            needs=np.array(needs),
+            production=np.array(production)
+        )
     
-    def run_comprehensive_simulation(self, days: int = 365) -> Dict[str, Any]:
-        """Run comprehensive planetary coordination simulation"""
-        print(f"🌍 Starting Comprehensive Planetary Coordination Simulation for {days} days...")
+    def run_comprehensive_simulation(self, days: int = 365, history_stride: int = 1,
+                                     max_history_records: int = None, verbose: bool = True) -> Dict[str, Any]:
+        """
+        Run comprehensive planetary coordination simulation.
+        
+        Optimization cycles and crisis responses are recorded in columnar
+        histories; history_stride and max_history_records downsample the
+        optimization history for multi-decade runs.
+        """
+        if verbose:
+            print(f"🌍 Starting Comprehensive Planetary Coordination Simulation for {days} days...")
+        
+        resource_names = list(self.resources.keys())
+        region_names = list(self.bioregions.keys())
+        self.optimization_history = OptimizationHistory(resource_names, region_names, stride=history_stride,
+                                                        max_records=max_history_records)
+        self.crisis_history = CrisisHistory(resource_names, region_names)
         
         simulation_results = {
             'daily_metrics': [],
-            'crisis_responses': [],
-            'optimization_results': [],
+            'crisis_history': self.crisis_history,
+            'optimization_history': self.optimization_history,
             'final_assessment': {}
         }
         
@@ -482,13 +1158,10 @@ class PlanetaryCoordinationSimulation:
             # Check for scheduled crises
             if day in scheduled_crises:
                 crisis = scheduled_crises[day]
-                print(f"Day {day}: 🚨 {crisis.name} crisis detected!")
+                if verbose:
+                    print(f"Day {day}: 🚨 {crisis.name} crisis detected!")
                 response = self.crisis_system.respond_to_crisis(crisis, self.resources, self.bioregions)
-                simulation_results['crisis_responses'].append({
-                    'day': day,
-                    'crisis': crisis,
-                    'response': response
-                })
+                self.crisis_history.append(day, crisis, response)
                 
                 # Apply crisis impacts to bioregions
                 for region_name, region in self.bioregions.items():
@@ -497,14 +1170,9 @@ class PlanetaryCoordinationSimulation:
             
             # Run daily World Game optimization
             if day % 7 == 0:  # Weekly optimization cycles
-                allocation_plan = self.world_game.optimize_global_allocation(
-                    self.resources, self.bioregions
-                )
-                simulation_results['optimization_results'].append({
-                    'day': day,
-                    'allocation_plan': allocation_plan,
-                    'efficiency_metrics': self.world_game.efficiency_metrics.copy()
-                })
+                self.world_game.optimize_global_allocation(self.resources, self.bioregions)
+                self.optimization_history.append(day, self.world_game.last_allocations,
+                                                 self.world_game.efficiency_metrics)
             
             # Update resource regeneration and sustainability
             for resource in self.resources.values():
@@ -519,15 +1187,16 @@ class PlanetaryCoordinationSimulation:
             })
             
             # Progress reporting
-            if day % 30 == 0:
+            if verbose and day % 30 == 0:
                 print(f"Day {day}: Global Efficiency: {daily_metrics.get('global_efficiency', 0):.1%}, "
                       f"Crisis Response Effectiveness: {daily_metrics.get('crisis_response_avg', 0):.1%}")
         
         # Calculate final assessment
         simulation_results['final_assessment'] = self._calculate_final_assessment(simulation_results)
         
-        print("🎉 Planetary Coordination Simulation Complete!")
-        self._print_final_results(simulation_results['final_assessment'])
+        if verbose:
+            print("🎉 Planetary Coordination Simulation Complete!")
+            self._print_final_results(simulation_results['final_assessment'])
         
         return simulation_results
     
@@ -536,15 +1205,15 @@ class PlanetaryCoordinationSimulation:
         crises = {}
         
         # Generate 3-5 crises over the simulation period
-        num_crises = random.randint(3, 5)
-        crisis_days = sorted(random.sample(range(30, days-30), num_crises))
+        num_crises = self.rng.randint(3, 5)
+        crisis_days = sorted(self.rng.sample(range(30, days-30), num_crises))
         
         crisis_types = ['pandemic', 'climate', 'conflict']
         crisis_templates = {
             'pandemic': {
                 'name': 'Global Health Emergency',
-                'severity': random.uniform(0.6, 0.9),
-                'duration_days': random.randint(60, 120),
+                'severity': self.rng.uniform(0.6, 0.9),
+                'duration_days': self.rng.randint(60, 120),
                 'resource_impacts': {
                     'medical_supplies': 2.5,
                     'food_security': 1.3,
@@ -553,8 +1222,8 @@ class PlanetaryCoordinationSimulation:
             },
             'climate': {
                 'name': 'Extreme Climate Event',
-                'severity': random.uniform(0.5, 0.8),
-                'duration_days': random.randint(30, 90),
+                'severity': self.rng.uniform(0.5, 0.8),
+                'duration_days': self.rng.randint(30, 90),
                 'resource_impacts': {
                     'renewable_energy': 1.8,
                     'fresh_water': 2.0,
@@ -563,8 +1232,8 @@ class PlanetaryCoordinationSimulation:
             },
             'conflict': {
                 'name': 'Resource Conflict',
-                'severity': random.uniform(0.4, 0.7),
-                'duration_days': random.randint(45, 150),
+                'severity': self.rng.uniform(0.4, 0.7),
+                'duration_days': self.rng.randint(45, 150),
                 'resource_impacts': {
                     'food_security': 1.5,
                     'infrastructure_materials': 1.4,
@@ -574,13 +1243,13 @@ class PlanetaryCoordinationSimulation:
         }
         
         for i, day in enumerate(crisis_days):
-            crisis_type = random.choice(crisis_types)
+            crisis_type = self.rng.choice(crisis_types)
             template = crisis_templates[crisis_type].copy()
             
             # Select affected regions (2-4 regions per crisis)
-            affected_regions = random.sample(
+            affected_regions = self.rng.sample(
                 list(self.bioregions.keys()), 
-                random.randint(2, 4)
+                self.rng.randint(2, 4)
             )
             
             crisis = GlobalCrisis(
@@ -617,10 +1286,8 @@ class PlanetaryCoordinationSimulation:
         metrics['global_resilience'] = np.mean(resilience_scores)
         
         # Crisis response effectiveness
-        if self.crisis_system.response_history:
-            recent_responses = [r['response']['effectiveness_score'] 
-                             for r in self.crisis_system.response_history[-5:]]  # Last 5 responses
-            metrics['crisis_response_avg'] = np.mean(recent_responses)
+        if len(self.crisis_history):
+            metrics['crisis_response_avg'] = self.crisis_history.recent_effectiveness(5).mean()  # Last 5 responses
         else:
             metrics['crisis_response_avg'] = 1.0  # No crises yet
         
@@ -643,40 +1310,20 @@ class PlanetaryCoordinationSimulation:
             assessment['final_carrying_capacity_adherence'] = final_metrics.get('carrying_capacity_adherence', 0) * 100
         
         # Crisis response analysis
-        if simulation_results['crisis_responses']:
-            crisis_effectiveness = [cr['response']['effectiveness_score'] 
-                                  for cr in simulation_results['crisis_responses']]
-            assessment['average_crisis_response_effectiveness'] = np.mean(crisis_effectiveness) * 100
-            assessment['total_crises_handled'] = len(simulation_results['crisis_responses'])
+        crisis_history = simulation_results['crisis_history']
+        if len(crisis_history):
+            assessment['average_crisis_response_effectiveness'] = crisis_history.effectiveness.mean() * 100
+            assessment['total_crises_handled'] = len(crisis_history)
             
             # Categorize crisis response effectiveness
-            pandemic_responses = [cr for cr in simulation_results['crisis_responses'] 
-                                if cr['crisis'].crisis_type == 'pandemic']
-            climate_responses = [cr for cr in simulation_results['crisis_responses'] 
-                               if cr['crisis'].crisis_type == 'climate']
-            conflict_responses = [cr for cr in simulation_results['crisis_responses'] 
-                                if cr['crisis'].crisis_type == 'conflict']
-            
-            if pandemic_responses:
-                assessment['pandemic_response_effectiveness'] = np.mean([
-                    cr['response']['effectiveness_score'] for cr in pandemic_responses
-                ]) * 100
-            
-            if climate_responses:
-                assessment['climate_response_effectiveness'] = np.mean([
-                    cr['response']['effectiveness_score'] for cr in climate_responses
-                ]) * 100
-            
-            if conflict_responses:
-                assessment['conflict_response_effectiveness'] = np.mean([
-                    cr['response']['effectiveness_score'] for cr in conflict_responses
-                ]) * 100
+            for crisis_type, effectiveness in crisis_history.effectiveness_by_type().items():
+                if crisis_type in ('pandemic', 'climate', 'conflict'):
+                    assessment[f'{crisis_type}_response_effectiveness'] = effectiveness * 100
         
         # Optimization performance
-        if simulation_results['optimization_results']:
-            optimization_efficiencies = [opt['efficiency_metrics'].get('overall_efficiency', 0) 
-                                       for opt in simulation_results['optimization_results']]
-            assessment['average_optimization_efficiency'] = np.mean(optimization_efficiencies) * 100
+        optimization_history = simulation_results['optimization_history']
+        if len(optimization_history) and 'overall_efficiency' in optimization_history.metric_names:
+            assessment['average_optimization_efficiency'] = optimization_history.metric('overall_efficiency').mean() * 100
         
         # Overall system performance grade
         performance_factors = [
@@ -731,6 +1378,111 @@ class PlanetaryCoordinationSimulation:
         
         print("\n" + "="*80)
 
+class PlanetaryEnsembleSimulation:
+    """
+    Ensemble of stochastic planetary trajectories over one set of bioregions.
+    
+    The bioregion base data is generated once and placed in shared memory;
+    worker processes attach to it read-only and each trajectory only builds
+    its own mutable state (resources, resilience, crises). Results are
+    summarized as distribution statistics across trajectories.
+    """
+    
+    SUMMARY_METRICS = ('global_efficiency', 'needs_fulfillment', 'global_resilience', 'global_cooperation',
+                       'resource_sustainability', 'crisis_response_avg', 'total_crises_handled',
+                       'overall_system_performance')
+    
+    def __init__(self, base_data: BioregionBaseData = None, allocation_solver: str = 'greedy',
+                 seed: int = None):
+        if base_data is None:
+            base_data = PlanetaryCoordinationSimulation.generate_bioregion_base_data(
+                random.Random(seed) if seed is not None else None)
+        
+        self.base_data = base_data
+        self.allocation_solver = allocation_solver
+        self.seed = seed if seed is not None else random.randrange(2**31)
+        self.trajectory_results = None
+    
+    def run(self, num_trajectories: int = 32, days: int = 365, n_workers: int = 1) -> Dict[str, pd.DataFrame]:
+        """Run the ensemble and return per-trajectory summaries and their distribution statistics"""
+        seeds = [self.seed + i for i in range(num_trajectories)]
+        
+        if n_workers > 1:
+            summaries = self._run_in_workers(seeds, days, n_workers)
+        else:
+            summaries = [_run_ensemble_trajectory(self.base_data, self.allocation_solver, seed, days)
+                         for seed in seeds]
+        
+        self.trajectory_results = pd.DataFrame(summaries, columns=('seed',) + self.SUMMARY_METRICS)
+        return {
+            'trajectories': self.trajectory_results,
+            'statistics': self.summarize(self.trajectory_results)
+        }
+    
+    def _run_in_workers(self, seeds: List[int], days: int, n_workers: int) -> List[Dict[str, float]]:
+        """Share the packed base data with worker processes and run one trajectory per task"""
+        table = self.base_data.pack()
+        block = shared_memory.SharedMemory(create=True, size=table.nbytes)
+        try:
+            shared_table = np.ndarray(table.shape, dtype=table.dtype, buffer=block.buf)
+            shared_table[:] = table
+            
+            init_args = (block.name, table.shape, self.base_data.region_names, self.base_data.resource_names)
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach_ensemble_worker,
+                                     initargs=init_args) as executor:
+                return list(executor.map(_run_shared_trajectory, [self.allocation_solver] * len(seeds),
+                                         seeds, [days] * len(seeds)))
+        finally:
+            block.close()
+            block.unlink()
+    
+    @staticmethod
+    def summarize(trajectories: pd.DataFrame) -> pd.DataFrame:
+        """Mean, spread and percentiles of each metric across trajectories"""
+        metrics = trajectories.drop(columns='seed')
+        return pd.DataFrame({
+            'mean': metrics.mean(),
+            'std': metrics.std(ddof=1) if len(metrics) > 1 else 0.0,
+            'min': metrics.min(),
+            'p05': metrics.quantile(0.05),
+            'p50': metrics.quantile(0.5),
+            'p95': metrics.quantile(0.95),
+            'max': metrics.max()
+        })
+
+# Per-process view of the ensemble's shared base data, set by the pool initializer
+_ensemble_worker_state = {}
+
+def _attach_ensemble_worker(block_name: str, shape: Tuple[int, int], region_names: Tuple[str, ...],
+                            resource_names: Tuple[str, ...]):
+    """Attach a worker process to the shared bioregion table"""
+    block = shared_memory.SharedMemory(name=block_name)
+    table = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    table.flags.writeable = False
+    
+    _ensemble_worker_state['block'] = block  # Keep the mapping alive for the worker's lifetime
+    _ensemble_worker_state['base_data'] = BioregionBaseData.unpack(table, region_names, resource_names)
+
+def _run_shared_trajectory(allocation_solver: str, seed: int, days: int) -> Dict[str, float]:
+    return _run_ensemble_trajectory(_ensemble_worker_state['base_data'], allocation_solver, seed, days)
+
+def _run_ensemble_trajectory(base_data: BioregionBaseData, allocation_solver: str, seed: int,
+                             days: int) -> Dict[str, float]:
+    """Run one seeded trajectory and reduce it to its summary metrics"""
+    simulation = PlanetaryCoordinationSimulation(allocation_solver, bioregion_data=base_data, rng=random.Random(seed))
+    results = simulation.run_comprehensive_simulation(days, max_history_records=64, verbose=False)
+    
+    final_metrics = results['daily_metrics'][-1]['metrics'] if results['daily_metrics'] else {}
+    assessment = results['final_assessment']
+    
+    summary = {'seed': seed}
+    for name in PlanetaryEnsembleSimulation.SUMMARY_METRICS:
+        summary[name] = final_metrics.get(name, np.nan)
+    summary['crisis_response_avg'] = assessment.get('average_crisis_response_effectiveness', 100.0) / 100
+    summary['total_crises_handled'] = assessment.get('total_crises_handled', 0)
+    summary['overall_system_performance'] = assessment.get('overall_system_performance', 0) / 100
+    return summary
+
 def main():
     """Run the comprehensive World Game and Planetary Coordination simulation"""
     print("🚀 Initializing LIFE System Planetary Coordination Simulation...")
@@ -744,8 +1496,8 @@ def main():
         # Convert results to JSON-serializable format
         json_results = {
             'final_assessment': results['final_assessment'],
-            'total_optimizations': len(results['optimization_results']),
-            'total_crises': len(results['crisis_responses']),
+            'total_optimizations': results['optimization_history'].cycles_seen,
+            'total_crises': len(results['crisis_history']),
             'simulation_days': len(results['daily_metrics'])
         }
         json.dump(json_results, f, indent=2)
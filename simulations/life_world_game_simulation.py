@@ -21,11 +21,16 @@ from enum import Enum
 import json
 import sqlite3
 from datetime import datetime, timedelta
+from bisect import bisect_right
+import heapq
+import itertools
 import math
 import random
 from collections import defaultdict
+from collections.abc import MutableMapping
 import networkx as nx
 from scipy.optimize import linprog
+from scipy.sparse.csgraph import shortest_path
 import uuid
 
 class ResourceCategory(Enum):
@@ -150,16 +155,139 @@ class CommunityNode:
                 return True
         return False
 
+class CommunityResourceTable:
+    """
+    Dense resource tensor owned by the WorldGameEngine.
+    
+    Shape is communities × resource categories × {production, consumption, storage}.
+    Rows are append-only so a community keeps its row for the engine's lifetime.
+    """
+    
+    PRODUCTION = 0
+    CONSUMPTION = 1
+    STORAGE = 2
+    
+    def __init__(self, categories: List[ResourceCategory], capacity: int = 64):
+        self.categories = list(categories)
+        self.category_index = {category: i for i, category in enumerate(self.categories)}
+        self.community_ids: List[str] = []
+        self.row_index: Dict[str, int] = {}
+        self._values = np.zeros((capacity, len(self.categories), 3))
+        
+        # Bumped on every write so derived matrices can be cached per step
+        self.version = 0
+        self._surplus_cache: Optional[Tuple[int, np.ndarray]] = None
+    
+    def __len__(self) -> int:
+        return len(self.community_ids)
+    
+    @property
+    def values(self) -> np.ndarray:
+        """Active rows of the tensor"""
+        return self._values[:len(self.community_ids)]
+    
+    def add_communities(self, community_ids: List[str]) -> np.ndarray:
+        """Reserve rows for new communities and return their row indices"""
+        start = len(self.community_ids)
+        end = start + len(community_ids)
+        
+        if end > self._values.shape[0]:
+            capacity = max(end, self._values.shape[0] * 2)
+            grown = np.zeros((capacity,) + self._values.shape[1:])
+            grown[:start] = self._values[:start]
+            self._values = grown
+        
+        for offset, community_id in enumerate(community_ids):
+            self.row_index[community_id] = start + offset
+        self.community_ids.extend(community_ids)
+        self.version += 1
+        
+        return np.arange(start, end)
+    
+    def get_value(self, row: int, category: ResourceCategory, column: int) -> float:
+        return float(self._values[row, self.category_index[category], column])
+    
+    def set_value(self, row: int, category: ResourceCategory, column: int, value: float):
+        self._values[row, self.category_index[category], column] = value
+        self.version += 1
+    
+    def set_rows(self, rows: np.ndarray, production: np.ndarray,
+                 consumption: np.ndarray, storage: np.ndarray):
+        """Write whole communities × categories blocks at once"""
+        self._values[rows, :, self.PRODUCTION] = production
+        self._values[rows, :, self.CONSUMPTION] = consumption
+        self._values[rows, :, self.STORAGE] = storage
+        self.version += 1
+    
+    def surplus_matrix(self) -> np.ndarray:
+        """Production minus consumption for every community and category, cached until the next write"""
+        if self._surplus_cache is None or self._surplus_cache[0] != self.version:
+            values = self.values
+            surplus = values[:, :, self.PRODUCTION] - values[:, :, self.CONSUMPTION]
+            self._surplus_cache = (self.version, surplus)
+        
+        return self._surplus_cache[1]
+
+class _ResourceRowView(MutableMapping):
+    """Dict-like view of one community's column in the CommunityResourceTable"""
+    
+    __slots__ = ('_table', '_row', '_column')
+    
+    def __init__(self, table: CommunityResourceTable, row: int, column: int):
+        self._table = table
+        self._row = row
+        self._column = column
+    
+    def __getitem__(self, category: ResourceCategory) -> float:
+        if category not in self._table.category_index:
+            raise KeyError(category)
+        return self._table.get_value(self._row, category, self._column)
+    
+    def __setitem__(self, category: ResourceCategory, value: float):
+        if category not in self._table.category_index:
+            raise KeyError(category)
+        self._table.set_value(self._row, category, self._column, value)
+    
+    def __delitem__(self, category: ResourceCategory):
+        raise TypeError("Resource categories cannot be removed from a community")
+    
+    def __iter__(self):
+        return iter(self._table.categories)
+    
+    def __len__(self) -> int:
+        return len(self._table.categories)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
 class WorldGameEngine:
     """
     Core engine for the World Game planetary coordination system
     """
     
-    def __init__(self):
+    # Tables rewritten as a whole by save_snapshot
+    SNAPSHOT_TABLES = ('communities', 'community_resources', 'network_edges', 'global_resources',
+                       'resource_allocations', 'challenges', 'decisions', 'engine_state')
+    
+    def __init__(self, db_path: str = ':memory:', overwrite: bool = False):
+        self.db_path = db_path
+        
         # Network structure
         self.communities: Dict[str, CommunityNode] = {}
         self.bioregions: Dict[str, List[str]] = defaultdict(list)
         self.network_graph = nx.Graph()
+        self.resource_table = CommunityResourceTable(list(ResourceCategory))
+        
+        # Dirty tracking: each input component carries a version that is bumped
+        # on every edit, and derived values are cached against those versions
+        self._component_versions: Dict[str, int] = defaultdict(int)
+        self._component_cache: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+        
+        # Running trust aggregates: per-community trust totals and the sum of
+        # per-community mean trust over communities with at least one relationship
+        self._trust_totals: Dict[str, float] = defaultdict(float)
+        self._trust_mean_sum = 0.0
+        self._trusting_communities = 0
         
         # Global resources
         self.global_resources: Dict[str, GlobalResource] = {}
@@ -172,6 +300,11 @@ class WorldGameEngine:
         self.active_proposals: Dict[str, Dict] = {}
         self.decision_history: List[Dict] = []
         
+        # Prefix sums over decision_history for O(log n) rolling-window metrics
+        self._decision_dates: List[datetime] = []
+        self._decision_prefix = {'participants': [0], 'participated': [0], 'approved': [0]}
+        self._successful_resolutions = 0
+        
         # Optimization parameters
         self.optimization_objectives = {
             'efficiency': 0.25,      # Resource utilization efficiency
@@ -180,6 +313,16 @@ class WorldGameEngine:
             'resilience': 0.20      # System resilience
         }
         
+        # Extra JSON-serializable state saved and restored with each snapshot,
+        # e.g. a simulator's clock and event schedule
+        self.checkpoint_state: Dict[str, Any] = {}
+        
+        # Coordination complexity averages exact shortest paths over all affected
+        # pairs; setting max_complexity_sources opts into estimating it from that
+        # many BFS sources, sampled with complexity_rng
+        self.max_complexity_sources: Optional[int] = None
+        self.complexity_rng = np.random.default_rng()
+        
         # Performance metrics
         self.coordination_effectiveness = 0.0
         self.resource_optimization_score = 0.0
@@ -187,18 +330,57 @@ class WorldGameEngine:
         self.challenge_resolution_rate = 0.0
         
         # Initialize database
-        self._initialize_database()
+        self._initialize_database(overwrite)
         
         # Initialize planetary resources
         self._initialize_global_resources()
     
-    def _initialize_database(self):
-        """Initialize SQLite database for World Game data"""
-        self.conn = sqlite3.connect(':memory:')
-        cursor = self.conn.cursor()
+    def _initialize_database(self, overwrite: bool = False):
+        """
+        Initialize SQLite database for World Game data
+        
+        A file that already holds World Game state is only cleared with
+        overwrite=True; use load_snapshot to continue from it instead.
+        """
+        self.conn = sqlite3.connect(self.db_path)
+        
+        if self.db_path != ':memory:':
+            # File-backed stores commit often; WAL keeps those commits cheap
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        
+        self._create_schema(self.conn)
+        
+        # A new engine starts a new run, so rows left by an earlier run must not
+        # mix with it; refuse to discard them unless asked to
+        if any(self.conn.execute(f'SELECT 1 FROM {name} LIMIT 1').fetchone() for name in self.SNAPSHOT_TABLES):
+            if not overwrite:
+                self.conn.close()
+                raise FileExistsError(f"{self.db_path} already holds World Game state; pass overwrite=True "
+                                      f"to replace it or use load_snapshot to continue from it")
+        
+        for name in self.SNAPSHOT_TABLES:
+            self.conn.execute(f'DELETE FROM {name}')
+        self._commit()
+    
+    def _commit(self):
+        """
+        Commit incremental writes.
+        
+        A file-backed store leaves them in the open transaction for save_snapshot
+        to commit, so the file always holds the last complete snapshot and a run
+        that fails between checkpoints can resume from a consistent state.
+        """
+        if self.db_path == ':memory:':
+            self.conn.commit()
+    
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """Create World Game tables if they do not already exist"""
+        cursor = conn.cursor()
         
         cursor.execute('''
-            CREATE TABLE communities (
+            CREATE TABLE IF NOT EXISTS communities (
                 id TEXT PRIMARY KEY,
                 name TEXT,
                 population INTEGER,
@@ -206,12 +388,34 @@ class WorldGameEngine:
                 longitude REAL,
                 bioregion TEXT,
                 participation_level REAL,
-                decision_weight REAL
+                decision_weight REAL,
+                expertise_areas TEXT,
+                innovation_capacity REAL,
+                coordination_capacity REAL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS community_resources (
+                community_id TEXT,
+                category TEXT,
+                production REAL,
+                consumption REAL,
+                storage REAL,
+                PRIMARY KEY (community_id, category)
             )
         ''')
         
         cursor.execute('''
-            CREATE TABLE global_resources (
+            CREATE TABLE IF NOT EXISTS network_edges (
+                source TEXT,
+                target TEXT,
+                trust REAL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS global_resources (
                 id TEXT PRIMARY KEY,
                 category TEXT,
                 total_available REAL,
@@ -224,7 +428,15 @@ class WorldGameEngine:
         ''')
         
         cursor.execute('''
-            CREATE TABLE challenges (
+            CREATE TABLE IF NOT EXISTS resource_allocations (
+                resource_id TEXT,
+                community_id TEXT,
+                amount REAL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS challenges (
                 id TEXT PRIMARY KEY,
                 type TEXT,
                 severity REAL,
@@ -232,12 +444,15 @@ class WorldGameEngine:
                 coordination_complexity REAL,
                 status TEXT,
                 created_date TEXT,
-                resolved_date TEXT
+                resolved_date TEXT,
+                affected_regions TEXT,
+                required_resources TEXT,
+                success_probability REAL
             )
         ''')
         
         cursor.execute('''
-            CREATE TABLE decisions (
+            CREATE TABLE IF NOT EXISTS decisions (
                 id TEXT PRIMARY KEY,
                 proposal_title TEXT,
                 decision_scope TEXT,
@@ -249,11 +464,21 @@ class WorldGameEngine:
                 result TEXT,
                 implementation_status TEXT,
                 created_date TEXT,
-                decided_date TEXT
+                decided_date TEXT,
+                weighted_for REAL,
+                weighted_against REAL,
+                weighted_abstain REAL
             )
         ''')
         
-        self.conn.commit()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS engine_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        
+        conn.commit()
     
     def _initialize_global_resources(self):
         """Initialize global resource tracking"""
@@ -320,6 +545,8 @@ class WorldGameEngine:
             
             self.global_resources[resource.resource_id] = resource
             self._save_resource_to_db(resource)
+        
+        self._mark_dirty('resources')
     
     def add_community(self, community_id: str, name: str, population: int,
                      location: Tuple[float, float], bioregion: str) -> CommunityNode:
@@ -333,6 +560,8 @@ class WorldGameEngine:
         )
         
         # Initialize resource capabilities based on population and location
+        rows = self.resource_table.add_communities([community_id])
+        self._attach_resource_views(community, int(rows[0]))
         self._initialize_community_resources(community)
         
         # Add to network structures
@@ -343,12 +572,62 @@ class WorldGameEngine:
             'population': population,
             'bioregion': bioregion
         })
+        self._mark_dirty('graph')
         
         # Save to database
         self._save_community_to_db(community)
         
         return community
     
+    def add_communities_bulk(self, community_ids: List[str], names: List[str],
+                             populations: np.ndarray, locations: np.ndarray,
+                             bioregions: List[str]) -> List[CommunityNode]:
+        """Add many communities at once with a single database transaction"""
+        populations = np.asarray(populations, dtype=int)
+        locations = np.asarray(locations, dtype=float)
+        
+        communities = [
+            CommunityNode(
+                community_id=community_id,
+                name=name,
+                population=int(population),
+                location=(float(lat), float(lon)),
+                bioregion=bioregion
+            )
+            for community_id, name, population, (lat, lon), bioregion
+            in zip(community_ids, names, populations, locations, bioregions)
+        ]
+        
+        rows = self.resource_table.add_communities([c.community_id for c in communities])
+        for community, row in zip(communities, rows.tolist()):
+            self._attach_resource_views(community, row)
+        self._initialize_community_resources_bulk(communities, rows)
+        
+        for community in communities:
+            self.communities[community.community_id] = community
+            self.bioregions[community.bioregion].append(community.community_id)
+        
+        self.network_graph.add_nodes_from(
+            (community.community_id, {
+                'name': community.name,
+                'population': community.population,
+                'bioregion': community.bioregion
+            })
+            for community in communities
+        )
+        self._mark_dirty('graph')
+        
+        self._save_communities_to_db(communities)
+        
+        return communities
+    
+    def _attach_resource_views(self, community: CommunityNode, row: int):
+        """Back a community's resource dicts with its row in the engine resource tensor"""
+        table = self.resource_table
+        community.resource_production = _ResourceRowView(table, row, table.PRODUCTION)
+        community.resource_consumption = _ResourceRowView(table, row, table.CONSUMPTION)
+        community.resource_storage = _ResourceRowView(table, row, table.STORAGE)
+    
     def _initialize_community_resources(self, community: CommunityNode):
         """Initialize resource production/consumption for a community"""
         base_production = community.population * 0.1
@@ -386,6 +665,51 @@ class WorldGameEngine:
         community.innovation_capacity = random.uniform(0.3, 1.0)
         community.coordination_capacity = random.uniform(0.4, 1.0)
     
+    def _initialize_community_resources_bulk(self, communities: List[CommunityNode], rows: np.ndarray):
+        """Vectorized equivalent of _initialize_community_resources for many communities"""
+        num_communities = len(communities)
+        if num_communities == 0:
+            return
+        
+        categories = self.resource_table.categories
+        populations = np.array([c.population for c in communities], dtype=float)
+        base_production = populations[:, None] * 0.1
+        base_consumption = populations[:, None] * 0.08
+        shape = (num_communities, len(categories))
+        
+        # Same per-category factor ranges as the scalar initializer
+        production = base_production * np.random.uniform(0.3, 1.5, shape)
+        consumption = base_consumption * np.random.uniform(0.5, 1.2, shape)
+        
+        knowledge = categories.index(ResourceCategory.KNOWLEDGE)
+        production[:, knowledge] = base_production[:, 0] * np.random.uniform(0.5, 2.0, num_communities)
+        consumption[:, knowledge] = base_consumption[:, 0] * np.random.uniform(0.3, 0.8, num_communities)
+        
+        ecosystem = categories.index(ResourceCategory.ECOSYSTEM_HEALTH)
+        production[:, ecosystem] = np.random.uniform(0.1, 1.0, num_communities)
+        consumption[:, ecosystem] = np.random.uniform(0.05, 0.5, num_communities)
+        
+        storage = production * 10  # 10 days storage
+        
+        expertise_options = np.array([
+            'renewable_energy', 'sustainable_agriculture', 'water_management',
+            'ecosystem_restoration', 'education', 'healthcare', 'technology',
+            'governance', 'conflict_resolution', 'disaster_response'
+        ])
+        
+        # Random permutation per row, keep the first 2-4 entries
+        expertise_order = np.argsort(np.random.random((num_communities, len(expertise_options))), axis=1)
+        num_expertise = np.random.randint(2, 5, num_communities)
+        innovation = np.random.uniform(0.3, 1.0, num_communities)
+        coordination = np.random.uniform(0.4, 1.0, num_communities)
+        
+        self.resource_table.set_rows(rows, production, consumption, storage)
+        
+        for i, community in enumerate(communities):
+            community.expertise_areas = expertise_options[expertise_order[i, :num_expertise[i]]].tolist()
+            community.innovation_capacity = float(innovation[i])
+            community.coordination_capacity = float(coordination[i])
+    
     def connect_communities(self, community1_id: str, community2_id: str, trust_level: float = 0.5):
         """Create connection between two communities"""
         if community1_id not in self.communities or community2_id not in self.communities:
@@ -393,18 +717,60 @@ class WorldGameEngine:
         
         # Add to network graph
         self.network_graph.add_edge(community1_id, community2_id, trust=trust_level)
+        self._mark_dirty('graph')
         
         # Update community relationships
         self.communities[community1_id].partner_communities.add(community2_id)
         self.communities[community2_id].partner_communities.add(community1_id)
         
-        self.communities[community1_id].trust_relationships[community2_id] = trust_level
-        self.communities[community2_id].trust_relationships[community1_id] = trust_level
+        self._record_trust(self.communities[community1_id], community2_id, trust_level)
+        self._record_trust(self.communities[community2_id], community1_id, trust_level)
+    
+    def connect_communities_bulk(self, sources: List[str], targets: List[str],
+                                 trust_levels: np.ndarray):
+        """Create many connections at once from parallel edge lists"""
+        trust_levels = np.asarray(trust_levels, dtype=float).tolist()
+        
+        missing = (set(sources) | set(targets)) - self.communities.keys()
+        if missing:
+            raise ValueError("Both communities must exist")
+        
+        self.network_graph.add_edges_from(
+            (source, target, {'trust': trust})
+            for source, target, trust in zip(sources, targets, trust_levels)
+        )
+        self._mark_dirty('graph')
+        
+        communities = self.communities
+        record_trust = self._record_trust
+        for source, target, trust in zip(sources, targets, trust_levels):
+            source_node = communities[source]
+            target_node = communities[target]
+            source_node.partner_communities.add(target)
+            target_node.partner_communities.add(source)
+            record_trust(source_node, target, trust)
+            record_trust(target_node, source, trust)
+    
+    def _record_trust(self, community: CommunityNode, partner_id: str, trust_level: float):
+        """Set a trust relationship and keep the running trust averages in step"""
+        relationships = community.trust_relationships
+        count = len(relationships)
+        total = self._trust_totals[community.community_id]
+        
+        if count:
+            self._trust_mean_sum -= total / count
+        else:
+            self._trusting_communities += 1
+        
+        total += trust_level - relationships.get(partner_id, 0.0)
+        relationships[partner_id] = trust_level
+        self._trust_totals[community.community_id] = total
+        self._trust_mean_sum += total / len(relationships)
     
     def create_global_challenge(self, challenge_type: ChallengeType, severity: float,
                               affected_regions: List[str], time_sensitivity: float) -> GlobalChallenge:
         """Create a new global challenge requiring coordination"""
-        challenge_id = f"challenge_{len(self.active_challenges):04d}"
+        challenge_id = f"challenge_{len(self.active_challenges) + len(self.resolved_challenges):04d}"
         
         # Determine required resources based on challenge type
         required_resources = self._calculate_challenge_requirements(challenge_type, severity)
@@ -420,6 +786,7 @@ class WorldGameEngine:
         )
         
         self.active_challenges[challenge_id] = challenge
+        self._mark_dirty('challenges')
         self._save_challenge_to_db(challenge)
         
         return challenge
@@ -481,18 +848,13 @@ class WorldGameEngine:
             if len(affected_communities) > 1:
                 # Calculate average shortest path between affected communities
                 try:
-                    paths = []
-                    for i, comm1 in enumerate(affected_communities):
-                        for comm2 in affected_communities[i+1:]:
-                            if self.network_graph.has_node(comm1) and self.network_graph.has_node(comm2):
-                                try:
-                                    path_length = nx.shortest_path_length(self.network_graph, comm1, comm2)
-                                    paths.append(path_length)
-                                except nx.NetworkXNoPath:
-                                    paths.append(10)  # High penalty for disconnected communities
+                    node_index, adjacency = self._get_adjacency_matrix()
+                    affected = np.array([node_index[c] for c in affected_communities if c in node_index])
                     
-                    if paths:
-                        avg_path_length = np.mean(paths)
+                    num_paths, total_length = self._affected_path_lengths(adjacency, affected)
+                    
+                    if num_paths > 0:
+                        avg_path_length = total_length / num_paths
                         network_complexity = min(1.0, avg_path_length / 5)
                     else:
                         network_complexity = 0.5
@@ -505,10 +867,95 @@ class WorldGameEngine:
         
         return (region_complexity * 0.6 + network_complexity * 0.4)
     
+    def _affected_path_lengths(self, adjacency, affected: np.ndarray,
+                               max_cells: int = 4_000_000) -> Tuple[int, float]:
+        """
+        Number and total length of shortest paths between affected communities
+        
+        Runs batched BFS over blocks of sources so each block's distance rows stay
+        under max_cells. Every unordered pair counts once unless max_complexity_sources
+        opts into a sample of sources, which counts each source's paths to all others.
+        """
+        sample = self.max_complexity_sources
+        exact = sample is None or len(affected) <= sample
+        sources = affected if exact else self.complexity_rng.choice(affected, sample, replace=False)
+        
+        num_paths, total_length = 0, 0.0
+        block = max(1, max_cells // max(adjacency.shape[0], 1))
+        columns = np.arange(len(affected))
+        for start in range(0, len(sources), block):
+            rows = np.arange(start, min(len(sources), start + block))
+            distances = shortest_path(adjacency, unweighted=True, indices=sources[rows])[:, affected]
+            distances[np.isinf(distances)] = 10  # High penalty for disconnected communities
+            
+            if exact:
+                paths = distances[columns[None, :] > rows[:, None]]
+            else:
+                paths = distances[sources[rows, None] != affected[None, :]]
+            num_paths += len(paths)
+            total_length += paths.sum()
+        
+        return num_paths, total_length
+    
+    def compute_resource_surplus(self) -> np.ndarray:
+        """Communities × categories surplus matrix, recomputed only after resource writes"""
+        return self.resource_table.surplus_matrix()
+    
+    def get_challenge_requirement_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Challenges × categories requirement matrix; NaN marks resources a challenge does not need"""
+        table = self.resource_table
+        challenge_ids = list(self.active_challenges.keys())
+        requirements = np.full((len(challenge_ids), len(table.categories)), np.nan)
+        
+        for i, challenge_id in enumerate(challenge_ids):
+            for category, amount in self.active_challenges[challenge_id].required_resources.items():
+                requirements[i, table.category_index[category]] = amount
+        
+        return challenge_ids, requirements
+    
+    def get_contribution_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Communities × active challenges boolean matrix, the batched form of
+        CommunityNode.can_contribute_to_challenge for every pair at once
+        """
+        challenge_ids, requirements = self.get_challenge_requirement_matrix()
+        surplus = self.compute_resource_surplus()
+        
+        # NaN requirements compare False, so only required categories count
+        can_contribute = (surplus[:, None, :] > requirements[None, :, :] * 0.1).any(axis=2)  # Can contribute 10%
+        
+        return challenge_ids, can_contribute
+    
+    def _mark_dirty(self, *components: str):
+        """Invalidate cached values derived from the given input components"""
+        for component in components:
+            self._component_versions[component] += 1
+    
+    def _get_cached_component(self, name: str, dependencies: Tuple[str, ...], compute) -> Any:
+        """Return a cached derived value, recomputing it only if a dependency changed"""
+        key = tuple(self._component_versions[dependency] for dependency in dependencies)
+        cached = self._component_cache.get(name)
+        
+        if cached is None or cached[0] != key:
+            cached = (key, compute())
+            self._component_cache[name] = cached
+        
+        return cached[1]
+    
+    def _get_adjacency_matrix(self) -> Tuple[Dict[str, int], Any]:
+        """Return the network as a CSR adjacency matrix, rebuilt only after graph edits"""
+        def build():
+            nodelist = list(self.network_graph.nodes)
+            adjacency = nx.to_scipy_sparse_array(self.network_graph, nodelist=nodelist,
+                                                 weight=None, format='csr')
+            return {node: i for i, node in enumerate(nodelist)}, adjacency
+        
+        return self._get_cached_component('adjacency', ('graph',), build)
+    
     def create_proposal(self, title: str, description: str, scope: DecisionScope,
                        proposed_actions: List[Dict], proposer_community: str) -> str:
         """Create a new proposal for community voting"""
-        proposal_id = f"proposal_{len(self.active_proposals):04d}"
+        proposal_id = f"proposal_{len(self.active_proposals) + len(self.decision_history):04d}"
         
         proposal = {
             'proposal_id': proposal_id,
@@ -639,7 +1086,7 @@ class WorldGameEngine:
         }
         
         # Move to decision history
-        self.decision_history.append(decision_record)
+        self._record_decision(decision_record)
         del self.active_proposals[proposal_id]
         
         # Save to database
@@ -668,6 +1115,18 @@ class WorldGameEngine:
         # Update implementation status
         decision_record['implementation_status'] = 'completed'
     
+    def _implement_network_expansion(self, action: Dict):
+        """Implement network expansion action"""
+        for community1_id, community2_id, trust_level in action.get('connections', []):
+            if community1_id in self.communities and community2_id in self.communities:
+                self.connect_communities(community1_id, community2_id, trust_level)
+    
+    def _implement_policy_change(self, action: Dict):
+        """Implement policy change action"""
+        for objective, weight in action.get('optimization_objectives', {}).items():
+            if objective in self.optimization_objectives:
+                self.optimization_objectives[objective] = weight
+    
     def _implement_resource_allocation(self, action: Dict):
         """Implement resource allocation action"""
         resource_id = action.get('resource_id')
@@ -680,6 +1139,7 @@ class WorldGameEngine:
             for community_id, amount in allocations.items():
                 if community_id in self.communities:
                     resource.current_allocation[community_id] = amount
+            self._mark_dirty('resources')
     
     def _implement_challenge_response(self, action: Dict):
         """Implement challenge response action"""
@@ -722,6 +1182,8 @@ class WorldGameEngine:
             # Move to resolved challenges
             self.resolved_challenges.append(challenge)
             del self.active_challenges[challenge_id]
+            self._successful_resolutions += int(success)
+            self._mark_dirty('challenges')
             
             # Update challenge in database
             cursor = self.conn.cursor()
@@ -731,7 +1193,21 @@ class WorldGameEngine:
                 WHERE id = ?
             ''', ('resolved_success' if success else 'resolved_failure', 
                   challenge.resolved_date.isoformat(), challenge_id))
-            self.conn.commit()
+            self._commit()
+    
+    def advance_challenge_timers(self, days: float = 1):
+        """Count down challenge deadlines and fail challenges that expire"""
+        if not self.active_challenges:
+            return
+        
+        for challenge in list(self.active_challenges.values()):
+            challenge.time_sensitivity -= days
+            
+            # Remove expired challenges
+            if challenge.time_sensitivity <= 0:
+                self._resolve_challenge(challenge.challenge_id, False)
+        
+        self._mark_dirty('challenges')
     
     def optimize_global_resources(self) -> Dict:
         """Optimize global resource allocation using linear programming"""
@@ -749,18 +1225,16 @@ class WorldGameEngine:
         num_variables = num_communities * num_resources
         
         # Objective function coefficients (maximize total utility)
-        c = []
-        for i, community_id in enumerate(communities):
-            community = self.communities[community_id]
-            for j, resource_id in enumerate(resources):
-                resource = self.global_resources[resource_id]
-                
-                # Utility based on community need and resource scarcity
-                need = community.resource_consumption.get(resource.category, 0.0)
-                scarcity = resource.get_utilization_rate()
-                utility = need * (1.0 + scarcity)  # Higher utility for scarce resources
-                
-                c.append(-utility)  # Negative because linprog minimizes
+        table = self.resource_table
+        rows = [table.row_index[community_id] for community_id in communities]
+        categories = [table.category_index[self.global_resources[r].category] for r in resources]
+        
+        # Utility based on community need and resource scarcity
+        need = table.values[rows][:, categories, table.CONSUMPTION]
+        scarcity = np.array([self.global_resources[r].get_utilization_rate() for r in resources])
+        utility = need * (1.0 + scarcity)[None, :]  # Higher utility for scarce resources
+        
+        c = -utility.ravel()  # Negative because linprog minimizes
         
         # Constraints
         A_ub = []  # Inequality constraints (Ax <= b)
@@ -802,6 +1276,7 @@ class WorldGameEngine:
                         amount = allocation_results[community_id][resource_id]
                         if amount > 0.01:  # Only store significant allocations
                             resource.current_allocation[community_id] = amount
+                self._mark_dirty('resources')
                 
                 return {
                     'success': True,
@@ -937,47 +1412,36 @@ class WorldGameEngine:
             'decision_record': decision
         }
     
-    def get_system_metrics(self) -> Dict:
-        """Get comprehensive World Game system metrics"""
-        if not self.communities:
-            return {}
+    def _record_decision(self, decision_record: Dict):
+        """Append a decision and extend the prefix sums used for windowed metrics"""
+        self.decision_history.append(decision_record)
+        self._decision_dates.append(decision_record['decided_date'])
         
-        # Calculate coordination effectiveness
+        prefix = self._decision_prefix
+        prefix['participants'].append(prefix['participants'][-1] + decision_record['participants'])
+        prefix['participated'].append(prefix['participated'][-1] + decision_record['votes_for'] +
+                                      decision_record['votes_against'] + decision_record['abstentions'])
+        prefix['approved'].append(prefix['approved'][-1] + (decision_record['result'] == 'approved'))
+    
+    def _compute_network_metrics(self) -> Dict:
+        """Network density and average trust; depends only on graph edits"""
         total_connections = self.network_graph.number_of_edges()
         possible_connections = len(self.communities) * (len(self.communities) - 1) / 2
         network_density = total_connections / possible_connections if possible_connections > 0 else 0
         
-        avg_trust = np.mean([
-            np.mean(list(community.trust_relationships.values())) 
-            for community in self.communities.values() 
-            if community.trust_relationships
-        ]) if any(c.trust_relationships for c in self.communities.values()) else 0
-        
-        self.coordination_effectiveness = (network_density * 0.4 + avg_trust * 0.6)
-        
-        # Calculate resource optimization score
-        sustainable_resources = sum(1 for r in self.global_resources.values() if r.is_sustainable())
-        total_resources = len(self.global_resources)
-        self.resource_optimization_score = sustainable_resources / total_resources if total_resources > 0 else 0
-        
-        # Calculate democratic participation rate
-        recent_decisions = [d for d in self.decision_history 
-                          if d['decided_date'] > datetime.now() - timedelta(days=30)]
-        
-        if recent_decisions:
-            total_eligible = sum(d['participants'] for d in recent_decisions)
-            total_participated = sum(d['votes_for'] + d['votes_against'] + d['abstentions'] 
-                                   for d in recent_decisions)
-            self.democratic_participation_rate = total_participated / total_eligible if total_eligible > 0 else 0
-        else:
-            self.democratic_participation_rate = 0
-        
-        # Calculate challenge resolution rate
-        total_challenges = len(self.resolved_challenges) + len(self.active_challenges)
-        successful_resolutions = sum(1 for c in self.resolved_challenges if hasattr(c, 'success') and c.success)
-        self.challenge_resolution_rate = successful_resolutions / total_challenges if total_challenges > 0 else 0
+        avg_trust = (self._trust_mean_sum / self._trusting_communities
+                     if self._trusting_communities else 0)
         
-        # Resource status
+        return {
+            'total_communities': len(self.communities),
+            'total_connections': total_connections,
+            'network_density': network_density,
+            'average_trust': avg_trust,
+            'bioregions': len(self.bioregions)
+        }
+    
+    def _compute_resource_metrics(self) -> Tuple[float, Dict]:
+        """Resource optimization score and per-resource status; depends only on allocations"""
         resource_status = {}
         for resource_id, resource in self.global_resources.items():
             resource_status[resource_id] = {
@@ -988,7 +1452,17 @@ class WorldGameEngine:
                 'total_allocated': sum(resource.current_allocation.values())
             }
         
-        # Challenge status
+        sustainable_resources = sum(1 for status in resource_status.values() if status['is_sustainable'])
+        total_resources = len(resource_status)
+        score = sustainable_resources / total_resources if total_resources > 0 else 0
+        
+        return score, resource_status
+    
+    def _compute_challenge_metrics(self) -> Tuple[float, Dict]:
+        """Challenge resolution rate and challenge status; depends only on challenge changes"""
+        total_challenges = len(self.resolved_challenges) + len(self.active_challenges)
+        resolution_rate = self._successful_resolutions / total_challenges if total_challenges > 0 else 0
+        
         challenge_status = {
             'active_challenges': len(self.active_challenges),
             'resolved_challenges': len(self.resolved_challenges),
@@ -996,25 +1470,60 @@ class WorldGameEngine:
             'average_complexity': np.mean([c.coordination_complexity for c in self.active_challenges.values()]) if self.active_challenges else 0
         }
         
+        return resolution_rate, challenge_status
+    
+    def get_system_metrics(self) -> Dict:
+        """
+        Get comprehensive World Game system metrics.
+        
+        Each component is cached and only recomputed when its inputs change,
+        so nested component dicts may be shared between calls and must be
+        treated as read-only.
+        """
+        if not self.communities:
+            return {}
+        
+        # Calculate coordination effectiveness
+        network_metrics = self._get_cached_component('network_metrics', ('graph',),
+                                                     self._compute_network_metrics)
+        self.coordination_effectiveness = (network_metrics['network_density'] * 0.4 +
+                                           network_metrics['average_trust'] * 0.6)
+        
+        # Calculate resource optimization score
+        self.resource_optimization_score, resource_status = self._get_cached_component(
+            'resource_metrics', ('resources',), self._compute_resource_metrics)
+        
+        # Calculate democratic participation rate over the last 30 days
+        start = bisect_right(self._decision_dates, datetime.now() - timedelta(days=30))
+        recent_decisions = len(self._decision_dates) - start
+        prefix = self._decision_prefix
+        
+        if recent_decisions:
+            total_eligible = prefix['participants'][-1] - prefix['participants'][start]
+            total_participated = prefix['participated'][-1] - prefix['participated'][start]
+            self.democratic_participation_rate = total_participated / total_eligible if total_eligible > 0 else 0
+            approval_rate = (prefix['approved'][-1] - prefix['approved'][start]) / recent_decisions
+        else:
+            self.democratic_participation_rate = 0
+            approval_rate = 0
+        
+        # Calculate challenge resolution rate
+        self.challenge_resolution_rate, challenge_status = self._get_cached_component(
+            'challenge_metrics', ('challenges',), self._compute_challenge_metrics)
+        
         return {
             'timestamp': datetime.now().isoformat(),
             'coordination_effectiveness': self.coordination_effectiveness,
             'resource_optimization_score': self.resource_optimization_score,
             'democratic_participation_rate': self.democratic_participation_rate,
             'challenge_resolution_rate': self.challenge_resolution_rate,
-            'network_metrics': {
-                'total_communities': len(self.communities),
-                'total_connections': total_connections,
-                'network_density': network_density,
-                'average_trust': avg_trust,
-                'bioregions': len(self.bioregions)
-            },
+            'network_metrics': network_metrics,
             'resource_status': resource_status,
             'challenge_status': challenge_status,
             'governance_metrics': {
                 'active_proposals': len(self.active_proposals),
-                'recent_decisions': len(recent_decisions),
-                'approval_rate': np.mean([1 if d['result'] == 'approved' else 0 for d in recent_decisions]) if recent_decisions else 0
+                'recent_decisions': recent_decisions,
+                'approval_rate': approval_rate
             }
         }
     
@@ -1030,7 +1539,23 @@ class WorldGameEngine:
             community.location[0], community.location[1], community.bioregion,
             community.participation_level, community.decision_weight
         ))
-        self.conn.commit()
+        self._commit()
+    
+    def _save_communities_to_db(self, communities: List[CommunityNode]):
+        """Save many communities to database in a single transaction"""
+        self.conn.executemany('''
+            INSERT OR REPLACE INTO communities 
+            (id, name, population, latitude, longitude, bioregion, participation_level, decision_weight)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
+                community.community_id, community.name, community.population,
+                community.location[0], community.location[1], community.bioregion,
+                community.participation_level, community.decision_weight
+            )
+            for community in communities
+        ])
+        self._commit()
     
     def _save_resource_to_db(self, resource: GlobalResource):
         """Save resource to database"""
@@ -1046,13 +1571,13 @@ class WorldGameEngine:
             resource.sustainability_threshold, resource.critical_threshold,
             resource.get_utilization_rate()
         ))
-        self.conn.commit()
+        self._commit()
     
     def _save_challenge_to_db(self, challenge: GlobalChallenge):
         """Save challenge to database"""
         cursor = self.conn.cursor()
         cursor.execute('''
-            INSERT INTO challenges 
+            INSERT OR REPLACE INTO challenges 
             (id, type, severity, time_sensitivity, coordination_complexity, status, created_date)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         ''', (
@@ -1060,13 +1585,13 @@ class WorldGameEngine:
             challenge.time_sensitivity, challenge.coordination_complexity,
             'active', datetime.now().isoformat()
         ))
-        self.conn.commit()
+        self._commit()
     
     def _save_decision_to_db(self, decision: Dict):
         """Save decision to database"""
         cursor = self.conn.cursor()
         cursor.execute('''
-            INSERT INTO decisions 
+            INSERT OR REPLACE INTO decisions 
             (id, proposal_title, decision_scope, voting_method, participants,
              votes_for, votes_against, abstentions, result, implementation_status,
              created_date, decided_date)
@@ -1078,19 +1603,322 @@ class WorldGameEngine:
             decision['result'], decision['implementation_status'],
             datetime.now().isoformat(), decision['decided_date'].isoformat()
         ))
-        self.conn.commit()
+        self._commit()
+    
+    def save_snapshot(self, path: Optional[str] = None) -> str:
+        """
+        Write the whole engine state to a SQLite file in a single transaction.
+        
+        Defaults to the engine's own database, which checkpoints a file-backed
+        run in place. Returns the path written.
+        """
+        path = path or self.db_path
+        conn = self.conn if path == self.db_path else sqlite3.connect(path)
+        
+        try:
+            if conn is not self.conn:
+                # The engine's own database already has the schema, and creating
+                # it would commit pending incremental writes ahead of the snapshot
+                self._create_schema(conn)
+            table = self.resource_table
+            values = table.values
+            
+            with conn:
+                for name in self.SNAPSHOT_TABLES:
+                    conn.execute(f'DELETE FROM {name}')
+                
+                conn.executemany('''
+                    INSERT INTO communities 
+                    (id, name, population, latitude, longitude, bioregion, participation_level,
+                     decision_weight, expertise_areas, innovation_capacity, coordination_capacity)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        c.community_id, c.name, c.population, c.location[0], c.location[1],
+                        c.bioregion, c.participation_level, c.decision_weight,
+                        json.dumps(c.expertise_areas), c.innovation_capacity, c.coordination_capacity
+                    )
+                    for c in self.communities.values()
+                ])
+                
+                conn.executemany('''
+                    INSERT INTO community_resources (community_id, category, production, consumption, storage)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    (community_id, category.value, *values[row, j].tolist())
+                    for row, community_id in enumerate(table.community_ids)
+                    for j, category in enumerate(table.categories)
+                ))
+                
+                conn.executemany(
+                    'INSERT INTO network_edges (source, target, trust) VALUES (?, ?, ?)',
+                    self.network_graph.edges(data='trust')
+                )
+                
+                conn.executemany('''
+                    INSERT INTO global_resources 
+                    (id, category, total_available, regeneration_rate, depletion_rate,
+                     sustainability_threshold, critical_threshold, current_utilization)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        r.resource_id, r.category.value, r.total_available, r.regeneration_rate,
+                        r.depletion_rate, r.sustainability_threshold, r.critical_threshold,
+                        r.get_utilization_rate()
+                    )
+                    for r in self.global_resources.values()
+                ])
+                
+                conn.executemany(
+                    'INSERT INTO resource_allocations (resource_id, community_id, amount) VALUES (?, ?, ?)',
+                    [
+                        (resource_id, community_id, amount)
+                        for resource_id, r in self.global_resources.items()
+                        for community_id, amount in r.current_allocation.items()
+                    ]
+                )
+                
+                challenges = ([(c, 'active') for c in self.active_challenges.values()] +
+                              [(c, 'resolved_success' if getattr(c, 'success', False) else 'resolved_failure')
+                               for c in self.resolved_challenges])
+                conn.executemany('''
+                    INSERT INTO challenges 
+                    (id, type, severity, time_sensitivity, coordination_complexity, status,
+                     created_date, resolved_date, affected_regions, required_resources, success_probability)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        c.challenge_id, c.challenge_type.value, c.severity, c.time_sensitivity,
+                        c.coordination_complexity, status, None,
+                        c.resolved_date.isoformat() if hasattr(c, 'resolved_date') else None,
+                        json.dumps(c.affected_regions),
+                        json.dumps({category.value: amount for category, amount in c.required_resources.items()}),
+                        c.success_probability
+                    )
+                    for c, status in challenges
+                ])
+                
+                conn.executemany('''
+                    INSERT INTO decisions 
+                    (id, proposal_title, decision_scope, voting_method, participants,
+                     votes_for, votes_against, abstentions, result, implementation_status,
+                     created_date, decided_date, weighted_for, weighted_against, weighted_abstain)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        d['proposal_id'], d['title'], d['scope'], d['voting_method'], d['participants'],
+                        d['votes_for'], d['votes_against'], d['abstentions'], d['result'],
+                        d['implementation_status'], None, d['decided_date'].isoformat(),
+                        d['weighted_for'], d['weighted_against'], d['weighted_abstain']
+                    )
+                    for d in self.decision_history
+                ])
+                
+                proposals = [
+                    dict(proposal, scope=proposal['scope'].value,
+                         created_date=proposal['created_date'].isoformat(),
+                         voting_deadline=proposal['voting_deadline'].isoformat())
+                    for proposal in self.active_proposals.values()
+                ]
+                conn.executemany('INSERT INTO engine_state (key, value) VALUES (?, ?)', [
+                    ('optimization_objectives', json.dumps(self.optimization_objectives)),
+                    ('active_proposals', json.dumps(proposals)),
+                    ('checkpoint_state', json.dumps(self.checkpoint_state, default=lambda value: value.item()))
+                ])
+        finally:
+            if conn is not self.conn:
+                conn.close()
+        
+        return path
+    
+    @classmethod
+    def load_snapshot(cls, path: str, db_path: str = ':memory:', overwrite: bool = False) -> 'WorldGameEngine':
+        """
+        Build an engine from a snapshot file without re-running initialization.
+        
+        Pass db_path=path to keep checkpointing into the same file, or keep the
+        default to start an independent in-memory branch from the snapshot. A
+        different db_path that already holds state is only replaced with
+        overwrite=True. checkpoint_state is restored with the engine, which is
+        how PlanetaryCoordinationSimulator.resume recovers its clock and schedule.
+        """
+        source = sqlite3.connect(path)
+        try:
+            snapshot = {
+                name: source.execute(f'SELECT * FROM {name} ORDER BY rowid').fetchall()
+                for name in cls.SNAPSHOT_TABLES
+            }
+        finally:
+            source.close()
+        
+        engine = cls(db_path, overwrite=overwrite or db_path == path)
+        engine._apply_snapshot(snapshot)
+        
+        # Construction wrote default resources; bring the engine database in line
+        engine.save_snapshot()
+        
+        return engine
+    
+    def _apply_snapshot(self, snapshot: Dict[str, List[Tuple]]):
+        """Replace in-memory state with rows read from snapshot tables"""
+        community_rows = snapshot['communities']
+        self.add_communities_bulk(
+            [row[0] for row in community_rows],
+            [row[1] for row in community_rows],
+            np.array([row[2] for row in community_rows], dtype=int),
+            np.array([(row[3], row[4]) for row in community_rows], dtype=float).reshape(-1, 2),
+            [row[5] for row in community_rows]
+        )
+        
+        # add_communities_bulk draws random attributes; overwrite them with stored values
+        for row in community_rows:
+            community = self.communities[row[0]]
+            community.participation_level = row[6]
+            community.decision_weight = row[7]
+            community.expertise_areas = json.loads(row[8]) if row[8] else []
+            community.innovation_capacity = row[9]
+            community.coordination_capacity = row[10]
+        
+        table = self.resource_table
+        resource_rows = snapshot['community_resources']
+        if resource_rows:
+            rows = np.array([table.row_index[row[0]] for row in resource_rows])
+            columns = np.array([table.category_index[ResourceCategory(row[1])] for row in resource_rows])
+            amounts = np.array([row[2:5] for row in resource_rows], dtype=float)
+            table.values[rows, columns, :] = amounts
+            table.version += 1
+        
+        edge_rows = snapshot['network_edges']
+        self.connect_communities_bulk([row[0] for row in edge_rows], [row[1] for row in edge_rows],
+                                      np.array([row[2] for row in edge_rows], dtype=float))
+        
+        self.global_resources = {}
+        for row in snapshot['global_resources']:
+            self.global_resources[row[0]] = GlobalResource(
+                resource_id=row[0],
+                category=ResourceCategory(row[1]),
+                total_available=row[2],
+                regeneration_rate=row[3],
+                depletion_rate=row[4],
+                sustainability_threshold=row[5],
+                critical_threshold=row[6]
+            )
+        for resource_id, community_id, amount in snapshot['resource_allocations']:
+            self.global_resources[resource_id].current_allocation[community_id] = amount
+        
+        for row in snapshot['challenges']:
+            challenge = GlobalChallenge(
+                challenge_id=row[0],
+                challenge_type=ChallengeType(row[1]),
+                severity=row[2],
+                affected_regions=json.loads(row[8]),
+                required_resources={ResourceCategory(category): amount
+                                    for category, amount in json.loads(row[9]).items()},
+                time_sensitivity=row[3],
+                coordination_complexity=row[4],
+                success_probability=row[10]
+            )
+            
+            if row[5] == 'active':
+                self.active_challenges[challenge.challenge_id] = challenge
+            else:
+                challenge.success = row[5] == 'resolved_success'
+                if row[7]:
+                    challenge.resolved_date = datetime.fromisoformat(row[7])
+                self.resolved_challenges.append(challenge)
+                self._successful_resolutions += int(challenge.success)
+        
+        for row in snapshot['decisions']:
+            self._record_decision({
+                'proposal_id': row[0],
+                'title': row[1],
+                'scope': row[2],
+                'voting_method': row[3],
+                'participants': row[4],
+                'votes_for': row[5],
+                'votes_against': row[6],
+                'abstentions': row[7],
+                'weighted_for': row[12],
+                'weighted_against': row[13],
+                'weighted_abstain': row[14],
+                'result': row[8],
+                'implementation_status': row[9],
+                'decided_date': datetime.fromisoformat(row[11])
+            })
+        
+        state = dict(snapshot['engine_state'])
+        if 'optimization_objectives' in state:
+            self.optimization_objectives = json.loads(state['optimization_objectives'])
+        for proposal in json.loads(state.get('active_proposals', '[]')):
+            proposal['scope'] = DecisionScope(proposal['scope'])
+            proposal['created_date'] = datetime.fromisoformat(proposal['created_date'])
+            proposal['voting_deadline'] = datetime.fromisoformat(proposal['voting_deadline'])
+            self.active_proposals[proposal['proposal_id']] = proposal
+        self.checkpoint_state = json.loads(state.get('checkpoint_state', '{}'))
+        
+        self._mark_dirty('graph', 'resources', 'challenges')
+
+class SimulationEventScheduler:
+    """
+    Discrete-event scheduler for simulated days.
+    
+    Events are ordered by (day, phase, insertion order) so events on the same
+    day keep a fixed processing order. Days without events are skipped.
+    """
+    
+    def __init__(self):
+        self._queue: List[Tuple[int, int, int, Any, Tuple, Optional[int]]] = []
+        self._sequence = itertools.count()
+        self.current_day = 0
+        self.events_processed = 0
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+    
+    def schedule(self, day: int, phase: int, handler, *args, interval: Optional[int] = None):
+        """Schedule handler(*args) on a day; recurring events repeat every interval days"""
+        heapq.heappush(self._queue, (day, phase, next(self._sequence), handler, args, interval))
+    
+    def pending_events(self) -> List[Tuple[int, int, Any, Tuple, Optional[int]]]:
+        """Queued (day, phase, handler, args, interval) events in processing order"""
+        return [(day, phase, handler, args, interval)
+                for day, phase, _, handler, args, interval in sorted(self._queue, key=lambda event: event[:3])]
+    
+    def run(self, until: int, on_advance=None) -> int:
+        """Process events before day `until`, calling on_advance(day) when the clock moves"""
+        processed = 0
+        
+        while self._queue and self._queue[0][0] < until:
+            day, phase, _, handler, args, interval = heapq.heappop(self._queue)
+            
+            if on_advance is not None and (processed == 0 or day != self.current_day):
+                on_advance(day)
+            self.current_day = day
+            
+            # Requeue recurring events first so a handler that checkpoints sees them
+            if interval is not None:
+                self.schedule(day + interval, phase, handler, *args, interval=interval)
+            
+            handler(*args)
+            processed += 1
+        
+        self.events_processed += processed
+        return processed
 
 class PlanetaryCoordinationSimulator:
     """
     Comprehensive simulator for planetary coordination scenarios
     """
     
-    def __init__(self, num_communities: int = 100, num_bioregions: int = 10):
+    def __init__(self, num_communities: int = 100, num_bioregions: int = 10,
+                 intra_bioregion_connection_rate: float = 0.4, db_path: str = ':memory:',
+                 overwrite: bool = False, world_game: Optional[WorldGameEngine] = None):
         self.num_communities = num_communities
         self.num_bioregions = num_bioregions
+        self.intra_bioregion_connection_rate = intra_bioregion_connection_rate
         
-        # Initialize World Game engine
-        self.world_game = WorldGameEngine()
+        # Initialize World Game engine, or continue with one restored by resume()
+        self.world_game = world_game if world_game is not None else WorldGameEngine(db_path, overwrite)
         
         # Simulation parameters
         self.simulation_days = 365
@@ -1098,10 +1926,79 @@ class PlanetaryCoordinationSimulator:
         
         # Metrics tracking
         self.daily_metrics: List[Dict] = []
+        self.metrics_interval = 1  # Days between metric snapshots
+        self.checkpoint_interval: Optional[int] = None  # Days between engine snapshots
+        
+        # Event scheduling
+        self.scheduler = SimulationEventScheduler()
+        self._timer_days = 0  # Days already applied to challenge timers
+        self._scheduled_expiries: Set[str] = set()
         
         # Initialize simulation
-        self._initialize_planetary_network()
-        self._initialize_baseline_challenges()
+        if world_game is None:
+            self._initialize_planetary_network()
+            self._initialize_baseline_challenges()
+    
+    @classmethod
+    def resume(cls, path: str) -> 'PlanetaryCoordinationSimulator':
+        """
+        Continue a run from the last checkpoint saved in a file.
+        
+        Restores the engine, the simulated day, the pending event schedule,
+        collected metrics and the random number generator states, and keeps
+        checkpointing into the same file. run_planetary_simulation then picks
+        up where the checkpointed run left off.
+        """
+        world_game = WorldGameEngine.load_snapshot(path, db_path=path)
+        state = world_game.checkpoint_state.get('simulation')
+        if state is None:
+            world_game.conn.close()
+            raise ValueError(f"{path} holds no simulation checkpoint to resume from")
+        
+        simulator = cls(state['num_communities'], state['num_bioregions'],
+                        state['intra_bioregion_connection_rate'], world_game=world_game)
+        simulator.simulation_days = state['simulation_days']
+        simulator.current_day = state['current_day']
+        simulator.metrics_interval = state['metrics_interval']
+        simulator.checkpoint_interval = state['checkpoint_interval']
+        simulator.daily_metrics = state['daily_metrics']
+        simulator._timer_days = state['timer_days']
+        simulator._scheduled_expiries = set(state['scheduled_expiries'])
+        
+        simulator.scheduler.current_day = state['current_day']
+        owners = {'simulator': simulator, 'world_game': world_game}
+        for day, phase, owner, name, args, interval in state['events']:
+            simulator.scheduler.schedule(day, phase, getattr(owners[owner], name), *args, interval=interval)
+        
+        python_state = state['python_random_state']
+        random.setstate((python_state[0], tuple(python_state[1]), python_state[2]))
+        numpy_state = state['numpy_random_state']
+        np.random.set_state((numpy_state[0], np.array(numpy_state[1], dtype=np.uint32), *numpy_state[2:]))
+        return simulator
+    
+    def save_checkpoint(self, path: Optional[str] = None) -> str:
+        """Snapshot the engine together with the simulator's clock and schedule; returns the path written"""
+        numpy_state = np.random.get_state()
+        self.world_game.checkpoint_state['simulation'] = {
+            'num_communities': self.num_communities,
+            'num_bioregions': self.num_bioregions,
+            'intra_bioregion_connection_rate': self.intra_bioregion_connection_rate,
+            'simulation_days': self.simulation_days,
+            'current_day': self.current_day,
+            'metrics_interval': self.metrics_interval,
+            'checkpoint_interval': self.checkpoint_interval,
+            'daily_metrics': self.daily_metrics,
+            'timer_days': self._timer_days,
+            'scheduled_expiries': sorted(self._scheduled_expiries),
+            'events': [
+                (day, phase, 'simulator' if handler.__self__ is self else 'world_game', handler.__name__,
+                 list(args), interval)
+                for day, phase, handler, args, interval in self.scheduler.pending_events()
+            ],
+            'python_random_state': random.getstate(),
+            'numpy_random_state': [numpy_state[0], numpy_state[1].tolist(), *numpy_state[2:]]
+        }
+        return self.world_game.save_snapshot(path)
     
     def _initialize_planetary_network(self):
         """Initialize a realistic planetary network of communities"""
@@ -1115,54 +2012,100 @@ class PlanetaryCoordinationSimulator:
         ]
         
         bioregions = bioregion_names[:self.num_bioregions]
+        num_bioregions = len(bioregions)
         
         # Create communities distributed across bioregions
-        for i in range(self.num_communities):
-            community_id = f"community_{i:03d}"
-            bioregion = bioregions[i % len(bioregions)]
-            
-            # Generate realistic community characteristics
-            population = int(np.random.lognormal(5.5, 1.0))  # Log-normal distribution
-            population = max(50, min(10000, population))  # Constrain to reasonable range
-            
-            # Generate location within bioregion (simplified)
-            base_lat = (i % len(bioregions)) * 18 - 90  # Distribute across latitudes
-            base_lon = ((i // len(bioregions)) % 20) * 18 - 180  # Distribute across longitudes
-            
-            location = (
-                base_lat + random.uniform(-5, 5),
-                base_lon + random.uniform(-5, 5)
-            )
-            
-            name = f"{bioregion}_Community_{i % 20 + 1}"
-            
-            self.world_game.add_community(community_id, name, population, location, bioregion)
+        indices = np.arange(self.num_communities)
+        bioregion_codes = indices % num_bioregions
+        
+        community_ids = [f"community_{i:03d}" for i in range(self.num_communities)]
+        community_bioregions = [bioregions[code] for code in bioregion_codes]
+        names = [f"{bioregions[code]}_Community_{i % 20 + 1}"
+                 for i, code in zip(indices, bioregion_codes)]
+        
+        # Generate realistic community characteristics
+        populations = np.random.lognormal(5.5, 1.0, self.num_communities).astype(int)  # Log-normal distribution
+        populations = np.clip(populations, 50, 10000)  # Constrain to reasonable range
+        
+        # Generate location within bioregion (simplified)
+        base_lat = bioregion_codes * 18 - 90  # Distribute across latitudes
+        base_lon = ((indices // num_bioregions) % 20) * 18 - 180  # Distribute across longitudes
+        locations = np.column_stack([
+            base_lat + np.random.uniform(-5, 5, self.num_communities),
+            base_lon + np.random.uniform(-5, 5, self.num_communities)
+        ])
+        
+        self.world_game.add_communities_bulk(community_ids, names, populations,
+                                             locations, community_bioregions)
         
         # Create network connections
         print("Creating network connections...")
-        communities = list(self.world_game.communities.keys())
+        community_array = np.array(community_ids)
+        sources: List[np.ndarray] = []
+        targets: List[np.ndarray] = []
+        trust_levels: List[np.ndarray] = []
         
         # Connect communities within bioregions (high trust)
-        for bioregion, community_list in self.world_game.bioregions.items():
-            for i, comm1 in enumerate(community_list):
-                for comm2 in community_list[i+1:]:
-                    if random.random() < 0.4:  # 40% chance of connection within bioregion
-                        trust_level = random.uniform(0.6, 0.9)
-                        self.world_game.connect_communities(comm1, comm2, trust_level)
+        for code in range(num_bioregions):
+            members = indices[bioregion_codes == code]
+            rows, cols = self._sample_intra_bioregion_edges(len(members))
+            sources.append(members[rows])
+            targets.append(members[cols])
+            trust_levels.append(np.random.uniform(0.6, 0.9, len(rows)))
         
         # Create inter-bioregional connections (lower trust)
-        for _ in range(self.num_communities // 2):
-            comm1 = random.choice(communities)
-            comm2 = random.choice(communities)
-            
-            if (comm1 != comm2 and 
-                self.world_game.communities[comm1].bioregion != self.world_game.communities[comm2].bioregion and
-                not self.world_game.network_graph.has_edge(comm1, comm2)):
-                
-                trust_level = random.uniform(0.3, 0.7)
-                self.world_game.connect_communities(comm1, comm2, trust_level)
+        num_draws = self.num_communities // 2
+        draw1 = np.random.randint(0, self.num_communities, num_draws)
+        draw2 = np.random.randint(0, self.num_communities, num_draws)
+        cross_region = bioregion_codes[draw1] != bioregion_codes[draw2]
+        pairs = np.unique(np.sort(np.column_stack([draw1, draw2])[cross_region], axis=1), axis=0)
+        sources.append(pairs[:, 0])
+        targets.append(pairs[:, 1])
+        trust_levels.append(np.random.uniform(0.3, 0.7, len(pairs)))
+        
+        self.world_game.connect_communities_bulk(
+            community_array[np.concatenate(sources)].tolist(),
+            community_array[np.concatenate(targets)].tolist(),
+            np.concatenate(trust_levels)
+        )
         
-        print(f"Network created: {len(communities)} communities, {self.world_game.network_graph.number_of_edges()} connections")
+        print(f"Network created: {len(community_ids)} communities, {self.world_game.network_graph.number_of_edges()} connections")
+    
+    def _sample_intra_bioregion_edges(self, block_size: int,
+                                      max_cells: int = 4_000_000) -> Tuple[np.ndarray, np.ndarray]:
+        """Sample Bernoulli edges over the upper triangle of a bioregion block"""
+        rate = self.intra_bioregion_connection_rate
+        
+        if block_size < 2:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int)
+        
+        # Sparse blocks: draw the binomial edge count, then that many distinct pairs
+        if rate <= 0.1:
+            num_pairs = block_size * (block_size - 1) // 2
+            num_edges = np.random.binomial(num_pairs, rate)
+            pairs = np.empty((0, 2), dtype=int)
+            while len(pairs) < num_edges:
+                draw = num_edges - len(pairs)
+                candidates = np.random.randint(0, block_size, (draw, 2))
+                candidates = np.sort(candidates[candidates[:, 0] != candidates[:, 1]], axis=1)
+                pairs = np.unique(np.vstack([pairs, candidates]), axis=0)
+            pairs = np.random.permutation(pairs)[:num_edges]
+            return pairs[:, 0], pairs[:, 1]
+        
+        # Dense blocks: process row chunks so memory stays bounded
+        rows_out: List[np.ndarray] = []
+        cols_out: List[np.ndarray] = []
+        chunk_rows = max(1, max_cells // block_size)
+        for row_start in range(0, block_size, chunk_rows):
+            row_end = min(block_size, row_start + chunk_rows)
+            row_ids = np.arange(row_start, row_end)
+            mask = np.random.random((row_end - row_start, block_size)) < rate
+            mask &= np.arange(block_size)[None, :] > row_ids[:, None]
+            local_rows, cols = np.nonzero(mask)
+            rows_out.append(row_ids[local_rows])
+            cols_out.append(cols)
+        
+        return np.concatenate(rows_out), np.concatenate(cols_out)
     
     def _initialize_baseline_challenges(self):
         """Initialize baseline global challenges"""
@@ -1175,67 +2118,98 @@ class PlanetaryCoordinationSimulator:
         for challenge_type, severity, regions, time_sensitivity in baseline_challenges:
             self.world_game.create_global_challenge(challenge_type, severity, regions, time_sensitivity)
     
+    # Event phases: order of processing for events that fall on the same day
+    PHASE_PROPOSAL = 0
+    PHASE_DEADLINE = 1
+    PHASE_CHALLENGE = 2
+    PHASE_OPTIMIZATION = 3
+    PHASE_METRICS = 4
+    PHASE_REPORT = 5
+    PHASE_QUARTERLY = 6
+    PHASE_CHECKPOINT = 7
+    
     def run_planetary_simulation(self):
         """Run comprehensive planetary coordination simulation"""
         print("\nStarting Planetary Coordination Simulation")
         print("=" * 60)
         
-        for day in range(self.simulation_days):
-            self.current_day = day
-            
-            # Simulate daily activities
-            self._simulate_daily_coordination()
+        # A resumed simulator already holds its pending schedule
+        scheduler = self.scheduler
+        if not len(scheduler):
+            self._schedule_next_proposal(-1)
+            self._schedule_challenge_expiries()
             
-            # Collect metrics
-            self._collect_daily_metrics()
+            scheduler.schedule(0, self.PHASE_OPTIMIZATION, self.world_game.optimize_global_resources, interval=7)
+            scheduler.schedule(0, self.PHASE_METRICS, self._collect_daily_metrics, interval=self.metrics_interval)
+            scheduler.schedule(0, self.PHASE_REPORT, self._print_monthly_report, interval=30)
+            scheduler.schedule(90, self.PHASE_QUARTERLY, self._simulate_quarterly_events, interval=90)
             
-            # Monthly reports
-            if day % 30 == 0:
-                self._print_monthly_report()
-            
-            # Quarterly major events
-            if day % 90 == 0 and day > 0:
-                self._simulate_quarterly_events()
+            if self.checkpoint_interval:
+                scheduler.schedule(self.checkpoint_interval, self.PHASE_CHECKPOINT,
+                                   self.save_checkpoint, interval=self.checkpoint_interval)
+        
+        scheduler.run(self.simulation_days, on_advance=self._advance_to_day)
         
         # Generate final report
         self._generate_final_report()
     
-    def _simulate_daily_coordination(self):
-        """Simulate daily coordination activities"""
-        # Random proposal creation (1% chance per day)
-        if random.random() < 0.01:
-            self._create_random_proposal()
+    def _advance_to_day(self, day: int):
+        """Bring challenge timers up to date when the scheduler jumps to a new day"""
+        self.current_day = day
+        
+        elapsed = day + 1 - self._timer_days
+        if elapsed > 0:
+            self.world_game.advance_challenge_timers(elapsed)
+            self._timer_days = day + 1
+    
+    def _schedule_next_proposal(self, after_day: int):
+        """Draw the next proposal day from the 1% daily creation probability"""
+        self.scheduler.schedule(after_day + int(np.random.geometric(0.01)),
+                                self.PHASE_PROPOSAL, self._on_proposal_created)
+    
+    def _on_proposal_created(self):
+        """Create a proposal and schedule its voting deadline"""
+        proposal_id = self._create_random_proposal()
+        proposal = self.world_game.active_proposals[proposal_id]
+        
+        self.scheduler.schedule(self.current_day + 7, self.PHASE_DEADLINE,
+                                self._on_proposal_deadline, proposal_id)
+        self._schedule_next_proposal(self.current_day)
+    
+    def _on_proposal_deadline(self, proposal_id: str):
+        """Run the proposal's daily voting rounds in one batch, then finalize it"""
+        # Proposal ids are never reused, so a missing id means it was already decided
+        proposal = self.world_game.active_proposals.get(proposal_id)
+        if proposal is None:
+            return
         
-        # Process active proposals (voting)
-        for proposal_id in list(self.world_game.active_proposals.keys()):
-            proposal = self.world_game.active_proposals[proposal_id]
-            
-            # Simulate daily voting activity
-            eligible_voters = proposal['eligible_voters']
+        # Simulate daily voting activity over the 7-day voting period
+        eligible_voters = proposal['eligible_voters']
+        voted = set()
+        for _ in range(7):
             daily_voters = random.sample(eligible_voters, min(5, len(eligible_voters)))
             
             for voter in daily_voters:
-                if voter not in [v for votes in proposal['votes'].values() for v in votes]:
+                if voter not in voted:
                     vote = random.choices(['for', 'against', 'abstain'], weights=[0.6, 0.3, 0.1])[0]
                     self.world_game.cast_vote(proposal_id, voter, vote)
-            
-            # Check if voting deadline reached
-            if datetime.now() >= proposal['voting_deadline']:
-                self.world_game.finalize_proposal_voting(proposal_id)
+                    voted.add(voter)
         
-        # Challenge evolution
-        for challenge in list(self.world_game.active_challenges.values()):
-            challenge.time_sensitivity -= 1
+        self.world_game.finalize_proposal_voting(proposal_id)
+    
+    def _schedule_challenge_expiries(self):
+        """Schedule an expiry event for every active challenge not yet scheduled"""
+        for challenge in self.world_game.active_challenges.values():
+            if challenge.challenge_id in self._scheduled_expiries:
+                continue
             
-            # Remove expired challenges
-            if challenge.time_sensitivity <= 0:
-                self.world_game._resolve_challenge(challenge.challenge_id, False)
-        
-        # Resource optimization (weekly)
-        if self.current_day % 7 == 0:
-            self.world_game.optimize_global_resources()
+            # Timers are applied through day _timer_days - 1 and synced in
+            # _advance_to_day, so the event only has to wake the scheduler
+            expiry_day = self._timer_days - 1 + max(1, math.ceil(challenge.time_sensitivity))
+            self.scheduler.schedule(expiry_day, self.PHASE_CHALLENGE, self._schedule_challenge_expiries)
+            self._scheduled_expiries.add(challenge.challenge_id)
     
-    def _create_random_proposal(self):
+    def _create_random_proposal(self) -> str:
         """Create a random proposal for testing"""
         proposal_types = [
             {
@@ -1258,7 +2232,7 @@ class PlanetaryCoordinationSimulator:
         proposal_template = random.choice(proposal_types)
         proposer = random.choice(list(self.world_game.communities.keys()))
         
-        self.world_game.create_proposal(
+        return self.world_game.create_proposal(
             title=proposal_template['title'],
             description=f"Proposed by {proposer} on day {self.current_day}",
             scope=proposal_template['scope'],
@@ -1293,6 +2267,9 @@ class PlanetaryCoordinationSimulator:
             for community_id in communities:
                 community = self.world_game.communities[community_id]
                 community.coordination_capacity = min(1.0, community.coordination_capacity + 0.1)
+        
+        # Crises create new challenges whose deadlines need scheduling
+        self._schedule_challenge_expiries()
     
     def _collect_daily_metrics(self):
         """Collect daily metrics"""
@@ -10,21 +10,31 @@ maximum human benefit while maintaining ecological sustainability.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any, Union
-from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Tuple, Optional, Any, Union
+from dataclasses import dataclass, field, replace
 from abc import ABC, abstractmethod
 import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
 import json
+import time
 import sqlite3
+import threading
+from itertools import islice
+from collections import deque
+from collections.abc import Mapping
 from scipy.optimize import minimize, linprog
+from scipy.spatial import cKDTree
+from scipy import sparse
 from sklearn.ensemble import RandomForestRegressor
+import joblib
 from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import KMeans
 import networkx as nx
 import matplotlib.pyplot as plt
 import seaborn as sns
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -32,6 +42,23 @@ warnings.filterwarnings('ignore')
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+
+def _unit_sphere_points(locations: np.ndarray) -> np.ndarray:
+    """Convert an (n, 2) array of latitude/longitude degrees to 3D unit vectors"""
+    lat, lon = np.radians(locations[:, 0]), np.radians(locations[:, 1])
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+def _chord_length(distance_km: np.ndarray) -> np.ndarray:
+    """Straight-line chord between unit-sphere points separated by a great-circle distance"""
+    angle = np.minimum(np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+def _great_circle_km(chord: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km for a chord length between unit-sphere points"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
 @dataclass
 class Resource:
     """Represents a planetary resource in the World Game system"""
@@ -83,17 +110,36 @@ class PlanetaryResourceDatabase:
     Implements Fuller's requirement for real-time inventory of Earth's resources
     """
     
-    def __init__(self, db_path: str = "planetary_resources.db"):
+    def __init__(self, db_path: str = "planetary_resources.db", index_rebuild_threshold: int = 256):
         self.db_path = db_path
         self.resources: Dict[str, Resource] = {}
         self.needs: Dict[str, Need] = {}
         self.historical_data: List[Dict[str, Any]] = []
+        
+        # Spatial index: resource locations as unit vectors in slot order. Slots below
+        # _tree_size are in the KD-tree; newer slots are scanned directly until enough
+        # accumulate to justify a rebuild
+        self.index_rebuild_threshold = index_rebuild_threshold
+        self._spatial_ids: List[str] = []
+        self._spatial_slots: Dict[str, int] = {}
+        self._spatial_points = np.zeros((0, 3))
+        self._spatial_tree: Optional[cKDTree] = None
+        self._tree_size = 0
+        
         self._initialize_database()
         
     def _initialize_database(self):
-        """Initialize the database with tables for resources, needs, and allocations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Open the long-lived connection and create tables for resources, needs, and allocations"""
+        # One connection for the database's lifetime, shared by loader threads under a lock
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        
+        if self.db_path != ':memory:':
+            # Bulk loads commit per chunk; WAL keeps those commits cheap and readers unblocked
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        
+        cursor = self.conn.cursor()
         
         # Create resources table
         cursor.execute('''
@@ -147,80 +193,269 @@ class PlanetaryResourceDatabase:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        self.conn.commit()
         logger.info("Planetary resource database initialized")
     
-    def add_resource(self, resource: Resource) -> None:
-        """Add or update a resource in the database"""
-        self.resources[resource.resource_id] = resource
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    def close(self) -> None:
+        """Close the database connection"""
+        self.conn.close()
+    
+    @staticmethod
+    def _resource_row(resource: Resource) -> Tuple:
+        return (
             resource.resource_id, resource.name, resource.category,
             resource.location[0], resource.location[1], resource.quantity,
             resource.quality_score, resource.accessibility_score,
             resource.sustainability_rating, resource.extraction_cost,
             resource.environmental_impact, resource.last_updated,
             json.dumps(resource.metadata)
-        ))
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Added resource: {resource.name} ({resource.resource_id})")
+        )
     
-    def add_need(self, need: Need) -> None:
-        """Add or update a need in the database"""
-        self.needs[need.need_id] = need
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO needs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    @staticmethod
+    def _need_row(need: Need) -> Tuple:
+        return (
             need.need_id, need.location[0], need.location[1],
             need.population_affected, need.need_type,
             json.dumps(need.resource_requirements), need.urgency_level,
             json.dumps(need.quality_requirements), need.deadline,
             need.satisfaction_level, json.dumps(need.metadata)
-        ))
+        )
+    
+    def add_resource(self, resource: Resource) -> None:
+        """Add or update a resource in the database"""
+        self.add_resources([resource])
+        logger.debug(f"Added resource: {resource.name} ({resource.resource_id})")
+    
+    def add_need(self, need: Need) -> None:
+        """Add or update a need in the database"""
+        self.add_needs([need])
+        logger.debug(f"Added need: {need.need_id} affecting {need.population_affected} people")
+    
+    def add_resources(self, resources, chunk_size: int = 10000) -> int:
+        """
+        Add or update many resources, one transaction per chunk.
+        
+        Accepts any iterable, so generators stream without being materialized.
+        Returns the number of resources written.
+        """
+        total = 0
+        iterator = iter(resources)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            with self._write_lock:
+                with self.conn:
+                    self.conn.executemany(
+                        'INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        [self._resource_row(resource) for resource in chunk]
+                    )
+                for resource in chunk:
+                    self.resources[resource.resource_id] = resource
+                self._index_resource_locations([r.resource_id for r in chunk],
+                                               np.array([r.location for r in chunk], dtype=float))
+            total += len(chunk)
+        
+        if total > 1:
+            logger.info(f"Added {total} resources")
+        return total
+    
+    def add_needs(self, needs, chunk_size: int = 10000) -> int:
+        """Add or update many needs, one transaction per chunk; returns the number written"""
+        total = 0
+        iterator = iter(needs)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            with self._write_lock:
+                with self.conn:
+                    self.conn.executemany(
+                        'INSERT OR REPLACE INTO needs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        [self._need_row(need) for need in chunk]
+                    )
+                for need in chunk:
+                    self.needs[need.need_id] = need
+            total += len(chunk)
+        
+        if total > 1:
+            logger.info(f"Added {total} needs")
+        return total
+    
+    def load_resources_from_file(self, path: str, chunk_size: int = 50000) -> int:
+        """
+        Stream resources from a CSV or Parquet file into the table and the spatial index.
         
-        conn.commit()
-        conn.close()
-        logger.info(f"Added need: {need.need_id} affecting {need.population_affected} people")
+        Columns follow the resources table (latitude/longitude rather than a
+        location tuple); metadata, if present, is a JSON string and last_updated
+        defaults to the load time. Parquet files need pyarrow.
+        """
+        if str(path).endswith('.parquet'):
+            import pyarrow.parquet as pq
+            frames = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+        else:
+            frames = pd.read_csv(path, chunksize=chunk_size)
+        
+        return sum(self.add_resources(self._resources_from_frame(frame), chunk_size) for frame in frames)
+    
+    @staticmethod
+    def _resources_from_frame(frame: pd.DataFrame):
+        """Yield Resource records from one chunk of tabular resource data"""
+        now = datetime.now()
+        if 'last_updated' in frame:
+            last_updated = pd.to_datetime(frame['last_updated']).dt.to_pydatetime().tolist()
+        else:
+            last_updated = [now] * len(frame)
+        metadata = frame['metadata'].tolist() if 'metadata' in frame else [None] * len(frame)
+        
+        columns = zip(
+            frame['resource_id'].astype(str).tolist(), frame['name'].astype(str).tolist(),
+            frame['category'].astype(str).tolist(), frame['latitude'].astype(float).tolist(),
+            frame['longitude'].astype(float).tolist(), frame['quantity'].astype(float).tolist(),
+            frame['quality_score'].astype(float).tolist(), frame['accessibility_score'].astype(float).tolist(),
+            frame['sustainability_rating'].astype(str).tolist(), frame['extraction_cost'].astype(float).tolist(),
+            frame['environmental_impact'].astype(float).tolist(), last_updated, metadata
+        )
+        for (resource_id, name, category, latitude, longitude, quantity, quality, accessibility,
+             rating, extraction_cost, impact, updated, meta) in columns:
+            yield Resource(resource_id, name, category, (latitude, longitude), quantity, quality,
+                           accessibility, rating, extraction_cost, impact, updated,
+                           json.loads(meta) if isinstance(meta, str) and meta else {})
     
     def get_resources_by_category(self, category: str) -> List[Resource]:
         """Get all resources of a specific category"""
         return [r for r in self.resources.values() if r.category == category]
     
+    def _index_resource_locations(self, resource_ids: List[str], locations: np.ndarray) -> None:
+        """Insert or move resources in the spatial index"""
+        points = _unit_sphere_points(locations)
+        for resource_id, point in zip(resource_ids, points):
+            slot = self._spatial_slots.get(resource_id)
+            if slot is None:
+                slot = len(self._spatial_ids)
+                self._spatial_slots[resource_id] = slot
+                self._spatial_ids.append(resource_id)
+                if slot == len(self._spatial_points):
+                    self._spatial_points = np.vstack([self._spatial_points,
+                                                      np.zeros((max(slot, 64), 3))])
+            elif slot < self._tree_size and not np.array_equal(self._spatial_points[slot], point):
+                # A resource inside the tree moved, so the tree must be rebuilt
+                self._spatial_tree = None
+                self._tree_size = 0
+            self._spatial_points[slot] = point
+    
+    def _refresh_spatial_index(self) -> None:
+        """Rebuild the KD-tree once enough resources are pending outside it"""
+        count = len(self._spatial_ids)
+        pending = count - self._tree_size
+        if pending and (self._spatial_tree is None or pending >= max(self.index_rebuild_threshold, self._tree_size // 4)):
+            self._spatial_tree = cKDTree(self._spatial_points[:count])
+            self._tree_size = count
+    
+    def _spatial_snapshot(self) -> Tuple[Optional[cKDTree], int, np.ndarray]:
+        """
+        Consistent view of the index for one query: the tree, its size and a copy
+        of the pending points, taken under the write lock so loaders running in
+        other threads cannot swap the tree or the point buffer halfway through
+        """
+        with self._write_lock:
+            self._refresh_spatial_index()
+            count = len(self._spatial_ids)
+            return self._spatial_tree, self._tree_size, self._spatial_points[self._tree_size:count].copy()
+    
+    @staticmethod
+    def _pending_chunks(num_points: int, num_pending: int, max_cells: int):
+        """Query-point slices whose dense distance block against the pending points stays under max_cells"""
+        step = max(1, max_cells // max(num_pending, 1))
+        for start in range(0, num_points, step):
+            yield slice(start, min(num_points, start + step))
+    
+    def _query_radius_slots(self, points: np.ndarray, radius_km: np.ndarray,
+                            max_cells: int = 4_000_000) -> List[np.ndarray]:
+        """Slots within radius of each query point, in insertion order"""
+        tree, tree_size, pending_points = self._spatial_snapshot()
+        chords = np.broadcast_to(_chord_length(radius_km), (len(points),))
+        
+        if tree_size:
+            tree_hits = tree.query_ball_point(points, chords * (1 + 1e-12))
+        else:
+            tree_hits = [[] for _ in range(len(points))]
+        
+        results = [np.asarray(hits, dtype=np.int64) for hits in tree_hits]
+        if len(pending_points):
+            # Pending slots are scanned directly, a bounded block of query points at a time
+            for rows in self._pending_chunks(len(points), len(pending_points), max_cells):
+                pending_chords = np.linalg.norm(points[rows, None, :] - pending_points[None, :, :], axis=2)
+                pending_hits = pending_chords <= chords[rows, None]
+                for q, hits in enumerate(pending_hits, start=rows.start):
+                    results[q] = np.concatenate([results[q], tree_size + np.flatnonzero(hits)])
+        return [np.sort(slots) for slots in results]
+    
+    def _query_nearest_slots(self, points: np.ndarray, k: int,
+                             max_cells: int = 4_000_000) -> Tuple[np.ndarray, np.ndarray]:
+        """k nearest slots and chord lengths for each query point, nearest first"""
+        tree, tree_size, pending_points = self._spatial_snapshot()
+        count = tree_size + len(pending_points)
+        k = min(k, count)
+        
+        tree_slots = np.zeros((len(points), 0), dtype=np.int64)
+        tree_chords = np.zeros((len(points), 0))
+        if tree_size:
+            chords, slots = tree.query(points, k=min(k, tree_size))
+            tree_chords = np.asarray(chords, dtype=float).reshape(len(points), -1)
+            tree_slots = np.asarray(slots, dtype=np.int64).reshape(len(points), -1)
+        if not len(pending_points):
+            return tree_slots, tree_chords
+        
+        # Merge each block of tree candidates with the pending slots it is scanned against
+        nearest_slots = np.zeros((len(points), k), dtype=np.int64)
+        nearest_chords = np.zeros((len(points), k))
+        pending_slots = np.arange(tree_size, count)
+        for rows in self._pending_chunks(len(points), len(pending_points), max_cells):
+            pending_chords = np.linalg.norm(points[rows, None, :] - pending_points[None, :, :], axis=2)
+            candidate_chords = np.hstack([tree_chords[rows], pending_chords])
+            candidate_slots = np.hstack([tree_slots[rows], np.broadcast_to(pending_slots, pending_chords.shape)])
+            order = np.argsort(candidate_chords, axis=1, kind='stable')[:, :k]
+            nearest_slots[rows] = np.take_along_axis(candidate_slots, order, axis=1)
+            nearest_chords[rows] = np.take_along_axis(candidate_chords, order, axis=1)
+        return nearest_slots, nearest_chords
+    
     def get_resources_in_region(self, center: Tuple[float, float], 
                                radius_km: float) -> List[Resource]:
         """Get all resources within a specified radius of a location"""
-        def haversine_distance(lat1, lon1, lat2, lon2):
-            """Calculate distance between two points on Earth"""
-            R = 6371  # Earth's radius in kilometers
-            dlat = np.radians(lat2 - lat1)
-            dlon = np.radians(lon2 - lon1)
-            a = (np.sin(dlat/2)**2 + np.cos(np.radians(lat1)) * 
-                 np.cos(np.radians(lat2)) * np.sin(dlon/2)**2)
-            c = 2 * np.arcsin(np.sqrt(a))
-            return R * c
-        
-        center_lat, center_lon = center
-        nearby_resources = []
-        
-        for resource in self.resources.values():
-            distance = haversine_distance(center_lat, center_lon, 
-                                        resource.location[0], resource.location[1])
-            if distance <= radius_km:
-                nearby_resources.append(resource)
-        
-        return nearby_resources
+        return self.get_resources_in_regions([center], radius_km)[0]
+    
+    def get_resources_in_regions(self, centers: List[Tuple[float, float]], 
+                                radius_km: Union[float, np.ndarray]) -> List[List[Resource]]:
+        """Batched radius query: resources within radius_km (scalar or per center) of each center"""
+        if not self._spatial_ids or not len(centers):
+            return [[] for _ in range(len(centers))]
+        
+        points = _unit_sphere_points(np.asarray(centers, dtype=float).reshape(-1, 2))
+        return [
+            [self.resources[self._spatial_ids[slot]] for slot in slots.tolist()]
+            for slots in self._query_radius_slots(points, radius_km)
+        ]
+    
+    def get_nearest_resources(self, center: Tuple[float, float], 
+                             k: int = 5) -> List[Tuple[Resource, float]]:
+        """Get the k resources nearest to a location with their distances in km"""
+        resource_ids, distances = self.get_nearest_resources_batch([center], k)
+        return [(self.resources[resource_id], distance)
+                for resource_id, distance in zip(resource_ids[0], distances[0].tolist())]
+    
+    def get_nearest_resources_batch(self, centers: List[Tuple[float, float]], 
+                                   k: int = 5) -> Tuple[List[List[str]], np.ndarray]:
+        """Batched k-nearest query: resource ids and a (centers, k) array of distances in km"""
+        if not self._spatial_ids or not len(centers):
+            return [[] for _ in range(len(centers))], np.zeros((len(centers), 0))
+        
+        points = _unit_sphere_points(np.asarray(centers, dtype=float).reshape(-1, 2))
+        slots, chords = self._query_nearest_slots(points, k)
+        resource_ids = [[self._spatial_ids[slot] for slot in row] for row in slots.tolist()]
+        return resource_ids, _great_circle_km(chords)
     
     def calculate_resource_statistics(self) -> Dict[str, Any]:
         """Calculate comprehensive statistics about planetary resources"""
@@ -276,14 +511,42 @@ class PlanetaryResourceDatabase:
         
         return stats
 
+class _LedgerAccounts(Mapping):
+    """Read-only account_id -> running totals view over the energy ledger"""
+    
+    def __init__(self, accounting: 'EnergyValueAccountingSystem'):
+        self._accounting = accounting
+    
+    def __getitem__(self, account_id: str) -> Dict[str, float]:
+        account = self._accounting.get_account(account_id)
+        if account is None:
+            raise KeyError(account_id)
+        return account
+    
+    def __iter__(self):
+        for chunk in self._accounting._iter_account_chunks(10000):
+            for account_id, _ in chunk:
+                yield account_id
+    
+    def __len__(self) -> int:
+        return self._accounting.conn.execute('SELECT COUNT(*) FROM energy_account_totals').fetchone()[0]
+
 class EnergyValueAccountingSystem:
     """
     Comprehensive energy-value accounting system
     Implements Fuller's requirement for energy-based economic measurement
     """
     
-    def __init__(self):
-        self.energy_accounts: Dict[str, Dict[str, float]] = {}
+    # Additive flows kept per ledger entry and as running totals per account.
+    # impact_energy is environmental impact weighted by total energy, so the
+    # account's impact is an energy-weighted mean of its entries
+    LEDGER_FIELDS = ('direct_energy', 'indirect_energy', 'embodied_energy', 'opportunity_energy',
+                     'total_energy', 'renewable_energy', 'total_value', 'output_quantity', 'impact_energy')
+    RENEWABLE_ENERGY_TYPES = ('solar_kwh', 'wind_kwh', 'hydro_kwh', 'biomass_kwh')
+    
+    def __init__(self, ledger_path: str = ':memory:'):
+        self.ledger_path = ledger_path
+        self._initialize_ledger()
         self.conversion_factors: Dict[str, float] = {
             'solar_kwh': 1.0,  # Base unit: kWh of solar energy
             'wind_kwh': 0.95,  # Slightly lower due to intermittency
@@ -304,6 +567,133 @@ class EnergyValueAccountingSystem:
             'environmental_quality': 8.0
         }
     
+    def _initialize_ledger(self):
+        """Open the ledger connection and create the entry and running-total tables"""
+        self.conn = sqlite3.connect(self.ledger_path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        
+        if self.ledger_path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        
+        flow_columns = ', '.join(f'{name} REAL NOT NULL DEFAULT 0' for name in self.LEDGER_FIELDS)
+        with self.conn:
+            # Append-only: entries are never updated or deleted
+            self.conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS energy_ledger (
+                    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    account_id TEXT NOT NULL,
+                    timestamp TIMESTAMP,
+                    {flow_columns}
+                )
+            ''')
+            # Running totals, updated in the same transaction as the entries they summarize
+            self.conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS energy_account_totals (
+                    account_id TEXT PRIMARY KEY,
+                    entry_count INTEGER NOT NULL DEFAULT 0,
+                    last_updated TIMESTAMP,
+                    {flow_columns}
+                )
+            ''')
+        
+        self.energy_accounts = _LedgerAccounts(self)
+    
+    def close(self) -> None:
+        """Close the ledger connection"""
+        self.conn.close()
+    
+    def post_entries(self, entries, chunk_size: int = 10000) -> int:
+        """
+        Append (account_id, flows) entries to the ledger, one transaction per chunk.
+        
+        flows maps LEDGER_FIELDS names (plus optionally environmental_impact) to
+        values; missing fields count as zero. Accepts any iterable and returns
+        the number of entries written.
+        """
+        placeholders = ', '.join('?' for _ in self.LEDGER_FIELDS)
+        columns = ', '.join(self.LEDGER_FIELDS)
+        accumulate = ', '.join(f'{name} = {name} + excluded.{name}' for name in self.LEDGER_FIELDS)
+        
+        total = 0
+        iterator = iter(entries)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            timestamp = datetime.now().isoformat()
+            rows = [(account_id, timestamp) + self._ledger_values(flows) for account_id, flows in chunk]
+            with self._write_lock:
+                with self.conn:
+                    self.conn.executemany(
+                        f'INSERT INTO energy_ledger (account_id, timestamp, {columns}) VALUES (?, ?, {placeholders})',
+                        rows
+                    )
+                    self.conn.executemany(
+                        f'''INSERT INTO energy_account_totals (account_id, last_updated, entry_count, {columns})
+                            VALUES (?, ?, 1, {placeholders})
+                            ON CONFLICT(account_id) DO UPDATE SET
+                                entry_count = entry_count + 1, last_updated = excluded.last_updated, {accumulate}''',
+                        rows
+                    )
+            total += len(chunk)
+        
+        return total
+    
+    def post_entry(self, account_id: str, flows: Dict[str, float]) -> None:
+        """Append a single ledger entry for an account"""
+        self.post_entries([(account_id, flows)])
+    
+    def record_activity(self, account_id: str, activity: Dict[str, Any], output_quantity: float = 0.0,
+                        environmental_impact: float = 0.0) -> Dict[str, float]:
+        """Cost an activity, post it to the account's ledger, and return the posted flows"""
+        flows = self.calculate_energy_cost(activity)
+        flows['total_value'] = self.calculate_life_support_value(activity)['total_value']
+        flows['renewable_energy'] = sum(
+            quantity * self.conversion_factors.get(energy_type, 1.0)
+            for component in ('direct_energy_inputs', 'indirect_energy_inputs')
+            for energy_type, quantity in activity.get(component, {}).items()
+            if energy_type in self.RENEWABLE_ENERGY_TYPES
+        )
+        flows['output_quantity'] = output_quantity
+        flows['environmental_impact'] = environmental_impact
+        
+        self.post_entry(account_id, flows)
+        return flows
+    
+    def _ledger_values(self, flows: Dict[str, float]) -> Tuple[float, ...]:
+        values = dict(flows)
+        values['impact_energy'] = values.get('impact_energy', 0.0) + \
+            values.get('environmental_impact', 0.0) * values.get('total_energy', 0.0)
+        return tuple(float(values.get(name, 0.0)) for name in self.LEDGER_FIELDS)
+    
+    def _account_from_row(self, row: Tuple) -> Dict[str, float]:
+        """Running totals row (entry_count, last_updated, *LEDGER_FIELDS) -> account dict"""
+        account = dict(zip(self.LEDGER_FIELDS, row[2:]))
+        account['entry_count'] = row[0]
+        account['last_updated'] = row[1]
+        impact_energy = account.pop('impact_energy')
+        if account['total_energy'] > 0:
+            account['environmental_impact'] = impact_energy / account['total_energy']
+        return account
+    
+    def get_account(self, account_id: str) -> Optional[Dict[str, float]]:
+        """Running totals for one account, or None if it has no ledger entries"""
+        row = self.conn.execute(
+            f'SELECT entry_count, last_updated, {", ".join(self.LEDGER_FIELDS)} '
+            'FROM energy_account_totals WHERE account_id = ?',
+            (account_id,)
+        ).fetchone()
+        return self._account_from_row(row) if row is not None else None
+    
+    def get_account_entries(self, account_id: str) -> pd.DataFrame:
+        """All ledger entries for one account, oldest first"""
+        return pd.read_sql_query(
+            'SELECT * FROM energy_ledger WHERE account_id = ? ORDER BY entry_id',
+            self.conn, params=(account_id,)
+        )
+    
     def calculate_energy_cost(self, activity: Dict[str, Any]) -> Dict[str, float]:
         """Calculate comprehensive energy cost for an economic activity"""
         energy_cost = {
@@ -368,6 +758,92 @@ class EnergyValueAccountingSystem:
         
         return life_support_value
     
+    # Activity components, with the factor table and default used for each
+    ENERGY_COMPONENTS = {
+        'direct_energy_inputs': 'direct_energy',
+        'indirect_energy_inputs': 'indirect_energy',
+        'materials': 'embodied_energy'
+    }
+    VALUE_COMPONENTS = {
+        'basic_outputs': 'basic_needs',
+        'development_outputs': 'development_needs',
+        'enhancement_outputs': 'enhancement_needs'
+    }
+    
+    @classmethod
+    def activities_to_table(cls, activities: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Convert activity dicts to the long columnar form used by calculate_batch.
+        
+        Returns one row per (activity, component, key, quantity) entry and the
+        per-activity opportunity factors.
+        """
+        rows = [
+            (index, component, key, quantity)
+            for index, activity in enumerate(activities)
+            for component in list(cls.ENERGY_COMPONENTS) + list(cls.VALUE_COMPONENTS)
+            for key, quantity in activity.get(component, {}).items()
+        ]
+        table = pd.DataFrame(rows, columns=['activity', 'component', 'key', 'quantity'])
+        opportunity_factors = np.array([activity.get('opportunity_factor', 0.1) for activity in activities], dtype=float)
+        return table, opportunity_factors
+    
+    def calculate_batch(self, entries: pd.DataFrame, n_activities: int = None,
+                        opportunity_factors: np.ndarray = None) -> pd.DataFrame:
+        """
+        Energy cost, life-support value and efficiency ratio for a batch of activities.
+        
+        entries is a long table with columns activity (0-based row index),
+        component (e.g. 'direct_energy_inputs', 'materials', 'basic_outputs'),
+        key (energy type, material or need type) and quantity. Each component
+        becomes a sparse activities × keys matrix multiplied by its factor
+        vector, so factors are looked up once per distinct key. Returns one
+        row per activity with the same fields as calculate_energy_cost and
+        calculate_life_support_value plus efficiency_ratio.
+        """
+        activity = entries['activity'].to_numpy(dtype=np.int64)
+        if n_activities is None:
+            n_activities = int(activity.max()) + 1 if len(activity) else 0
+        if opportunity_factors is None:
+            opportunity_factors = np.full(n_activities, 0.1)
+        
+        results = {}
+        components = entries['component'].to_numpy()
+        for component, column in {**self.ENERGY_COMPONENTS, **self.VALUE_COMPONENTS}.items():
+            mask = components == component
+            key_codes, keys = pd.factorize(entries['key'].to_numpy()[mask])
+            factors = np.array([self._component_factor(component, key) for key in keys], dtype=float)
+            quantities = sparse.csr_matrix(
+                (entries['quantity'].to_numpy(dtype=float)[mask], (activity[mask], key_codes)),
+                shape=(n_activities, len(keys))
+            )
+            results[column] = quantities @ factors
+        
+        # Opportunity energy (alternative uses of resources)
+        results['opportunity_energy'] = (results['direct_energy'] + results['indirect_energy']) * opportunity_factors
+        results['total_energy'] = (results['direct_energy'] + results['indirect_energy'] +
+                                   results['embodied_energy'] + results['opportunity_energy'])
+        results['total_value'] = results['basic_needs'] + results['development_needs'] + results['enhancement_needs']
+        
+        # Life-support value per unit energy, matching calculate_efficiency_ratio
+        total_energy, total_value = results['total_energy'], results['total_value']
+        results['efficiency_ratio'] = np.where(
+            total_energy == 0, np.where(total_value > 0, np.inf, 0.0),
+            total_value / np.where(total_energy == 0, 1.0, total_energy)
+        )
+        
+        columns = ['direct_energy', 'indirect_energy', 'embodied_energy', 'opportunity_energy', 'total_energy',
+                   'basic_needs', 'development_needs', 'enhancement_needs', 'total_value', 'efficiency_ratio']
+        return pd.DataFrame({column: results[column] for column in columns})
+    
+    def _component_factor(self, component: str, key: str) -> float:
+        """Factor for one key of an activity component, with the defaults of the per-activity methods"""
+        if component == 'materials':
+            return self.conversion_factors.get(f"{key}_embodied", 2.0)
+        if component in self.ENERGY_COMPONENTS:
+            return self.conversion_factors.get(key, 1.0)
+        return self.life_support_values.get(key, 1.0)
+    
     def calculate_efficiency_ratio(self, energy_cost: Dict[str, float], 
                                  life_support_value: Dict[str, float]) -> float:
         """Calculate energy efficiency ratio (life-support value per unit energy)"""
@@ -381,14 +857,39 @@ class EnergyValueAccountingSystem:
     
     def generate_energy_account_report(self, account_id: str) -> Dict[str, Any]:
         """Generate comprehensive energy accounting report"""
-        if account_id not in self.energy_accounts:
+        account = self.get_account(account_id)
+        if account is None:
             return {'error': 'Account not found'}
         
-        account = self.energy_accounts[account_id]
+        return self._account_report(account_id, account, datetime.now().isoformat())
+    
+    def iter_account_reports(self, chunk_size: int = 10000):
+        """
+        Yield reports for every account, one list of up to chunk_size reports at a time.
         
+        Accounts are paged by account_id, so memory stays bounded by the chunk
+        size however many accounts the ledger holds.
+        """
+        for chunk in self._iter_account_chunks(chunk_size):
+            timestamp = datetime.now().isoformat()
+            yield [self._account_report(account_id, account, timestamp) for account_id, account in chunk]
+    
+    def _iter_account_chunks(self, chunk_size: int):
+        """Yield lists of (account_id, account) in account_id order using keyset pagination"""
+        query = (f'SELECT account_id, entry_count, last_updated, {", ".join(self.LEDGER_FIELDS)} '
+                 'FROM energy_account_totals WHERE account_id > ? ORDER BY account_id LIMIT ?')
+        last_id = ''
+        while True:
+            rows = self.conn.execute(query, (last_id, chunk_size)).fetchall()
+            if not rows:
+                return
+            yield [(row[0], self._account_from_row(row[1:])) for row in rows]
+            last_id = rows[-1][0]
+    
+    def _account_report(self, account_id: str, account: Dict[str, float], timestamp: str) -> Dict[str, Any]:
         report = {
             'account_id': account_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'energy_flows': account,
             'efficiency_metrics': {
                 'energy_intensity': account.get('total_energy', 0) / max(account.get('output_quantity', 1), 1),
@@ -432,80 +933,542 @@ class GlobalOptimizationEngine:
     Implements Fuller's World Game optimization algorithms
     """
     
-    def __init__(self, resource_db: PlanetaryResourceDatabase):
+    DEFAULT_OBJECTIVES = {
+        'satisfaction': 0.4,
+        'efficiency': 0.3,
+        'sustainability': 0.2,
+        'equity': 0.1
+    }
+    
+    # Demand predictor features, one row per need snapshot pair (now -> now + horizon)
+    DEMAND_FEATURES = ('unmet_demand', 'total_requirement', 'urgency_level', 'log_population',
+                       'satisfaction_level', 'allocated_quantity', 'latitude', 'longitude', 'horizon_days')
+    
+    def __init__(self, resource_db: PlanetaryResourceDatabase, compatibility_threshold: float = 0.0,
+                 model_dir: str = None, min_training_samples: int = 20, snapshot_window: int = 64):
         self.resource_db = resource_db
+        self.compatibility_threshold = compatibility_threshold  # Resource-need pairs below this are not LP variables
         self.optimization_history: List[AllocationSolution] = []
+        self.last_decomposition_report: Dict[str, Any] = {}
+        
+        # Predictive layer: models are fitted in the background, persisted under
+        # model_dir and loaded only when a forecast is first requested. Training
+        # only uses each need's last snapshot_window snapshots.
+        self.model_dir = model_dir
+        self.min_training_samples = min_training_samples
+        self.snapshot_window = snapshot_window
         self.ml_models: Dict[str, Any] = {}
+        self.need_snapshots: Dict[str, Deque[Tuple[datetime, np.ndarray]]] = {}
+        self._forecast_cache: Dict[str, Dict[float, float]] = {}  # need_id -> {horizon_days: forecast}
+        self._training_executor: Optional[ThreadPoolExecutor] = None
+        self._training_future = None
         self._initialize_ml_models()
     
     def _initialize_ml_models(self):
-        """Initialize machine learning models for predictive optimization"""
-        self.ml_models = {
-            'demand_predictor': RandomForestRegressor(n_estimators=100, random_state=42),
-            'efficiency_predictor': RandomForestRegressor(n_estimators=100, random_state=42),
-            'satisfaction_predictor': RandomForestRegressor(n_estimators=100, random_state=42)
+        """Register model factories; models are created when first trained or loaded"""
+        self._model_factories = {
+            'demand_predictor': lambda: RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
         }
-        logger.info("Machine learning models initialized")
     
     def optimize_global_allocation(self, needs: List[Need], 
-                                 objectives: Dict[str, float] = None) -> AllocationSolution:
+                                 objectives: Dict[str, float] = None,
+                                 forecast_horizon_days: float = None,
+                                 forecast_time_budget: float = 0.1) -> AllocationSolution:
         """
         Perform comprehensive global resource allocation optimization
         
         Args:
             needs: List of needs to satisfy
             objectives: Weights for different optimization objectives
+            forecast_horizon_days: If set, pre-position allocations for the
+                demand forecast this many days ahead
+            forecast_time_budget: Seconds allowed for forecasting
         
         Returns:
             Optimal allocation solution
         """
-        if objectives is None:
-            objectives = {
-                'satisfaction': 0.4,
-                'efficiency': 0.3,
-                'sustainability': 0.2,
-                'equity': 0.1
-            }
-        
         logger.info(f"Starting global optimization for {len(needs)} needs")
         
-        # Prepare optimization data
+        planning_needs = needs
+        if forecast_horizon_days is not None:
+            planning_needs = self.anticipate_needs(needs, forecast_horizon_days, forecast_time_budget)
+        
         resources = list(self.resource_db.resources.values())
+        validated_solution = self.solve_allocation(planning_needs, resources, objectives)
+        
+        # Store solution in history
+        self.record_solution(validated_solution, needs)
+        
+        logger.info(f"Optimization completed with satisfaction score: {validated_solution.total_satisfaction:.3f}")
+        
+        return validated_solution
+    
+    def record_solution(self, solution: AllocationSolution, needs: List[Need]) -> None:
+        """Store a solution in history and snapshot the needs it addressed as training data"""
+        self.optimization_history.append(solution)
+        self.record_need_snapshots(needs, solution, solution.timestamp)
+    
+    def record_need_snapshots(self, needs: List[Need], solution: AllocationSolution = None,
+                              timestamp: datetime = None) -> None:
+        """Record the current state of needs, keeping each need's last snapshot_window; invalidates their cached forecasts"""
+        timestamp = timestamp or datetime.now()
+        allocations = solution.resource_allocations if solution is not None else {}
+        for need in needs:
+            state = self._need_features(need, sum(allocations.get(need.need_id, {}).values()))
+            snapshots = self.need_snapshots.get(need.need_id)
+            if snapshots is None:
+                snapshots = self.need_snapshots[need.need_id] = deque(maxlen=self.snapshot_window)
+            snapshots.append((timestamp, state))
+            self._forecast_cache.pop(need.need_id, None)
+    
+    @staticmethod
+    def _need_features(need: Need, allocated_quantity: float = 0.0) -> np.ndarray:
+        """Snapshot features of a need, in DEMAND_FEATURES order without the horizon"""
+        total_requirement = sum(need.resource_requirements.values())
+        return np.array([
+            total_requirement * (1 - need.satisfaction_level),
+            total_requirement,
+            need.urgency_level,
+            np.log1p(need.population_affected),
+            need.satisfaction_level,
+            allocated_quantity,
+            need.location[0],
+            need.location[1]
+        ], dtype=float)
+    
+    def _demand_training_data(self, max_pairs_per_snapshot: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature rows from each snapshot and target unmet demand at each of the next few snapshots"""
+        features, targets = [], []
+        for snapshots in self.need_snapshots.values():
+            snapshots = list(snapshots)
+            for a, (time_a, state_a) in enumerate(snapshots):
+                for time_b, state_b in snapshots[a + 1:a + 1 + max_pairs_per_snapshot]:
+                    horizon_days = (time_b - time_a).total_seconds() / 86400
+                    features.append(np.append(state_a, horizon_days))
+                    targets.append(state_b[0])
+        
+        if not features:
+            return np.zeros((0, len(self.DEMAND_FEATURES))), np.zeros(0)
+        return np.array(features), np.array(targets)
+    
+    def train_demand_predictor(self, background: bool = True):
+        """
+        Fit the demand predictor on recorded need snapshots.
+        
+        Training runs on a background thread (the forest itself uses all
+        cores) and returns a future unless background is False. Returns None
+        if there are too few snapshot pairs to train on.
+        """
+        features, targets = self._demand_training_data()
+        if len(targets) < self.min_training_samples:
+            logger.info(f"Demand predictor needs {self.min_training_samples} samples, have {len(targets)}")
+            return None
+        
+        if not background:
+            return self._fit_demand_predictor(features, targets)
+        
+        if self._training_executor is None:
+            self._training_executor = ThreadPoolExecutor(max_workers=1)
+        self._training_future = self._training_executor.submit(self._fit_demand_predictor, features, targets)
+        return self._training_future
+    
+    def _fit_demand_predictor(self, features: np.ndarray, targets: np.ndarray) -> RandomForestRegressor:
+        model = self._model_factories['demand_predictor']()
+        model.fit(features, targets)
+        
+        if self.model_dir is not None:
+            os.makedirs(self.model_dir, exist_ok=True)
+            joblib.dump(model, self._model_path('demand_predictor'))
+        
+        self.ml_models['demand_predictor'] = model
+        self._forecast_cache.clear()
+        logger.info(f"Demand predictor trained on {len(targets)} samples")
+        return model
+    
+    def _model_path(self, name: str) -> str:
+        return os.path.join(self.model_dir, f"{name}.joblib")
+    
+    def _get_model(self, name: str) -> Optional[Any]:
+        """Fitted model, loading it from disk on first use; None if none has been trained"""
+        model = self.ml_models.get(name)
+        if model is None and self.model_dir is not None and os.path.exists(self._model_path(name)):
+            model = joblib.load(self._model_path(name))
+            self.ml_models[name] = model
+        return model
+    
+    def forecast_demand(self, needs: List[Need], horizon_days: float,
+                        time_budget: float = None) -> Dict[str, float]:
+        """
+        Forecast unmet demand for each need horizon_days ahead.
+        
+        Forecasts are cached per (need, horizon) until new data arrives for
+        the need or the model is retrained. Uncached needs are predicted in
+        batches; once time_budget seconds are spent, and whenever no model is
+        available, the remaining needs fall back to their current unmet demand.
+        """
+        start = time.perf_counter()
+        forecasts = {}
+        pending = []
+        for need in needs:
+            cached = self._forecast_cache.get(need.need_id, {}).get(horizon_days)
+            if cached is not None:
+                forecasts[need.need_id] = cached
+            else:
+                pending.append(need)
+        
+        model = self._get_model('demand_predictor') if pending else None
+        batch_size = 256
+        for offset in range(0, len(pending), batch_size):
+            batch = pending[offset:offset + batch_size]
+            if model is None or (time_budget is not None and time.perf_counter() - start > time_budget):
+                for need in pending[offset:]:
+                    forecasts[need.need_id] = self._current_unmet_demand(need)
+                break
+            
+            rows = np.array([np.append(self._need_state(need), horizon_days) for need in batch])
+            for need, forecast in zip(batch, np.maximum(model.predict(rows), 0).tolist()):
+                forecasts[need.need_id] = forecast
+                self._forecast_cache.setdefault(need.need_id, {})[horizon_days] = forecast
+        
+        return forecasts
+    
+    def _need_state(self, need: Need) -> np.ndarray:
+        """Latest recorded state of a need, or its current state if it has no snapshots"""
+        snapshots = self.need_snapshots.get(need.need_id)
+        if snapshots:
+            return snapshots[-1][1]
+        return self._need_features(need)
+    
+    @staticmethod
+    def _current_unmet_demand(need: Need) -> float:
+        return sum(need.resource_requirements.values()) * (1 - need.satisfaction_level)
+    
+    def anticipate_needs(self, needs: List[Need], horizon_days: float,
+                         time_budget: float = 0.1) -> List[Need]:
+        """Copies of needs with requirements scaled to their forecast demand, for pre-positioning"""
+        forecasts = self.forecast_demand(needs, horizon_days, time_budget)
+        anticipated = []
+        for need in needs:
+            current = self._current_unmet_demand(need)
+            scale = forecasts[need.need_id] / current if current > 0 else 1.0
+            anticipated.append(replace(need, resource_requirements={
+                resource_type: quantity * scale for resource_type, quantity in need.resource_requirements.items()
+            }))
+        return anticipated
+    
+    def solve_allocation(self, needs: List[Need], resources: List[Resource],
+                         objectives: Dict[str, float] = None) -> AllocationSolution:
+        """Solve one allocation problem over explicit needs and resources, without touching the database"""
+        return self.solve_allocation_with_totals(needs, resources, objectives)[0]
+    
+    def solve_allocation_with_totals(self, needs: List[Need], resources: List[Resource],
+                                     objectives: Dict[str, float] = None) -> Tuple[AllocationSolution, Dict[str, Any]]:
+        """Solve one allocation problem and return the metric totals of its validated allocation for merging"""
+        if objectives is None:
+            objectives = dict(self.DEFAULT_OBJECTIVES)
+        
+        # Prepare optimization data
         optimization_data = self._prepare_optimization_data(needs, resources)
         
         # Perform multi-objective optimization
         solution = self._solve_optimization_problem(optimization_data, objectives)
         
         # Validate and refine solution
-        validated_solution = self._validate_solution(solution, needs, resources)
+        solution = self._validate_solution(solution, needs, resources)
+        allocation_matrix = self._allocation_dict_to_matrix(solution.resource_allocations, needs, resources)
+        return solution, self._solution_metric_totals(allocation_matrix, optimization_data)
+    
+    def partition_problem(self, needs: List[Need], resources: List[Resource],
+                          num_regions: int) -> List[Tuple[List[Need], List[Resource]]]:
+        """
+        Split an allocation problem into independent geographic regions.
         
-        # Store solution in history
-        self.optimization_history.append(validated_solution)
+        Needs are clustered with k-means on unit-sphere coordinates and each
+        resource joins the region of its nearest centroid, so regions share no
+        resources and can be solved separately.
+        """
+        num_regions = max(1, min(num_regions, len(needs)))
+        if num_regions == 1:
+            return [(list(needs), list(resources))]
         
-        logger.info(f"Optimization completed with satisfaction score: {validated_solution.total_satisfaction:.3f}")
+        need_points = _unit_sphere_points(np.array([n.location for n in needs], dtype=float))
+        kmeans = KMeans(n_clusters=num_regions, n_init=4, random_state=42).fit(need_points)
+        need_regions = kmeans.labels_
         
-        return validated_solution
+        if resources:
+            resource_points = _unit_sphere_points(np.array([r.location for r in resources], dtype=float))
+            resource_regions = kmeans.predict(resource_points)
+        else:
+            resource_regions = np.zeros(0, dtype=int)
+        
+        return [
+            ([needs[j] for j in np.flatnonzero(need_regions == region)],
+             [resources[i] for i in np.flatnonzero(resource_regions == region)])
+            for region in range(num_regions)
+        ]
+    
+    def optimize_decomposed(self, needs: List[Need], resources: List[Resource] = None,
+                            objectives: Dict[str, float] = None, num_regions: int = 4,
+                            transfer_radius_km: float = 5000.0, coordination_rounds: int = 10,
+                            max_workers: int = 1, compare_monolithic: bool = False) -> AllocationSolution:
+        """
+        Solve the allocation as geographic clusters coupled through shared capacity.
+        
+        Each cluster's LP covers its needs, its home resources and any other
+        resource within transfer_radius_km of one of its needs. Resources
+        reachable from several clusters are shared: each cluster gets a share
+        of their capacity, the cluster LPs are solved independently (in
+        parallel with max_workers > 1), and a small coordination LP moves
+        capacity between clusters towards those whose capacity shadow prices
+        are highest. Every round is capacity-feasible; the best round is kept.
+        The decomposition report, including the objective gap against the
+        monolithic LP when compare_monolithic is set, is kept in
+        last_decomposition_report.
+        """
+        if resources is None:
+            resources = list(self.resource_db.resources.values())
+        if objectives is None:
+            objectives = dict(self.DEFAULT_OBJECTIVES)
+        
+        start = time.perf_counter()
+        clusters = self._build_clusters(needs, resources, objectives, num_regions, transfer_radius_km)
+        capacities = np.array([r.quantity for r in resources], dtype=float)
+        shares = self._initial_capacity_shares(clusters, capacities)
+        
+        best = None
+        rounds_run = 0
+        executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 and len(clusters) > 1 else None
+        try:
+            for round_index in range(max(coordination_rounds, 1)):
+                rounds_run = round_index + 1
+                allocations, prices = self._solve_clusters(clusters, shares, executor)
+                
+                failed = sum(allocation is None for allocation in allocations)
+                objective = sum(float((cluster['coefficients'] * allocation).sum())
+                                for cluster, allocation in zip(clusters, allocations) if allocation is not None)
+                if best is None or (failed, -objective) < (best[0], -best[1]):
+                    best = (failed, objective, allocations)
+                
+                # Move shared capacity towards the clusters that value it most
+                step = 0.5 / (round_index + 1)
+                new_shares = self._coordinate_capacity_shares(clusters, shares, prices, capacities, step)
+                if all(np.allclose(new, old) for new, old in zip(new_shares, shares)):
+                    break
+                shares = new_shares
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        failed_clusters, _, allocations = best if best is not None else (0, 0.0, [])
+        
+        # Shared resources can be over-committed across clusters: scale every block by its
+        # resources' global factors. Failed clusters contribute empty blocks.
+        blocks = [allocation if allocation is not None else np.zeros_like(cluster['compatibility'])
+                  for cluster, allocation in zip(clusters, allocations)]
+        resource_usage = np.zeros(len(resources))
+        for cluster, allocation in zip(clusters, blocks):
+            resource_usage[cluster['resource_index']] += allocation.sum(axis=1)
+        scaling_factors = self._capacity_scaling(resource_usage, resources)
+        if scaling_factors is not None:
+            blocks = [allocation * scaling_factors[cluster['resource_index'], None]
+                      for cluster, allocation in zip(clusters, blocks)]
+            resource_usage = resource_usage * scaling_factors
+        decomposed_time = time.perf_counter() - start
+        
+        # Metrics and the allocation mapping come from the cluster blocks; no global matrix is built
+        resource_allocations = {need.need_id: {} for need in needs}
+        need_totals = []
+        for cluster, allocation in zip(clusters, blocks):
+            resource_allocations.update(self._allocation_matrix_to_dict(
+                allocation, [needs[j] for j in cluster['need_index']],
+                [resources[i] for i in cluster['resource_index']]))
+            need_totals.append(self._need_metric_totals(allocation, cluster['compatibility'], cluster['cost'],
+                                                        cluster['need_requirements'], cluster['urgency_weights']))
+        metrics = self._combine_metric_totals(need_totals + [self._resource_metric_totals(resource_usage, resources)])
+        solution = AllocationSolution(
+            solution_id=f"decomposed_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            timestamp=datetime.now(),
+            resource_allocations=resource_allocations,
+            **metrics
+        )
+        
+        shortfalls = [np.maximum(cluster['requirements'] - (allocation * cluster['compatibility']).sum(axis=0), 0) /
+                      np.maximum(cluster['requirements'], 0.001) for cluster, allocation in zip(clusters, blocks)]
+        cluster_counts = np.zeros(len(resources), dtype=int)
+        for cluster in clusters:
+            cluster_counts[cluster['resource_index']] += 1
+        
+        report = {
+            'num_clusters': len(clusters),
+            'shared_resources': int((cluster_counts > 1).sum()),
+            'coordination_rounds': rounds_run,
+            'failed_clusters': failed_clusters,
+            'objective_value': sum(float((cluster['coefficients'] * allocation).sum())
+                                   for cluster, allocation in zip(clusters, blocks)),
+            'max_need_shortfall': float(max((shortfall.max(initial=0) for shortfall in shortfalls), default=0)),
+            'solve_time': decomposed_time
+        }
+        
+        if compare_monolithic:
+            # The monolithic LP is the full problem by definition: its matrices are only built on request
+            start = time.perf_counter()
+            data = self._prepare_optimization_data(needs, resources)
+            coefficients = self._objective_coefficients(data, objectives)
+            monolithic_matrix, _, _ = _solve_allocation_lp(coefficients, data['compatibility_matrix'], capacities,
+                                                           data['need_requirements'] * 0.8,
+                                                           self.compatibility_threshold)
+            report['monolithic_solve_time'] = time.perf_counter() - start
+            if monolithic_matrix is not None:
+                monolithic_objective = float((coefficients * monolithic_matrix).sum())
+                report['monolithic_objective_value'] = monolithic_objective
+                report['objective_gap'] = ((monolithic_objective - report['objective_value']) /
+                                           max(abs(monolithic_objective), 1e-9))
+        
+        self.last_decomposition_report = report
+        logger.info(f"Decomposed optimization over {report['num_clusters']} clusters, "
+                    f"objective {report['objective_value']:.3f}")
+        return solution
+    
+    def _build_clusters(self, needs: List[Need], resources: List[Resource], objectives: Dict[str, float],
+                        num_regions: int, transfer_radius_km: float) -> List[Dict[str, Any]]:
+        """Cluster LP blocks: need and candidate resource indices with their coefficient, compatibility and cost matrices"""
+        resource_position = {id(r): i for i, r in enumerate(resources)}
+        need_position = {id(n): j for j, n in enumerate(needs)}
+        resource_points = _unit_sphere_points(np.array([r.location for r in resources], dtype=float).reshape(-1, 2))
+        
+        clusters = []
+        for region_needs, home_resources in self.partition_problem(needs, resources, num_regions):
+            if not region_needs:
+                continue
+            
+            # Candidates: home resources plus any resource close enough to one of the cluster's needs
+            need_points = _unit_sphere_points(np.array([n.location for n in region_needs], dtype=float))
+            if len(resources):
+                nearest_chord, _ = cKDTree(need_points).query(resource_points, k=1)
+                nearby = _great_circle_km(nearest_chord) <= transfer_radius_km
+            else:
+                nearby = np.zeros(0, dtype=bool)
+            nearby[[resource_position[id(r)] for r in home_resources]] = True
+            resource_index = np.flatnonzero(nearby)
+            
+            data = self._prepare_optimization_data(region_needs, [resources[i] for i in resource_index])
+            clusters.append({
+                'need_index': np.array([need_position[id(n)] for n in region_needs], dtype=np.int64),
+                'resource_index': resource_index,
+                'coefficients': self._objective_coefficients(data, objectives),
+                'compatibility': data['compatibility_matrix'],
+                'cost': data['cost_matrix'],
+                'need_requirements': data['need_requirements'],
+                'urgency_weights': data['urgency_weights'],
+                'requirements': data['need_requirements'] * 0.8
+            })
+        
+        return clusters
+    
+    @staticmethod
+    def _initial_capacity_shares(clusters: List[Dict[str, Any]], capacities: np.ndarray) -> List[np.ndarray]:
+        """Split each resource's capacity across the clusters that can reach it, by cluster demand"""
+        demand = np.array([cluster['requirements'].sum() for cluster in clusters])
+        total_demand = np.zeros(len(capacities))
+        for cluster, cluster_demand in zip(clusters, demand):
+            total_demand[cluster['resource_index']] += cluster_demand
+        return [capacities[c['resource_index']] * d / np.maximum(total_demand[c['resource_index']], 1e-12)
+                for c, d in zip(clusters, demand)]
+    
+    def _solve_clusters(self, clusters: List[Dict[str, Any]], shares: List[np.ndarray],
+                        executor: Optional[ProcessPoolExecutor]) -> Tuple[List[Optional[np.ndarray]], List[np.ndarray]]:
+        """Solve every cluster LP within its capacity shares; returns allocations and capacity prices"""
+        arguments = [
+            (cluster['coefficients'], cluster['compatibility'], share, cluster['requirements'],
+             self.compatibility_threshold)
+            for cluster, share in zip(clusters, shares)
+        ]
+        if executor is not None:
+            results = list(executor.map(_solve_allocation_lp, *zip(*arguments)))
+        else:
+            results = [_solve_allocation_lp(*args) for args in arguments]
+        
+        allocations, prices = [], []
+        for cluster, (allocation, capacity_prices, _) in zip(clusters, results):
+            allocations.append(allocation)
+            if capacity_prices is None:
+                # An infeasible cluster needs capacity more than any feasible one
+                capacity_prices = np.full(len(cluster['resource_index']), 10 * cluster['coefficients'].max(initial=1))
+            prices.append(capacity_prices)
+        return allocations, prices
+    
+    @staticmethod
+    def _coordinate_capacity_shares(clusters: List[Dict[str, Any]], shares: List[np.ndarray],
+                                    prices: List[np.ndarray], capacities: np.ndarray, step: float) -> List[np.ndarray]:
+        """
+        Coordination LP over inter-cluster capacity transfers.
+        
+        One variable per (resource, cluster) share change, worth the cluster's
+        shadow price per unit. Changes to each resource sum to zero, no share
+        goes negative and no change exceeds step × capacity.
+        """
+        resource_ids = np.concatenate([cluster['resource_index'] for cluster in clusters])
+        current = np.concatenate(shares)
+        values = np.concatenate(prices)
+        
+        # Only resources reachable from several clusters can move
+        counts = np.bincount(resource_ids, minlength=len(capacities))
+        movable = counts[resource_ids] > 1
+        if not movable.any():
+            return shares
+        
+        ids = resource_ids[movable]
+        limit = step * capacities[ids]
+        constrained, rows = np.unique(ids, return_inverse=True)
+        A_eq = sparse.csr_matrix((np.ones(len(ids)), (rows, np.arange(len(ids)))),
+                                 shape=(len(constrained), len(ids)))
+        bounds = np.column_stack([-np.minimum(current[movable], limit), limit])
+        result = linprog(-values[movable], A_eq=A_eq, b_eq=np.zeros(len(constrained)),
+                         bounds=bounds, method='highs')
+        if not result.success:
+            return shares
+        
+        updated = current.copy()
+        updated[movable] = np.maximum(current[movable] + result.x, 0)
+        return np.split(updated, np.cumsum([len(share) for share in shares])[:-1])
+    
+    def merge_solutions(self, solutions: List[AllocationSolution],
+                        metric_totals: List[Dict[str, Any]]) -> AllocationSolution:
+        """
+        Combine regional solutions into one global solution.
+        
+        Regions from partition_problem share no needs or resources, so the
+        allocations are merged as they are and the global metrics are reduced
+        from each region's metric totals (see solve_allocation_with_totals).
+        """
+        resource_allocations = {}
+        for solution in solutions:
+            resource_allocations.update(solution.resource_allocations)
+        metrics = self._combine_metric_totals(metric_totals)
+        metrics['confidence_level'] = min((s.confidence_level for s in solutions), default=0.0)
+        
+        return AllocationSolution(
+            solution_id=f"regional_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            timestamp=datetime.now(),
+            resource_allocations=resource_allocations,
+            **metrics
+        )
     
     def _prepare_optimization_data(self, needs: List[Need], 
                                  resources: List[Resource]) -> Dict[str, Any]:
         """Prepare data structures for optimization algorithms"""
         
-        # Create resource-need compatibility matrix
-        compatibility_matrix = np.zeros((len(resources), len(needs)))
+        # One pairwise distance matrix shared by compatibility and cost
+        distance_matrix = self._calculate_distance_matrix(
+            np.array([r.location for r in resources], dtype=float).reshape(-1, 2),
+            np.array([n.location for n in needs], dtype=float).reshape(-1, 2)
+        )
         
-        for i, resource in enumerate(resources):
-            for j, need in enumerate(needs):
-                # Calculate compatibility based on resource type, location, quality
-                compatibility = self._calculate_compatibility(resource, need)
-                compatibility_matrix[i, j] = compatibility
+        # Create resource-need compatibility matrix
+        compatibility_matrix = self._calculate_compatibility_matrix(resources, needs, distance_matrix)
         
         # Create cost matrix (transportation + extraction costs)
-        cost_matrix = np.zeros((len(resources), len(needs)))
-        
-        for i, resource in enumerate(resources):
-            for j, need in enumerate(needs):
-                cost = self._calculate_allocation_cost(resource, need)
-                cost_matrix[i, j] = cost
+        cost_matrix = self._calculate_cost_matrix(resources, needs, distance_matrix)
         
         # Create constraint matrices
         resource_constraints = np.array([r.quantity for r in resources])
@@ -516,6 +1479,7 @@ class GlobalOptimizationEngine:
             'needs': needs,
             'compatibility_matrix': compatibility_matrix,
             'cost_matrix': cost_matrix,
+            'distance_matrix': distance_matrix,
             'resource_constraints': resource_constraints,
             'need_requirements': need_requirements,
             'urgency_weights': np.array([n.urgency_level for n in needs])
@@ -523,71 +1487,79 @@ class GlobalOptimizationEngine:
         
         return optimization_data
     
-    def _calculate_compatibility(self, resource: Resource, need: Need) -> float:
-        """Calculate compatibility score between a resource and a need"""
-        
-        # Base compatibility from resource type matching
-        base_compatibility = 0.0
-        for resource_type, quantity in need.resource_requirements.items():
-            if resource_type in resource.metadata.get('resource_types', [resource.category]):
-                base_compatibility += 0.5
-        
-        # Quality compatibility
-        required_quality = need.quality_requirements.get(resource.category, 0.0)
-        quality_compatibility = max(0, resource.quality_score - required_quality)
-        
-        # Distance penalty (closer is better)
-        distance = self._calculate_distance(resource.location, need.location)
-        distance_factor = max(0, 1 - distance / 10000)  # 10,000 km max distance
+    def _calculate_compatibility_matrix(self, resources: List[Resource], needs: List[Need],
+                                        distance_matrix: np.ndarray) -> np.ndarray:
+        """Resources × needs compatibility from type match, quality, distance, accessibility and impact"""
+        
+        # Base compatibility from resource type matching: resources × types incidence
+        # against needs × required types, so each shared type contributes 0.5
+        type_index: Dict[str, int] = {}
+        resource_types = sparse.csr_matrix(self._incidence_matrix(
+            [r.metadata.get('resource_types', [r.category]) for r in resources], type_index
+        ))
+        required_types = sparse.csr_matrix(self._incidence_matrix(
+            [n.resource_requirements.keys() for n in needs], type_index
+        ))
+        resource_types.resize((len(resources), len(type_index)))  # Types first seen on needs
+        base_compatibility = 0.5 * (resource_types @ required_types.T).toarray()
+        
+        # Quality compatibility against each need's requirement for the resource's category
+        category_index: Dict[str, int] = {}
+        resource_categories = np.array([category_index.setdefault(r.category, len(category_index))
+                                        for r in resources], dtype=np.int64)
+        quality_requirements = np.zeros((len(needs), len(category_index)))
+        for j, need in enumerate(needs):
+            for category, required in need.quality_requirements.items():
+                if category in category_index:
+                    quality_requirements[j, category_index[category]] = required
+        quality_scores = np.array([r.quality_score for r in resources], dtype=float)
+        quality_compatibility = np.maximum(0, quality_scores[:, None] - quality_requirements[:, resource_categories].T)
         
-        # Accessibility factor
-        accessibility_factor = resource.accessibility_score
+        # Distance penalty (closer is better), 10,000 km max distance
+        distance_factor = np.maximum(0, 1 - distance_matrix / 10000)
         
-        # Environmental impact penalty
-        environmental_factor = 1 - resource.environmental_impact
+        # Accessibility factor and environmental impact penalty
+        accessibility_factor = np.array([r.accessibility_score for r in resources], dtype=float)
+        environmental_factor = 1 - np.array([r.environmental_impact for r in resources], dtype=float)
         
         # Combined compatibility score
         compatibility = (base_compatibility * 0.3 + 
-                        quality_compatibility * 0.25 + 
-                        distance_factor * 0.2 + 
-                        accessibility_factor * 0.15 + 
-                        environmental_factor * 0.1)
+                         quality_compatibility * 0.25 + 
+                         distance_factor * 0.2 + 
+                         (accessibility_factor * 0.15 + environmental_factor * 0.1)[:, None])
         
-        return min(max(compatibility, 0.0), 1.0)
+        return np.clip(compatibility, 0.0, 1.0)
     
-    def _calculate_allocation_cost(self, resource: Resource, need: Need) -> float:
-        """Calculate total cost of allocating a resource to a need"""
-        
-        # Base extraction cost
-        extraction_cost = resource.extraction_cost
-        
-        # Transportation cost (based on distance)
-        distance = self._calculate_distance(resource.location, need.location)
-        transport_cost = distance * 0.01  # $0.01 per km per unit
-        
-        # Environmental cost
-        environmental_cost = resource.environmental_impact * 10  # Environmental penalty
-        
-        # Urgency bonus (negative cost for urgent needs)
-        urgency_bonus = -need.urgency_level * 0.5
-        
-        total_cost = extraction_cost + transport_cost + environmental_cost + urgency_bonus
-        
-        return max(total_cost, 0.01)  # Minimum cost to avoid division by zero
+    def _calculate_cost_matrix(self, resources: List[Resource], needs: List[Need],
+                               distance_matrix: np.ndarray) -> np.ndarray:
+        """Resources × needs allocation cost: extraction, transport and environmental cost less an urgency bonus"""
+        extraction_cost = np.array([r.extraction_cost for r in resources], dtype=float)
+        environmental_cost = np.array([r.environmental_impact for r in resources], dtype=float) * 10
+        urgency_bonus = -np.array([n.urgency_level for n in needs], dtype=float) * 0.5
+        transport_cost = distance_matrix * 0.01  # $0.01 per km per unit
+        
+        total_cost = (extraction_cost + environmental_cost)[:, None] + transport_cost + urgency_bonus[None, :]
+        return np.maximum(total_cost, 0.01)  # Minimum cost to avoid division by zero
     
-    def _calculate_distance(self, loc1: Tuple[float, float], 
-                          loc2: Tuple[float, float]) -> float:
-        """Calculate distance between two locations using Haversine formula"""
-        lat1, lon1 = np.radians(loc1)
-        lat2, lon2 = np.radians(loc2)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
-        
-        return 6371 * c  # Earth's radius in kilometers
+    @staticmethod
+    def _incidence_matrix(memberships: List[Any], index: Dict[str, int]) -> sparse.coo_matrix:
+        """Rows × labels 0/1 matrix, extending the label index with labels seen for the first time"""
+        rows, cols = [], []
+        for row, labels in enumerate(memberships):
+            for label in set(labels):
+                rows.append(row)
+                cols.append(index.setdefault(label, len(index)))
+        return sparse.coo_matrix((np.ones(len(rows)), (rows, cols)),
+                                 shape=(len(memberships), len(index)))
+    
+    @staticmethod
+    def _calculate_distance_matrix(locations1: np.ndarray, locations2: np.ndarray) -> np.ndarray:
+        """Pairwise Haversine distances in km between two (n, 2) arrays of lat/lon degrees"""
+        lat1, lon1 = np.radians(locations1[:, 0])[:, None], np.radians(locations1[:, 1])[:, None]
+        lat2, lon2 = np.radians(locations2[:, 0])[None, :], np.radians(locations2[:, 1])[None, :]
+        
+        a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+        return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
     
     def _solve_optimization_problem(self, data: Dict[str, Any], 
                                   objectives: Dict[str, float]) -> AllocationSolution:
@@ -595,71 +1567,23 @@ class GlobalOptimizationEngine:
         
         resources = data['resources']
         needs = data['needs']
-        compatibility_matrix = data['compatibility_matrix']
-        cost_matrix = data['cost_matrix']
-        
-        # Decision variables: allocation[i,j] = amount of resource i allocated to need j
-        n_resources = len(resources)
-        n_needs = len(needs)
-        
-        # Objective function coefficients
-        c = []
-        for i in range(n_resources):
-            for j in range(n_needs):
-                # Multi-objective coefficient combining satisfaction, efficiency, sustainability
-                satisfaction_coeff = compatibility_matrix[i, j] * objectives['satisfaction']
-                efficiency_coeff = (1 / max(cost_matrix[i, j], 0.01)) * objectives['efficiency']
-                sustainability_coeff = (1 - resources[i].environmental_impact) * objectives['sustainability']
-                equity_coeff = needs[j].urgency_level / 10 * objectives['equity']
-                
-                # Negative because we're minimizing (linprog minimizes)
-                total_coeff = -(satisfaction_coeff + efficiency_coeff + 
-                               sustainability_coeff + equity_coeff)
-                c.append(total_coeff)
-        
-        # Constraint matrices
-        # Resource capacity constraints
-        A_ub = []
-        b_ub = []
-        
-        for i in range(n_resources):
-            constraint = [0] * (n_resources * n_needs)
-            for j in range(n_needs):
-                constraint[i * n_needs + j] = 1
-            A_ub.append(constraint)
-            b_ub.append(resources[i].quantity)
-        
-        # Need satisfaction constraints (as equality constraints)
-        A_eq = []
-        b_eq = []
-        
-        for j in range(n_needs):
-            constraint = [0] * (n_resources * n_needs)
-            for i in range(n_resources):
-                constraint[i * n_needs + j] = compatibility_matrix[i, j]
-            A_eq.append(constraint)
-            # Aim to satisfy at least 80% of each need
-            b_eq.append(sum(needs[j].resource_requirements.values()) * 0.8)
-        
-        # Bounds (non-negative allocations)
-        bounds = [(0, None) for _ in range(n_resources * n_needs)]
+        
+        # Aim to satisfy at least 80% of each need
+        coefficients = self._objective_coefficients(data, objectives)
+        capacities = np.array([r.quantity for r in resources], dtype=float)
         
         # Solve linear programming problem
         try:
-            result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, 
-                           bounds=bounds, method='highs')
+            allocation_matrix, _, message = _solve_allocation_lp(
+                coefficients, data['compatibility_matrix'], capacities,
+                data['need_requirements'] * 0.8, self.compatibility_threshold
+            )
             
-            if result.success:
-                # Parse solution
-                allocation_matrix = np.array(result.x).reshape(n_resources, n_needs)
+            if allocation_matrix is not None:
+                allocation_matrix = self._enforce_resource_capacity(allocation_matrix, resources)
                 
                 # Create allocation dictionary
-                resource_allocations = {}
-                for j, need in enumerate(needs):
-                    resource_allocations[need.need_id] = {}
-                    for i, resource in enumerate(resources):
-                        if allocation_matrix[i, j] > 0.001:  # Only include significant allocations
-                            resource_allocations[need.need_id][resource.resource_id] = allocation_matrix[i, j]
+                resource_allocations = self._allocation_matrix_to_dict(allocation_matrix, needs, resources)
                 
                 # Calculate solution metrics
                 solution_metrics = self._calculate_solution_metrics(
@@ -676,93 +1600,96 @@ class GlobalOptimizationEngine:
                 return solution
             
             else:
-                logger.error(f"Optimization failed: {result.message}")
-                return self._create_fallback_solution(needs, resources)
+                logger.error(f"Optimization failed: {message}")
+                return self._create_fallback_solution(data)
         
         except Exception as e:
             logger.error(f"Optimization error: {str(e)}")
-            return self._create_fallback_solution(needs, resources)
+            return self._create_fallback_solution(data)
+    
+    def _objective_coefficients(self, data: Dict[str, Any], objectives: Dict[str, float]) -> np.ndarray:
+        """Per-unit value of each resource-need pair combining satisfaction, efficiency, sustainability, equity"""
+        environmental_impact = np.array([r.environmental_impact for r in data['resources']], dtype=float)
+        urgency = np.array([n.urgency_level for n in data['needs']], dtype=float)
+        return (data['compatibility_matrix'] * objectives['satisfaction'] +
+                (1 / np.maximum(data['cost_matrix'], 0.01)) * objectives['efficiency'] +
+                ((1 - environmental_impact) * objectives['sustainability'])[:, None] +
+                (urgency / 10 * objectives['equity'])[None, :])
     
     def _calculate_solution_metrics(self, allocation_matrix: np.ndarray, 
                                   data: Dict[str, Any], 
                                   objectives: Dict[str, float]) -> Dict[str, float]:
         """Calculate comprehensive metrics for an allocation solution"""
+        return self._combine_metric_totals([self._solution_metric_totals(allocation_matrix, data)])
+    
+    def _solution_metric_totals(self, allocation_matrix: np.ndarray, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Metric totals of one allocation problem, reducible across problems by _combine_metric_totals"""
+        totals = self._need_metric_totals(allocation_matrix, data['compatibility_matrix'], data['cost_matrix'],
+                                          data['need_requirements'], data['urgency_weights'])
+        totals.update(self._resource_metric_totals(allocation_matrix.sum(axis=1), data['resources']))
+        return totals
+    
+    @staticmethod
+    def _need_metric_totals(allocation_matrix: np.ndarray, compatibility_matrix: np.ndarray, cost_matrix: np.ndarray,
+                            need_requirements: np.ndarray, urgency_weights: np.ndarray) -> Dict[str, Any]:
+        """Per-need satisfaction levels and benefit/cost sums of an allocation block covering whole needs"""
         
-        resources = data['resources']
-        needs = data['needs']
-        compatibility_matrix = data['compatibility_matrix']
-        cost_matrix = data['cost_matrix']
+        # Per-need satisfaction: compatibility-weighted allocation against requirement
+        need_satisfaction = (allocation_matrix * compatibility_matrix).sum(axis=0)
         
-        # Total satisfaction calculation
-        total_satisfaction = 0.0
-        for j, need in enumerate(needs):
-            need_satisfaction = 0.0
-            total_requirement = sum(need.resource_requirements.values())
-            
-            for i in range(len(resources)):
-                allocated = allocation_matrix[i, j]
-                compatibility = compatibility_matrix[i, j]
-                need_satisfaction += allocated * compatibility
-            
-            satisfaction_ratio = min(need_satisfaction / max(total_requirement, 0.001), 1.0)
-            total_satisfaction += satisfaction_ratio * need.urgency_level
-        
-        total_satisfaction /= max(sum(n.urgency_level for n in needs), 1)
-        
-        # Efficiency score calculation
-        total_cost = 0.0
-        total_benefit = 0.0
-        
-        for i in range(len(resources)):
-            for j in range(len(needs)):
-                allocated = allocation_matrix[i, j]
-                if allocated > 0:
-                    cost = allocated * cost_matrix[i, j]
-                    benefit = allocated * compatibility_matrix[i, j]
-                    total_cost += cost
-                    total_benefit += benefit
-        
-        efficiency_score = total_benefit / max(total_cost, 0.001)
-        
-        # Sustainability score calculation
-        sustainability_score = 0.0
-        total_allocation = 0.0
-        
-        for i, resource in enumerate(resources):
-            resource_allocation = np.sum(allocation_matrix[i, :])
-            if resource_allocation > 0:
-                sustainability_factor = 1 - resource.environmental_impact
-                if resource.sustainability_rating == 'renewable':
-                    sustainability_factor *= 1.2
-                elif resource.sustainability_rating == 'limited_renewable':
-                    sustainability_factor *= 1.0
-                else:  # non_renewable
-                    sustainability_factor *= 0.8
-                
-                sustainability_score += resource_allocation * sustainability_factor
-                total_allocation += resource_allocation
+        # Benefit and cost over positive allocations
+        allocated = np.where(allocation_matrix > 0, allocation_matrix, 0.0)
+        return {
+            'satisfaction_levels': np.minimum(need_satisfaction / np.maximum(need_requirements, 0.001), 1.0),
+            'urgency_weights': np.asarray(urgency_weights),
+            'total_cost': float((allocated * cost_matrix).sum()),
+            'total_benefit': float((allocated * compatibility_matrix).sum())
+        }
+    
+    @staticmethod
+    def _resource_metric_totals(resource_allocation: np.ndarray, resources: List[Resource]) -> Dict[str, float]:
+        """Allocation-weighted sustainability and impact sums from each resource's total allocation"""
+        used = resource_allocation > 0
+        environmental_impacts = np.array([r.environmental_impact for r in resources], dtype=float)
+        rating_factors = np.array([{'renewable': 1.2, 'limited_renewable': 1.0}.get(r.sustainability_rating, 0.8)
+                                   for r in resources])  # non_renewable and unknown ratings: 0.8
+        sustainability_factors = (1 - environmental_impacts) * rating_factors
+        return {
+            'total_allocation': float(resource_allocation[used].sum()),
+            'sustainable_allocation': float((resource_allocation * sustainability_factors)[used].sum()),
+            'impact_allocation': float((resource_allocation * environmental_impacts).sum())
+        }
+    
+    @staticmethod
+    def _combine_metric_totals(totals: List[Dict[str, Any]]) -> Dict[str, float]:
+        """
+        Solution metrics from need and resource totals.
         
-        sustainability_score /= max(total_allocation, 0.001)
+        Each need and each resource must be counted in exactly one of the
+        totals, so regional or cluster totals reduce to the global metrics.
+        """
+        def total(key: str) -> float:
+            return sum(t.get(key, 0.0) for t in totals)
         
-        # Equity score calculation (how evenly needs are satisfied)
-        satisfaction_levels = []
-        for j, need in enumerate(needs):
-            need_satisfaction = 0.0
-            total_requirement = sum(need.resource_requirements.values())
-            
-            for i in range(len(resources)):
-                allocated = allocation_matrix[i, j]
-                compatibility = compatibility_matrix[i, j]
-                need_satisfaction += allocated * compatibility
-            
-            satisfaction_ratio = min(need_satisfaction / max(total_requirement, 0.001), 1.0)
-            satisfaction_levels.append(satisfaction_ratio)
+        satisfaction_levels = np.concatenate([np.zeros(0)] + [t['satisfaction_levels'] for t in totals
+                                                              if 'satisfaction_levels' in t])
+        urgency_weights = np.concatenate([np.zeros(0)] + [t['urgency_weights'] for t in totals
+                                                          if 'urgency_weights' in t])
+        total_cost = total('total_cost')
+        total_allocation = total('total_allocation')
+        
+        # Total satisfaction calculation, weighted by urgency
+        total_satisfaction = float((satisfaction_levels * urgency_weights).sum() / max(urgency_weights.sum(), 1))
+        
+        # Efficiency score calculation over positive allocations
+        efficiency_score = total('total_benefit') / max(total_cost, 0.001)
+        
+        # Sustainability score calculation per resource
+        sustainability_score = total('sustainable_allocation') / max(total_allocation, 0.001)
         
-        # Equity as inverse of coefficient of variation
+        # Equity as inverse of coefficient of variation of need satisfaction
         if len(satisfaction_levels) > 1:
-            mean_satisfaction = np.mean(satisfaction_levels)
-            std_satisfaction = np.std(satisfaction_levels)
-            equity_score = 1 - (std_satisfaction / max(mean_satisfaction, 0.001))
+            equity_score = 1 - (np.std(satisfaction_levels) / max(np.mean(satisfaction_levels), 0.001))
         else:
             equity_score = 1.0
         
@@ -772,12 +1699,7 @@ class GlobalOptimizationEngine:
         implementation_cost = total_cost
         
         # Environmental impact
-        environmental_impact = 0.0
-        for i, resource in enumerate(resources):
-            resource_allocation = np.sum(allocation_matrix[i, :])
-            environmental_impact += resource_allocation * resource.environmental_impact
-        
-        environmental_impact /= max(total_allocation, 0.001)
+        environmental_impact = total('impact_allocation') / max(total_allocation, 0.001)
         
         # Confidence level (based on data quality and model certainty)
         confidence_level = 0.8  # Simplified confidence measure
@@ -792,58 +1714,90 @@ class GlobalOptimizationEngine:
             'confidence_level': confidence_level
         }
     
+    def _enforce_resource_capacity(self, allocation_matrix: np.ndarray, 
+                                   resources: List[Resource]) -> np.ndarray:
+        """Scale down each resource's allocations that exceed its available quantity"""
+        scaling_factors = self._capacity_scaling(allocation_matrix.sum(axis=1), resources)
+        if scaling_factors is not None:
+            allocation_matrix = allocation_matrix * scaling_factors[:, None]
+        
+        return allocation_matrix
+    
+    @staticmethod
+    def _capacity_scaling(resource_usage: np.ndarray, resources: List[Resource]) -> Optional[np.ndarray]:
+        """Per-resource factors bringing usage back within capacity, or None when every resource fits"""
+        capacities = np.array([r.quantity for r in resources], dtype=float)
+        over_capacity = resource_usage > capacities
+        if not over_capacity.any():
+            return None
+        
+        scaling_factors = np.ones_like(resource_usage)
+        scaling_factors[over_capacity] = capacities[over_capacity] / resource_usage[over_capacity]
+        for i in np.flatnonzero(over_capacity):
+            logger.warning(f"Scaling down allocations for resource {resources[i].resource_id} by factor {scaling_factors[i]:.3f}")
+        return scaling_factors
+    
+    def _allocation_matrix_to_dict(self, allocation_matrix: np.ndarray, needs: List[Need],
+                                   resources: List[Resource]) -> Dict[str, Dict[str, float]]:
+        """Sparse need_id -> {resource_id -> quantity} mapping of significant allocations"""
+        resource_allocations = {need.need_id: {} for need in needs}
+        rows, cols = np.nonzero(allocation_matrix > 0.001)  # Only include significant allocations
+        for i, j, quantity in zip(rows.tolist(), cols.tolist(), allocation_matrix[rows, cols].tolist()):
+            resource_allocations[needs[j].need_id][resources[i].resource_id] = quantity
+        return resource_allocations
+    
     def _validate_solution(self, solution: AllocationSolution, 
                           needs: List[Need], resources: List[Resource]) -> AllocationSolution:
         """Validate and refine the optimization solution"""
         
-        # Check resource capacity constraints
-        resource_usage = {}
-        for resource in resources:
-            resource_usage[resource.resource_id] = 0.0
-        
-        for need_id, allocations in solution.resource_allocations.items():
-            for resource_id, quantity in allocations.items():
-                resource_usage[resource_id] += quantity
-        
-        # Adjust allocations if they exceed resource capacity
-        for resource in resources:
-            if resource_usage[resource.resource_id] > resource.quantity:
-                scaling_factor = resource.quantity / resource_usage[resource.resource_id]
-                logger.warning(f"Scaling down allocations for resource {resource.resource_id} by factor {scaling_factor:.3f}")
-                
-                for need_id, allocations in solution.resource_allocations.items():
-                    if resource.resource_id in allocations:
-                        allocations[resource.resource_id] *= scaling_factor
+        # Rebuild the resources × needs matrix from the sparse mapping
+        allocation_matrix = self._allocation_dict_to_matrix(solution.resource_allocations, needs, resources)
         
-        # Recalculate metrics after validation
-        # (This would involve recreating the allocation matrix and recalculating metrics)
+        # Check resource capacity constraints, adjusting allocations that exceed them
+        validated_matrix = self._enforce_resource_capacity(allocation_matrix, resources)
+        if validated_matrix is not allocation_matrix:
+            resource_index = {r.resource_id: i for i, r in enumerate(resources)}
+            need_index = {n.need_id: j for j, n in enumerate(needs)}
+            for need_id, allocations in solution.resource_allocations.items():
+                for resource_id in allocations:
+                    if resource_id in resource_index and need_id in need_index:
+                        allocations[resource_id] = validated_matrix[resource_index[resource_id], need_index[need_id]]
         
         return solution
     
-    def _create_fallback_solution(self, needs: List[Need], 
-                                resources: List[Resource]) -> AllocationSolution:
+    def _allocation_dict_to_matrix(self, resource_allocations: Dict[str, Dict[str, float]],
+                                   needs: List[Need], resources: List[Resource]) -> np.ndarray:
+        """Dense resources × needs matrix from a need_id -> {resource_id -> quantity} mapping"""
+        resource_index = {r.resource_id: i for i, r in enumerate(resources)}
+        need_index = {n.need_id: j for j, n in enumerate(needs)}
+        allocation_matrix = np.zeros((len(resources), len(needs)))
+        for need_id, allocations in resource_allocations.items():
+            for resource_id, quantity in allocations.items():
+                if resource_id in resource_index and need_id in need_index:
+                    allocation_matrix[resource_index[resource_id], need_index[need_id]] += quantity
+        return allocation_matrix
+    
+    def _create_fallback_solution(self, data: Dict[str, Any]) -> AllocationSolution:
         """Create a simple fallback solution when optimization fails"""
+        needs = data['needs']
+        resources = data['resources']
         
-        resource_allocations = {}
+        # Simple greedy allocation: each need draws on its top 3 available resources by compatibility
+        available = np.flatnonzero(data['resource_constraints'] > 0)
+        ranked = np.argsort(-data['compatibility_matrix'][available], axis=0, kind='stable')[:3]
+        top_resources = available[ranked]
         
-        # Simple greedy allocation
-        for need in needs:
-            resource_allocations[need.need_id] = {}
-            total_requirement = sum(need.resource_requirements.values())
-            
-            # Find best available resources for this need
-            available_resources = [r for r in resources if r.quantity > 0]
-            available_resources.sort(key=lambda r: self._calculate_compatibility(r, need), reverse=True)
-            
-            remaining_requirement = total_requirement
-            for resource in available_resources[:3]:  # Use top 3 resources
-                allocation = min(remaining_requirement * 0.5, resource.quantity * 0.1)
-                if allocation > 0:
-                    resource_allocations[need.need_id][resource.resource_id] = allocation
-                    remaining_requirement -= allocation
-                
-                if remaining_requirement <= 0:
-                    break
+        allocations = np.zeros(top_resources.shape)
+        remaining_requirement = data['need_requirements'].astype(float)
+        for rank, resource_index in enumerate(top_resources):
+            allocations[rank] = np.minimum(remaining_requirement * 0.5,
+                                           data['resource_constraints'][resource_index] * 0.1)
+            remaining_requirement -= np.maximum(allocations[rank], 0.0)
+        
+        resource_allocations = {need.need_id: {} for need in needs}
+        for rank, j in zip(*np.nonzero(allocations > 0)):
+            resource_id = resources[top_resources[rank, j]].resource_id
+            resource_allocations[needs[j].need_id][resource_id] = float(allocations[rank, j])
         
         # Calculate basic metrics
         solution = AllocationSolution(
@@ -909,19 +1863,95 @@ class GlobalOptimizationEngine:
         
         return recommendations
 
+def _solve_allocation_lp(coefficients: np.ndarray, compatibility: np.ndarray, capacities: np.ndarray,
+                         requirements: np.ndarray, compatibility_threshold: float = 0.0
+                         ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], str]:
+    """
+    Solve the allocation LP for one resources × needs block.
+    
+    Maximizes coefficient-weighted allocation subject to resource capacities
+    and compatibility-weighted need requirements (as equalities). Only pairs
+    whose compatibility clears the threshold become variables. Returns the
+    allocation matrix and the shadow price of each resource's capacity, or
+    None for both with the solver message on failure.
+    """
+    n_resources, n_needs = compatibility.shape
+    
+    # Decision variables: allocation[i,j] = amount of resource i allocated to need j
+    var_resources, var_needs = np.nonzero(compatibility >= compatibility_threshold)
+    n_variables = len(var_resources)
+    variables = np.arange(n_variables)
+    
+    # Negative because we're minimizing (linprog minimizes)
+    c = -coefficients[var_resources, var_needs]
+    
+    # Resource capacity constraints: one row per resource over its needs
+    A_ub = sparse.csr_matrix((np.ones(n_variables), (var_resources, variables)),
+                             shape=(n_resources, n_variables))
+    
+    # Need satisfaction constraints (as equality constraints), weighted by compatibility
+    A_eq = sparse.csr_matrix((compatibility[var_resources, var_needs], (var_needs, variables)),
+                             shape=(n_needs, n_variables))
+    
+    # Bounds (non-negative allocations)
+    result = linprog(c, A_ub=A_ub, b_ub=capacities, A_eq=A_eq, b_eq=requirements,
+                     bounds=(0, None), method='highs')
+    if not result.success:
+        return None, None, result.message
+    
+    # Parse solution back onto the full resources × needs matrix
+    allocation_matrix = np.zeros((n_resources, n_needs))
+    allocation_matrix[var_resources, var_needs] = result.x
+    
+    # Marginal objective gain per extra unit of each resource's capacity
+    capacity_prices = -np.asarray(result.ineqlin.marginals, dtype=float)
+    return allocation_matrix, capacity_prices, result.message
+
+def _solve_allocation_subproblem(needs: List[Need], resources: List[Resource],
+                                 objectives: Dict[str, float],
+                                 compatibility_threshold: float) -> Tuple[AllocationSolution, Dict[str, Any]]:
+    """Solve one allocation problem in a worker process from plain need and resource records"""
+    engine = GlobalOptimizationEngine(None, compatibility_threshold)
+    return engine.solve_allocation_with_totals(needs, resources, objectives)
+
 class WorldGameSimulator:
     """
     Comprehensive World Game simulation system
     Integrates all components for real-time planetary resource optimization
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: int = None):
         self.resource_db = PlanetaryResourceDatabase()
         self.energy_accounting = EnergyValueAccountingSystem()
         self.optimization_engine = GlobalOptimizationEngine(self.resource_db)
         self.simulation_running = False
         self.simulation_data = []
         
+        # Optimization runs in worker processes so the event loop stays free for ingestion
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def shutdown(self) -> None:
+        """Stop the optimization worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    async def ingest_need(self, need: Need) -> None:
+        """Record a new or updated need; takes effect from the next optimization cycle"""
+        self.resource_db.add_need(need)
+        await asyncio.sleep(0)
+    
+    async def ingest_resource_update(self, resource: Resource) -> None:
+        """Record a new or updated resource; takes effect from the next optimization cycle"""
+        self.resource_db.add_resource(resource)
+        await asyncio.sleep(0)
+        
     async def initialize_world_game(self, scenario: str = "current_earth") -> None:
         """Initialize the World Game with realistic planetary data"""
         logger.info(f"Initializing World Game with scenario: {scenario}")
@@ -952,8 +1982,7 @@ class WorldGameSimulator:
                     30000, 0.9, 0.7, "renewable", 0.2, 0.15, datetime.now())
         ]
         
-        for resource in natural_resources:
-            self.resource_db.add_resource(resource)
+        self.resource_db.add_resources(natural_resources)
         
         # Sample human resources
         human_resources = [
@@ -965,8 +1994,7 @@ class WorldGameSimulator:
                     50000, 0.9, 0.85, "renewable", 80.0, 0.0, datetime.now())
         ]
         
-        for resource in human_resources:
-            self.resource_db.add_resource(resource)
+        self.resource_db.add_resources(human_resources)
         
         # Sample manufactured resources
         manufactured_resources = [
@@ -976,8 +2004,7 @@ class WorldGameSimulator:
                     100000, 0.8, 0.9, "limited_renewable", 0.5, 0.2, datetime.now())
         ]
         
-        for resource in manufactured_resources:
-            self.resource_db.add_resource(resource)
+        self.resource_db.add_resources(manufactured_resources)
         
         # Sample needs
         global_needs = [
@@ -998,18 +2025,44 @@ class WorldGameSimulator:
                 datetime.now() + timedelta(days=3650), 0.2)
         ]
         
-        for need in global_needs:
-            self.resource_db.add_need(need)
+        self.resource_db.add_needs(global_needs)
     
-    async def run_optimization_cycle(self) -> AllocationSolution:
-        """Run a single optimization cycle of the World Game"""
+    async def run_optimization_cycle(self, num_regions: int = 1,
+                                     objectives: Dict[str, float] = None) -> AllocationSolution:
+        """
+        Run a single optimization cycle of the World Game.
+        
+        The solve runs in the process pool on a snapshot of current needs and
+        resources, so ingestion coroutines keep running meanwhile. With
+        num_regions > 1 the problem is split into independent geographic
+        regions that are solved concurrently and merged.
+        """
         logger.info("Running World Game optimization cycle")
+        engine = self.optimization_engine
+        if objectives is None:
+            objectives = dict(engine.DEFAULT_OBJECTIVES)
         
-        # Get current needs
+        # Snapshot current needs and resources; workers receive copies
         current_needs = list(self.resource_db.needs.values())
-        
-        # Run optimization
-        solution = self.optimization_engine.optimize_global_allocation(current_needs)
+        current_resources = list(self.resource_db.resources.values())
+        subproblems = engine.partition_problem(current_needs, current_resources, num_regions)
+        
+        # Run optimization off the event loop, one task per region
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(executor, _solve_allocation_subproblem, region_needs, region_resources,
+                                 objectives, engine.compatibility_threshold)
+            for region_needs, region_resources in subproblems
+        ])
+        
+        if len(results) == 1:
+            solution = results[0][0]
+        else:
+            solutions, metric_totals = zip(*results)
+            solution = engine.merge_solutions(list(solutions), list(metric_totals))
+        engine.record_solution(solution, current_needs)
+        logger.info(f"Optimization completed with satisfaction score: {solution.total_satisfaction:.3f}")
         
         # Update system state based on solution
         await self._update_system_state(solution)
@@ -1232,6 +2285,8 @@ async def main():
     for i, rec in enumerate(report['recommendations'], 1):
         print(f"  {i}. {rec}")
     
+    world_game.shutdown()
+    
     print("\n🎯 World Game demonstration complete!")
     print("This implementation demonstrates Fuller's vision of comprehensive")
     print("anticipatory design science applied to planetary resource optimization.")
@@ -0,0 +1,266 @@
+"""Tests for the LIFE system AI components."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from life_system_ai_implementation import (AutomationController, EnergyAccount, LIFESystemAI,
+                                          PredictiveMaintenanceSystem, RealTimeResourceOptimizer, ResourceFlow,
+                                          resource_flows_to_frame)
+
+
+def _reference_anomaly_rate(series_by_sensor, window=50, history=100, threshold=3.0):
+    """Anomaly rate computed directly from each sensor's full reading list."""
+    anomalies = 0
+    total = 0
+    for values in series_by_sensor.values():
+        values = np.asarray(values)
+        total += len(values)
+        for i in range(max(0, len(values) - history), len(values)):
+            recent = values[max(0, i - window + 1):i + 1]
+            anomalies += abs(values[i] - recent.mean()) / (recent.std() + 1e-6) > threshold
+    return anomalies / (total + 1e-6)
+
+
+def test_single_reading_ingestion_with_interleaved_new_equipment_and_sensors():
+    rng = np.random.default_rng(7)
+    system = PredictiveMaintenanceSystem()
+    readings = {}
+    start = datetime(2026, 1, 1)
+
+    # New sensors and new equipment arrive one reading at a time, interleaved
+    for step in range(3000):
+        equipment_id = f"equipment_{rng.integers(0, 12)}"
+        sensor_type = str(rng.choice(['temperature', 'vibration', 'efficiency', 'pressure']))
+        value = float(rng.normal(10.0, 1.0) + (rng.random() < 0.03) * 8.0)
+        system.add_sensor_reading(equipment_id, sensor_type, value, start + timedelta(seconds=step))
+        readings.setdefault(equipment_id, {}).setdefault(sensor_type, []).append(value)
+
+    for equipment_id, series_by_sensor in readings.items():
+        prediction = system.predict_failure_probability(equipment_id)
+        assert np.isclose(prediction['anomaly_rate'], _reference_anomaly_rate(series_by_sensor))
+
+        for sensor_type, values in series_by_sensor.items():
+            stored = system.get_sensor_readings(equipment_id, sensor_type)
+            np.testing.assert_array_equal(stored['value'].to_numpy(), values)
+
+
+def test_second_sensor_then_new_equipment():
+    system = PredictiveMaintenanceSystem()
+    now = datetime(2026, 1, 1)
+    system.add_sensor_reading('pump_1', 'temperature', 50.0, now)
+    system.add_sensor_reading('pump_1', 'vibration', 0.1, now)
+    system.add_sensor_reading('pump_2', 'temperature', 51.0, now)
+
+    assert system.predict_failure_probability('pump_2')['failure_probability'] == 0.0
+    assert not system.detect_anomalies('pump_2', 'temperature', 1)['anomaly_detected']
+
+
+def test_bulk_ingestion_matches_single_readings():
+    rng = np.random.default_rng(3)
+    n = 5000
+    equipment_ids = rng.choice([f"equipment_{i}" for i in range(20)], n)
+    sensor_types = rng.choice(['temperature', 'vibration'], n)
+    values = rng.normal(100.0, 2.0, n) + (rng.random(n) < 0.03) * 20.0
+    timestamps = np.datetime64('2026-01-01T00:00:00', 'ns') + np.arange(n).astype('timedelta64[s]')
+
+    single = PredictiveMaintenanceSystem()
+    for i in range(n):
+        single.add_sensor_reading(str(equipment_ids[i]), str(sensor_types[i]), float(values[i]), timestamps[i])
+
+    bulk = PredictiveMaintenanceSystem(partition_seconds=60, max_hot_partitions=2)
+    for chunk in np.array_split(np.arange(n), 7):
+        bulk.add_sensor_readings(equipment_ids[chunk], sensor_types[chunk], values[chunk], timestamps[chunk])
+
+    try:
+        assert bulk.readings.cold  # old partitions were spilled to disk
+        for equipment_id in set(equipment_ids):
+            assert single.predict_failure_probability(equipment_id) == bulk.predict_failure_probability(equipment_id)
+            for sensor_type in ('temperature', 'vibration'):
+                np.testing.assert_array_equal(single.get_sensor_readings(equipment_id, sensor_type)['value'],
+                                              bulk.get_sensor_readings(equipment_id, sensor_type)['value'])
+    finally:
+        single.readings.close()
+        bulk.readings.close()
+
+
+def test_life_system_ai_constructs_with_normalized_quantum_state():
+    life_ai = LIFESystemAI()
+    assert np.isclose(np.linalg.norm(life_ai.quantum_model.economic_state_vector), 1.0)
+
+
+def test_scheduler_applies_simulated_time_and_priorities():
+    async def run():
+        controller = AutomationController(max_concurrency=2, queue_size=2, simulated_task_time=0.05)
+        controller.register_automation_task('urgent', {'task_type': 'resource_allocation', 'priority': 'high'})
+        controller.register_automation_task('batch', {'task_type': 'resource_allocation', 'priority': 'low'})
+        controller.register_automation_task('cpu', {'task_type': 'data_processing', 'priority': 'medium'})
+        completed = []
+
+        async def submit(task_id):
+            await controller.run_automation_task(task_id, {'record_count': 3})
+            completed.append(task_id)
+
+        await asyncio.gather(*[submit('batch') for _ in range(4)], *[submit('urgent') for _ in range(4)])
+
+        started = time.perf_counter()
+        result = await controller.run_automation_task('cpu', {'record_count': 3})
+        cpu_elapsed = time.perf_counter() - started
+        await controller.stop()
+        return completed, result, cpu_elapsed, controller.get_latency_histogram('urgent')
+
+    completed, result, cpu_elapsed, histogram = asyncio.run(run())
+    assert completed == ['urgent'] * 4 + ['batch'] * 4
+    assert result['output_data']['processed_records'] == 3
+    assert cpu_elapsed >= 0.05
+    assert histogram['count'] == 4
+
+
+def _reference_moving_average(historical_data, forecast_horizon):
+    """The original per-resource moving-average loop."""
+    predictions = {}
+    for resource_type in set().union(*[d.keys() for d in historical_data]):
+        series = [d.get(resource_type, 0) for d in historical_data]
+        window_size = min(7, len(series))
+        recent_average = np.mean(series[-window_size:])
+        trend = (series[-1] - series[-window_size]) / window_size if len(series) > window_size else 0
+        predictions[resource_type] = [max(0, recent_average + trend * i) for i in range(1, forecast_horizon + 1)]
+    return predictions
+
+
+def test_moving_average_forecast_matches_per_resource_loop():
+    rng = np.random.default_rng(50)
+    for _ in range(30):
+        names = [f"resource_{j}" for j in range(int(rng.integers(1, 6)))]
+        history = [{name: float(rng.uniform(0, 100)) for name in names if rng.random() < 0.7}
+                   for _ in range(int(rng.integers(1, 20)))]
+        history[0].setdefault(names[0], 1.0)
+
+        optimizer = RealTimeResourceOptimizer()
+        for demands in history:
+            optimizer.record_demand(demands)
+        expected = _reference_moving_average(history, 12)
+
+        for predictions in (optimizer.predict_future_demand(history, 12), optimizer.predict_future_demand(None, 12)):
+            assert predictions.keys() == expected.keys()
+            for name in expected:
+                np.testing.assert_allclose(predictions[name], expected[name])
+
+
+def test_demand_buffer_grows_each_axis_independently():
+    optimizer = RealTimeResourceOptimizer()
+    for step in range(1000):
+        optimizer.record_demand({'water': float(step)})
+    assert optimizer._demand_buffer.shape == (1, 1024)
+
+    # New resources arriving mid-history add rows without touching the time axis
+    for j in range(12):
+        optimizer.record_demand({f"resource_{j}": float(j + 1)})
+    assert optimizer._demand_buffer.shape == (16, 1024)
+
+    history = optimizer.demand_history
+    assert history.shape == (13, 1012)
+    np.testing.assert_array_equal(history[0, :1000], np.arange(1000))
+    assert not history[0, 1000:].any()
+    for j in range(12):
+        row = history[j + 1]
+        assert row[1000 + j] == j + 1
+        assert np.count_nonzero(row) == 1
+
+
+def test_long_window_anomalies_read_only_the_newest_partitions():
+    rng = np.random.default_rng(47)
+    n = 4000
+    equipment_ids = rng.choice(['pump_1', 'pump_2', 'fan_1'], n)
+    sensor_types = rng.choice(['temperature', 'vibration'], n)
+    values = rng.normal(20.0, 1.0, n)
+    offsets = np.sort(rng.integers(0, 4 * 3600, n)).astype('timedelta64[s]')
+    timestamps = np.datetime64('2026-01-01T00:00:00', 'ns') + offsets
+
+    system = PredictiveMaintenanceSystem(partition_seconds=300, max_hot_partitions=3)
+    try:
+        system.add_sensor_readings(equipment_ids, sensor_types, values, timestamps)
+        assert system.readings.cold
+        for equipment_id in ('pump_1', 'pump_2', 'fan_1'):
+            for sensor_type in ('temperature', 'vibration'):
+                code = system._series_code(equipment_id, sensor_type)
+                everything = system.readings.query(code)
+                for window_size in (system.windows.size + 1, 300, len(everything), len(everything) + 10):
+                    np.testing.assert_array_equal(system.readings.latest(code, window_size),
+                                                  everything[-window_size:])
+                    result = system.detect_anomalies(equipment_id, sensor_type, window_size)
+                    if window_size <= len(everything):
+                        recent = everything['value'][-window_size:]
+                        assert result['mean_value'] == np.mean(recent)
+                        assert result['latest_value'] == recent[-1]
+    finally:
+        system.readings.close()
+
+
+def test_batched_resource_flows_match_per_flow_energy_accounts():
+    rng = np.random.default_rng(49)
+    resource_types = ['solar_energy', 'water', 'organic_waste', 'materials']
+    flows = [ResourceFlow(str(rng.choice(resource_types)), f"source_{i % 7}", f"destination_{i % 5}",
+                          float(rng.uniform(1, 1000)), float(rng.uniform(0, 5000)) if i % 9 else 0.0,
+                          datetime(2026, 1, 1) + timedelta(minutes=i), {'purity': float(rng.uniform(0, 1))})
+                 for i in range(200)]
+
+    async def run(process):
+        life_ai = LIFESystemAI()
+        life_ai.automation_controller.simulated_task_time = 0.0
+        await life_ai.initialize_system()
+        try:
+            return life_ai, await process(life_ai)
+        finally:
+            await life_ai.shutdown()
+
+    async def per_flow(life_ai):
+        return [await life_ai.process_resource_flow(flow) for flow in flows]
+
+    single, single_results = asyncio.run(run(per_flow))
+    for batch in (flows, resource_flows_to_frame(flows)):
+        batched, result = asyncio.run(run(lambda life_ai: life_ai.process_resource_flows(batch)))
+        accounts = result['energy_accounts']
+        assert result['flows_processed'] == len(flows) == len(accounts)
+
+        efficiencies = []
+        for i, flow in enumerate(flows):
+            expected = EnergyAccount(
+                direct_energy=flow.energy_content,
+                indirect_energy=flow.energy_content * LIFESystemAI.INDIRECT_ENERGY_FACTOR,
+                remediation_energy=flow.energy_content * LIFESystemAI.REMEDIATION_ENERGY_FACTOR,
+                opportunity_energy=flow.energy_content * LIFESystemAI.OPPORTUNITY_ENERGY_FACTOR
+            )
+            row = accounts.iloc[i]
+            for name, value in expected.__dict__.items():
+                assert row[name] == value, name
+                assert single_results[i]['energy_account'][name] == value, name
+            assert row['total_energy_cost'] == pytest.approx(expected.total_energy_cost, rel=1e-12)
+            assert row['efficiency_ratio'] == pytest.approx(expected.efficiency_ratio, rel=1e-12)
+            assert single_results[i]['system_efficiency'] == expected.efficiency_ratio
+            efficiencies.append(expected.efficiency_ratio)
+
+        # Flows without energy content have an infinite ratio, as EnergyAccount does
+        assert result['system_efficiency'] == np.mean(efficiencies) == float('inf')
+        np.testing.assert_array_equal(np.isinf(accounts['efficiency_ratio']),
+                                      [flow.energy_content == 0 for flow in flows])
+
+        assert batched.thermodynamic_model.entropy_generation_rate == pytest.approx(
+            single.thermodynamic_model.entropy_generation_rate, rel=1e-12)
+        assert batched.resource_optimizer.total_flows == single.resource_optimizer.total_flows == len(flows)
+
+        expected_totals = {}
+        for flow in flows:
+            expected_totals[flow.resource_type] = expected_totals.get(flow.resource_type, 0.0) + flow.quantity
+        allocated = result['automation_result']['output_data']['allocated_resources']
+        assert allocated.keys() == expected_totals.keys()
+        for resource_type, quantity in expected_totals.items():
+            assert allocated[resource_type] == pytest.approx(quantity, rel=1e-12)
+
+    powered = [i for i, flow in enumerate(flows) if flow.energy_content > 0]
+    _, result = asyncio.run(run(lambda life_ai: life_ai.process_resource_flows([flows[i] for i in powered])))
+    assert result['system_efficiency'] == pytest.approx(
+        np.mean([single_results[i]['system_efficiency'] for i in powered]), rel=1e-12)
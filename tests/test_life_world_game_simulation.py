@@ -0,0 +1,333 @@
+"""Tests for the World Game engine and planetary coordination simulator."""
+
+import itertools
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from life_world_game_simulation import (ChallengeType, PlanetaryCoordinationSimulator, SimulationEventScheduler,
+                                       WorldGameEngine)
+
+
+def _table_counts(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {name: conn.execute(f'SELECT COUNT(*) FROM {name}').fetchone()[0]
+                for name in WorldGameEngine.SNAPSHOT_TABLES}
+    finally:
+        conn.close()
+
+
+def _run_with_checkpoints(path, days):
+    simulator = PlanetaryCoordinationSimulator(num_communities=30, num_bioregions=5, db_path=path)
+    simulator.simulation_days = days
+    simulator.checkpoint_interval = 50
+    simulator.run_planetary_simulation()
+    return simulator
+
+
+def _flatten(metrics, prefix=''):
+    """Metric values keyed by their dotted path, without the wall-clock timestamp."""
+    flat = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{prefix}{key}.'))
+        elif key != 'timestamp':
+            flat[prefix + key] = value
+    return flat
+
+
+def test_opening_an_existing_checkpoint_keeps_it(tmp_path):
+    path = str(tmp_path / 'world_game.db')
+    random.seed(1)
+    np.random.seed(1)
+    first = _run_with_checkpoints(path, 60)
+    first.world_game.conn.close()
+    counts = _table_counts(path)
+    assert counts['communities'] == 30
+
+    with pytest.raises(FileExistsError):
+        PlanetaryCoordinationSimulator(num_communities=30, num_bioregions=5, db_path=path)
+    with pytest.raises(FileExistsError):
+        WorldGameEngine(db_path=path)
+    assert _table_counts(path) == counts
+
+    replaced = WorldGameEngine(db_path=path, overwrite=True)
+    replaced.save_snapshot()
+    replaced.conn.close()
+    assert _table_counts(path)['communities'] == 0
+
+
+def test_resume_continues_a_run_from_its_last_checkpoint(tmp_path):
+    random.seed(3)
+    np.random.seed(3)
+    uninterrupted = _run_with_checkpoints(str(tmp_path / 'uninterrupted.db'), 240)
+
+    # The interrupted run checkpoints on day 100 and then fails on day 150,
+    # after making decisions and resolving challenges past the checkpoint
+    path = str(tmp_path / 'interrupted.db')
+    random.seed(3)
+    np.random.seed(3)
+    interrupted = _run_with_checkpoints(path, 150)
+    interrupted.world_game.conn.close()
+
+    resumed = PlanetaryCoordinationSimulator.resume(path)
+    assert resumed.current_day == 100
+    assert resumed.daily_metrics[-1]['day'] == 100
+    assert len(resumed.world_game.decision_history) < len(interrupted.world_game.decision_history)
+    resumed.simulation_days = 240
+    resumed.run_planetary_simulation()
+
+    assert resumed.current_day == uninterrupted.current_day
+    assert len(resumed.daily_metrics) == len(uninterrupted.daily_metrics)
+    for resumed_day, uninterrupted_day in zip(resumed.daily_metrics, uninterrupted.daily_metrics):
+        # Trust aggregates are rebuilt on restore, so sums may differ in the last bits
+        assert _flatten(resumed_day) == pytest.approx(_flatten(uninterrupted_day), rel=1e-12)
+    assert ([decision['proposal_id'] for decision in resumed.world_game.decision_history] ==
+            [decision['proposal_id'] for decision in uninterrupted.world_game.decision_history])
+    assert resumed.world_game.active_challenges.keys() == uninterrupted.world_game.active_challenges.keys()
+
+
+def test_load_snapshot_into_the_same_file(tmp_path):
+    path = str(tmp_path / 'world_game.db')
+    random.seed(2)
+    np.random.seed(2)
+    simulator = PlanetaryCoordinationSimulator(num_communities=20, num_bioregions=4, db_path=path)
+    simulator.world_game.save_snapshot()
+    simulator.world_game.conn.close()
+
+    engine = WorldGameEngine.load_snapshot(path, db_path=path)
+    assert len(engine.communities) == 20
+    assert engine.active_challenges.keys() == simulator.world_game.active_challenges.keys()
+    assert _table_counts(path)['communities'] == 20
+
+
+def _reference_coordination_complexity(engine, affected_regions):
+    """The original all-pairs networkx loop."""
+    region_complexity = min(1.0, len(affected_regions) / 10)
+    affected = [c for region in affected_regions for c in engine.bioregions.get(region, [])]
+    if len(affected_regions) <= 1 or len(affected) <= 1:
+        return region_complexity * 0.6 + 0.1 * 0.4
+
+    paths = []
+    for i, comm1 in enumerate(affected):
+        for comm2 in affected[i + 1:]:
+            try:
+                paths.append(nx.shortest_path_length(engine.network_graph, comm1, comm2))
+            except nx.NetworkXNoPath:
+                paths.append(10)
+    return region_complexity * 0.6 + min(1.0, np.mean(paths) / 5) * 0.4
+
+
+def test_coordination_complexity_matches_all_pairs_shortest_paths():
+    random.seed(26)
+    np.random.seed(26)
+    # Sparse bioregions leave some communities disconnected
+    simulator = PlanetaryCoordinationSimulator(num_communities=120, num_bioregions=6,
+                                               intra_bioregion_connection_rate=0.05)
+    engine = simulator.world_game
+    regions = list(engine.bioregions)
+    node_index, adjacency = engine._get_adjacency_matrix()
+
+    numpy_state = np.random.get_state()
+    for size in (1, 2, 3, 6):
+        for affected_regions in itertools.combinations(regions, size):
+            expected = _reference_coordination_complexity(engine, list(affected_regions))
+            assert engine._calculate_coordination_complexity(list(affected_regions)) == expected
+
+            affected = np.array([node_index[c] for region in affected_regions for c in engine.bioregions[region]])
+            assert (engine._affected_path_lengths(adjacency, affected, max_cells=300) ==
+                    engine._affected_path_lengths(adjacency, affected))
+    assert np.random.get_state()[2] == numpy_state[2]
+
+    # Sampling is opt-in and draws from the engine's own generator
+    engine.max_complexity_sources = 8
+    engine.complexity_rng = np.random.default_rng(0)
+    assert 0.0 < engine._calculate_coordination_complexity(regions) <= 1.0
+    assert np.random.get_state()[2] == numpy_state[2]
+
+
+def _reference_can_contribute(production, consumption, challenge):
+    """The original per-community dict check."""
+    for resource, required_amount in challenge.required_resources.items():
+        if production.get(resource, 0.0) - consumption.get(resource, 0.0) > required_amount * 0.1:
+            return True
+    return False
+
+
+def test_contribution_matrix_matches_per_community_checks():
+    random.seed(27)
+    np.random.seed(27)
+    simulator = PlanetaryCoordinationSimulator(num_communities=80, num_bioregions=6)
+    engine = simulator.world_game
+    regions = list(engine.bioregions)
+    for k, challenge_type in enumerate(ChallengeType):
+        engine.create_global_challenge(challenge_type, 0.2 + 0.1 * k, regions[:2], 100)
+
+    rng = np.random.default_rng(27)
+    table = engine.resource_table
+    for round_index in range(3):
+        challenge_ids, can_contribute = engine.get_contribution_matrix()
+        surplus = engine.compute_resource_surplus()
+        for i, community_id in enumerate(table.community_ids):
+            community = engine.communities[community_id]
+            production = dict(community.resource_production)
+            consumption = dict(community.resource_consumption)
+            for k, category in enumerate(table.categories):
+                assert surplus[i, k] == production[category] - consumption[category]
+                assert community.get_resource_surplus(category) == surplus[i, k]
+            for c, challenge_id in enumerate(challenge_ids):
+                challenge = engine.active_challenges[challenge_id]
+                assert can_contribute[i, c] == _reference_can_contribute(production, consumption, challenge)
+                assert community.can_contribute_to_challenge(challenge) == can_contribute[i, c]
+
+        # Writes through the community views invalidate the cached surplus
+        for community_id in rng.choice(table.community_ids, 20, replace=False):
+            community = engine.communities[community_id]
+            category = table.categories[rng.integers(len(table.categories))]
+            community.resource_production[category] *= float(rng.uniform(0, 3))
+            community.resource_consumption[category] += float(rng.uniform(-50, 50))
+
+
+def _reference_system_metrics(engine):
+    """The original uncached metric computation, without the timestamp."""
+    total_connections = engine.network_graph.number_of_edges()
+    possible_connections = len(engine.communities) * (len(engine.communities) - 1) / 2
+    network_density = total_connections / possible_connections if possible_connections > 0 else 0
+    trusting = [np.mean(list(c.trust_relationships.values())) for c in engine.communities.values()
+                if c.trust_relationships]
+    avg_trust = np.mean(trusting) if trusting else 0
+
+    recent = [d for d in engine.decision_history if d['decided_date'] > datetime.now() - timedelta(days=30)]
+    total_eligible = sum(d['participants'] for d in recent)
+    total_participated = sum(d['votes_for'] + d['votes_against'] + d['abstentions'] for d in recent)
+
+    total_challenges = len(engine.resolved_challenges) + len(engine.active_challenges)
+    successful = sum(1 for c in engine.resolved_challenges if getattr(c, 'success', False))
+    active = engine.active_challenges.values()
+    return {
+        'coordination_effectiveness': network_density * 0.4 + avg_trust * 0.6,
+        'resource_optimization_score': (sum(r.is_sustainable() for r in engine.global_resources.values()) /
+                                        len(engine.global_resources)),
+        'democratic_participation_rate': total_participated / total_eligible if total_eligible > 0 else 0,
+        'challenge_resolution_rate': successful / total_challenges if total_challenges > 0 else 0,
+        'network_metrics': {
+            'total_communities': len(engine.communities),
+            'total_connections': total_connections,
+            'network_density': network_density,
+            'average_trust': avg_trust,
+            'bioregions': len(engine.bioregions)
+        },
+        'resource_status': {
+            resource_id: {
+                'category': resource.category.value,
+                'utilization_rate': resource.get_utilization_rate(),
+                'is_sustainable': resource.is_sustainable(),
+                'is_critical': resource.is_critical(),
+                'total_allocated': sum(resource.current_allocation.values())
+            }
+            for resource_id, resource in engine.global_resources.items()
+        },
+        'challenge_status': {
+            'active_challenges': len(engine.active_challenges),
+            'resolved_challenges': len(engine.resolved_challenges),
+            'average_urgency': np.mean([c.calculate_urgency() for c in active]) if active else 0,
+            'average_complexity': np.mean([c.coordination_complexity for c in active]) if active else 0
+        },
+        'governance_metrics': {
+            'active_proposals': len(engine.active_proposals),
+            'recent_decisions': len(recent),
+            'approval_rate': np.mean([d['result'] == 'approved' for d in recent]) if recent else 0
+        }
+    }
+
+
+def test_cached_system_metrics_match_uncached_computation():
+    random.seed(28)
+    np.random.seed(28)
+    simulator = PlanetaryCoordinationSimulator(num_communities=40, num_bioregions=5)
+    engine = simulator.world_game
+    community_ids = list(engine.communities)
+
+    for days in (30, 120, 200, 365):
+        simulator.simulation_days = days
+        simulator.run_planetary_simulation()
+        assert simulator.daily_metrics[-1]['day'] == days - 1
+        expected = _flatten(_reference_system_metrics(engine))
+        assert _flatten(engine.get_system_metrics()) == pytest.approx(expected, rel=1e-12)
+
+        # Edits between runs go through the engine and invalidate the affected components
+        engine.connect_communities(community_ids[days % 40], community_ids[(days * 7 + 1) % 40], 0.9)
+        engine.create_global_challenge(ChallengeType.PANDEMIC, 0.5, list(engine.bioregions)[:2], 20)
+        simulator._schedule_challenge_expiries()
+        assert _flatten(engine.get_system_metrics()) == pytest.approx(_flatten(_reference_system_metrics(engine)),
+                                                                      rel=1e-12)
+
+
+def test_scheduler_processes_events_in_day_loop_order():
+    rng = random.Random(29)
+    scheduler = SimulationEventScheduler()
+    log = []
+
+    def record(name):
+        log.append((scheduler.current_day, name))
+        if name == 'chain' and scheduler.current_day < 150:
+            scheduler.schedule(scheduler.current_day + 13, 99, record, 'chain')
+
+    # One phase per event, so the day loop's polling order is fully determined
+    events = [(rng.randrange(0, 60), phase, rng.choice([None, 1, 7, 30, 90])) for phase in range(30)]
+    for day, phase, interval in events:
+        scheduler.schedule(day, phase, record, phase, interval=interval)
+    scheduler.schedule(5, 99, record, 'chain')
+    scheduler.run(200)
+
+    # Reference: poll every event on every day, in phase order
+    expected = []
+    chain_days = set(range(5, 163, 13))
+    for day in range(200):
+        for start, phase, interval in events:
+            if day == start or (interval is not None and day > start and (day - start) % interval == 0):
+                expected.append((day, phase))
+        if day in chain_days:
+            expected.append((day, 'chain'))
+    assert log == expected
+
+
+def test_challenge_timers_match_daily_countdown():
+    random.seed(291)
+    np.random.seed(291)
+    simulator = PlanetaryCoordinationSimulator(num_communities=40, num_bioregions=5)
+    engine = simulator.world_game
+
+    # Challenges created before the run count down from day 0; later ones from the day after creation
+    created = {cid: (-1, c.time_sensitivity) for cid, c in engine.active_challenges.items()}
+    early = {}
+    create_challenge, resolve_challenge = engine.create_global_challenge, engine._resolve_challenge
+
+    def create(*args, **kwargs):
+        challenge = create_challenge(*args, **kwargs)
+        created[challenge.challenge_id] = (simulator.current_day, challenge.time_sensitivity)
+        return challenge
+
+    def resolve(challenge_id, success):
+        if engine.active_challenges[challenge_id].time_sensitivity > 0:
+            early[challenge_id] = simulator.current_day
+        resolve_challenge(challenge_id, success)
+
+    observed = []
+    engine.create_global_challenge, engine._resolve_challenge = create, resolve
+    simulator._collect_daily_metrics = lambda: observed.append(
+        (simulator.current_day, {cid: c.time_sensitivity for cid, c in engine.active_challenges.items()}))
+    simulator.run_planetary_simulation()
+
+    assert [day for day, _ in observed] == list(range(365))
+    assert len(created) > 3
+    for day, active in observed:
+        expected = {cid: t0 - (day - c) for cid, (c, t0) in created.items() if c < day and t0 - (day - c) > 0}
+        settled = {cid for cid, resolved_day in early.items() if resolved_day <= day}
+        assert {cid: t for cid, t in active.items() if cid not in settled} == pytest.approx(
+            {cid: t for cid, t in expected.items() if cid not in settled})
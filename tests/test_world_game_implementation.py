@@ -0,0 +1,603 @@
+"""Tests for the World Game resource database and optimization engine."""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import pytest
+
+from scipy.optimize import linprog
+
+from world_game_implementation import (EnergyValueAccountingSystem, GlobalOptimizationEngine, Need,
+                                     PlanetaryResourceDatabase, Resource, _solve_allocation_lp, _unit_sphere_points)
+
+
+def _haversine_km(loc1, loc2):
+    """Great-circle distance between two latitude/longitude pairs, one pair at a time."""
+    lat1, lon1 = np.radians(loc1)
+    lat2, lon2 = np.radians(loc2)
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    return 6371 * 2 * np.arcsin(np.sqrt(a))
+
+
+def _reference_compatibility(resource, need):
+    """The original per-pair compatibility score."""
+    base_compatibility = sum(0.5 for resource_type in need.resource_requirements
+                             if resource_type in resource.metadata.get('resource_types', [resource.category]))
+    quality_compatibility = max(0, resource.quality_score - need.quality_requirements.get(resource.category, 0.0))
+    distance_factor = max(0, 1 - _haversine_km(resource.location, need.location) / 10000)
+    compatibility = (base_compatibility * 0.3 + quality_compatibility * 0.25 + distance_factor * 0.2 +
+                     resource.accessibility_score * 0.15 + (1 - resource.environmental_impact) * 0.1)
+    return min(max(compatibility, 0.0), 1.0)
+
+
+def _reference_allocation_cost(resource, need):
+    """The original per-pair allocation cost."""
+    total_cost = (resource.extraction_cost + _haversine_km(resource.location, need.location) * 0.01 +
+                  resource.environmental_impact * 10 - need.urgency_level * 0.5)
+    return max(total_cost, 0.01)
+
+
+def _reference_fallback(needs, resources):
+    """The original per-need greedy fallback allocation."""
+    resource_allocations = {}
+    for need in needs:
+        resource_allocations[need.need_id] = {}
+        remaining_requirement = sum(need.resource_requirements.values())
+        available_resources = [r for r in resources if r.quantity > 0]
+        available_resources.sort(key=lambda r: _reference_compatibility(r, need), reverse=True)
+        for resource in available_resources[:3]:
+            allocation = min(remaining_requirement * 0.5, resource.quantity * 0.1)
+            if allocation > 0:
+                resource_allocations[need.need_id][resource.resource_id] = allocation
+                remaining_requirement -= allocation
+            if remaining_requirement <= 0:
+                break
+    return resource_allocations
+
+
+def _random_resources(rng, count, start=0):
+    categories = ['energy', 'water', 'food', 'materials']
+    return [
+        Resource(
+            resource_id=f"resource_{start + i}",
+            name=f"Resource {start + i}",
+            category=str(rng.choice(categories)),
+            location=(float(rng.uniform(-90, 90)), float(rng.uniform(-180, 180))),
+            quantity=float(rng.uniform(10, 1000)),
+            quality_score=float(rng.uniform(0, 1)),
+            accessibility_score=float(rng.uniform(0, 1)),
+            sustainability_rating=str(rng.choice(['renewable', 'limited_renewable', 'non_renewable'])),
+            extraction_cost=float(rng.uniform(1, 50)),
+            environmental_impact=float(rng.uniform(0, 1)),
+            last_updated=datetime(2026, 1, 1),
+            metadata={'resource_types': [str(rng.choice(categories))]}
+        )
+        for i in range(count)
+    ]
+
+
+def _random_needs(rng, count, start=0):
+    categories = ['energy', 'water', 'food', 'materials']
+    return [
+        Need(
+            need_id=f"need_{start + j}",
+            location=(float(rng.uniform(-90, 90)), float(rng.uniform(-180, 180))),
+            population_affected=int(rng.integers(100, 10000)),
+            need_type=str(rng.choice(['basic', 'development', 'enhancement'])),
+            resource_requirements={str(category): float(rng.uniform(1, 40))
+                                   for category in rng.choice(categories, int(rng.integers(1, 3)), replace=False)},
+            urgency_level=int(rng.integers(1, 11)),
+            quality_requirements={str(rng.choice(categories)): float(rng.uniform(0, 0.5))},
+            deadline=None,
+            satisfaction_level=0.0
+        )
+        for j in range(count)
+    ]
+
+
+def test_spatial_queries_match_brute_force():
+    rng = np.random.default_rng(36)
+    database = PlanetaryResourceDatabase(':memory:', index_rebuild_threshold=200)
+    try:
+        # The first batch builds the tree; later batches stay pending, and one pending resource moves
+        database.add_resources(_random_resources(rng, 600))
+        database.get_resources_in_region((0.0, 0.0), 1.0)
+        database.add_resources(_random_resources(rng, 120, start=600))
+        database.add_resources(_random_resources(rng, 1, start=650))
+        database.add_resources(_random_resources(rng, 60, start=720))
+
+        centers = [(float(rng.uniform(-90, 90)), float(rng.uniform(-180, 180))) for _ in range(40)]
+        radii = rng.uniform(100, 3000, len(centers))
+        resources = list(database.resources.values())
+        distances = np.array([[_haversine_km(center, r.location) for r in resources] for center in centers])
+
+        regions = database.get_resources_in_regions(centers, radii)
+        nearest_ids, nearest_km = database.get_nearest_resources_batch(centers, k=7)
+        assert database._tree_size == 600 and len(database._spatial_ids) == 780
+        for q in range(len(centers)):
+            expected = {resources[j].resource_id for j in np.flatnonzero(distances[q] <= radii[q])}
+            assert {r.resource_id for r in regions[q]} == expected
+
+            order = np.argsort(distances[q], kind='stable')[:7]
+            np.testing.assert_allclose(nearest_km[q], distances[q][order], rtol=1e-9, atol=1e-6)
+            assert nearest_ids[q] == [resources[j].resource_id for j in order]
+
+        # Chunking the pending scan does not change results
+        points = _unit_sphere_points(np.array(centers))
+        for expected, chunked in zip(database._query_radius_slots(points, radii),
+                                     database._query_radius_slots(points, radii, max_cells=500)):
+            np.testing.assert_array_equal(chunked, expected)
+        for expected, chunked in zip(database._query_nearest_slots(points, 7),
+                                     database._query_nearest_slots(points, 7, max_cells=500)):
+            np.testing.assert_array_equal(chunked, expected)
+    finally:
+        database.close()
+
+
+def _assert_metrics_match(solution, expected):
+    for name, value in expected.items():
+        assert getattr(solution, name) == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+def test_decomposed_metrics_match_the_assembled_matrix():
+    rng = np.random.default_rng(42)
+    needs = _random_needs(rng, 160)
+    resources = _random_resources(rng, 90)
+    engine = GlobalOptimizationEngine(None, compatibility_threshold=0.3)
+
+    solution = engine.optimize_decomposed(needs, resources, num_regions=4, transfer_radius_km=4000,
+                                          coordination_rounds=3, compare_monolithic=True)
+    report = engine.last_decomposition_report
+    assert report['shared_resources'] > 0
+    assert list(solution.resource_allocations) == [n.need_id for n in needs]
+
+    # Reference: dense metrics over the global matrix rebuilt from the solution
+    data = engine._prepare_optimization_data(needs, resources)
+    allocation_matrix = engine._allocation_dict_to_matrix(solution.resource_allocations, needs, resources)
+    assert (allocation_matrix.sum(axis=1) <= data['resource_constraints'] * (1 + 1e-9)).all()
+    _assert_metrics_match(solution, engine._calculate_solution_metrics(allocation_matrix, data, None))
+
+    coefficients = engine._objective_coefficients(data, engine.DEFAULT_OBJECTIVES)
+    assert report['objective_value'] == pytest.approx(float((coefficients * allocation_matrix).sum()), rel=1e-6)
+    assert report['objective_value'] <= report['monolithic_objective_value'] * (1 + 1e-9)
+
+
+def test_merged_regional_metrics_match_the_full_problem():
+    rng = np.random.default_rng(41)
+    needs = _random_needs(rng, 120)
+    resources = _random_resources(rng, 80)
+    engine = GlobalOptimizationEngine(None, compatibility_threshold=0.3)
+
+    results = [engine.solve_allocation_with_totals(region_needs, region_resources)
+               for region_needs, region_resources in engine.partition_problem(needs, resources, 4)]
+    solutions, metric_totals = zip(*results)
+    merged = engine.merge_solutions(list(solutions), list(metric_totals))
+    assert merged.resource_allocations.keys() == {n.need_id for n in needs}
+
+    data = engine._prepare_optimization_data(needs, resources)
+    allocation_matrix = engine._allocation_dict_to_matrix(merged.resource_allocations, needs, resources)
+    _assert_metrics_match(merged, engine._calculate_solution_metrics(allocation_matrix, data, None))
+
+
+def test_compatibility_and_cost_matrices_match_per_pair_scores():
+    rng = np.random.default_rng(38)
+    needs = _random_needs(rng, 40)
+    resources = _random_resources(rng, 30)
+    engine = GlobalOptimizationEngine(None)
+    data = engine._prepare_optimization_data(needs, resources)
+
+    expected_compatibility = [[_reference_compatibility(r, n) for n in needs] for r in resources]
+    expected_cost = [[_reference_allocation_cost(r, n) for n in needs] for r in resources]
+    np.testing.assert_allclose(data['compatibility_matrix'], expected_compatibility, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(data['cost_matrix'], expected_cost, rtol=1e-12, atol=1e-12)
+
+
+def test_fallback_solution_matches_per_need_greedy():
+    rng = np.random.default_rng(381)
+    needs = _random_needs(rng, 50)
+    resources = _random_resources(rng, 25)
+    for resource in resources[::4]:
+        resource.quantity = 0.0
+    engine = GlobalOptimizationEngine(None)
+
+    fallback = engine._create_fallback_solution(engine._prepare_optimization_data(needs, resources))
+    expected = _reference_fallback(needs, resources)
+    assert fallback.resource_allocations.keys() == expected.keys()
+    for need_id, allocations in expected.items():
+        assert list(fallback.resource_allocations[need_id]) == list(allocations)
+        np.testing.assert_allclose(list(fallback.resource_allocations[need_id].values()), list(allocations.values()))
+
+
+def test_need_snapshots_keep_only_the_training_window():
+    rng = np.random.default_rng(43)
+    needs = _random_needs(rng, 10)
+    engine = GlobalOptimizationEngine(None, snapshot_window=32)
+    start = datetime(2026, 1, 1)
+    recorded = {need.need_id: [] for need in needs}
+    for day in range(200):
+        for need in needs:
+            need.satisfaction_level = float(rng.uniform(0, 1))
+        engine.record_need_snapshots(needs, timestamp=start + timedelta(days=day))
+        for need in needs:
+            recorded[need.need_id].append((start + timedelta(days=day), engine._need_features(need)))
+
+    # Reference: training pairs over each need's last 32 snapshots
+    features, targets = [], []
+    for snapshots in recorded.values():
+        window = snapshots[-32:]
+        for a, (time_a, state_a) in enumerate(window):
+            for time_b, state_b in window[a + 1:a + 6]:
+                features.append(np.append(state_a, (time_b - time_a).total_seconds() / 86400))
+                targets.append(state_b[0])
+
+    assert all(len(snapshots) == 32 for snapshots in engine.need_snapshots.values())
+    training_features, training_targets = engine._demand_training_data()
+    np.testing.assert_array_equal(training_features, features)
+    np.testing.assert_array_equal(training_targets, targets)
+    for need in needs:
+        np.testing.assert_array_equal(engine._need_state(need), recorded[need.need_id][-1][1])
+
+
+def _reference_single_row_writes(database, resources, needs):
+    """The original one-statement, one-commit-per-record inserts."""
+    for resource in resources:
+        database.conn.execute('INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            resource.resource_id, resource.name, resource.category, resource.location[0], resource.location[1],
+            resource.quantity, resource.quality_score, resource.accessibility_score,
+            resource.sustainability_rating, resource.extraction_cost, resource.environmental_impact,
+            resource.last_updated, json.dumps(resource.metadata)))
+        database.conn.commit()
+    for need in needs:
+        database.conn.execute('INSERT OR REPLACE INTO needs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            need.need_id, need.location[0], need.location[1], need.population_affected, need.need_type,
+            json.dumps(need.resource_requirements), need.urgency_level, json.dumps(need.quality_requirements),
+            need.deadline, need.satisfaction_level, json.dumps(need.metadata)))
+        database.conn.commit()
+
+
+def test_batched_writes_match_single_row_inserts():
+    rng = np.random.default_rng(37)
+    resources = _random_resources(rng, 90)
+    needs = _random_needs(rng, 60)
+    # Later records replace earlier ones with the same id, within and across chunks
+    resources += _random_resources(rng, 15, start=40)
+    needs += _random_needs(rng, 10, start=25)
+
+    reference = PlanetaryResourceDatabase(':memory:')
+    single = PlanetaryResourceDatabase(':memory:')
+    batched = PlanetaryResourceDatabase(':memory:')
+    try:
+        _reference_single_row_writes(reference, resources, needs)
+        for resource in resources:
+            single.add_resource(resource)
+        for need in needs:
+            single.add_need(need)
+        assert batched.add_resources(iter(resources), chunk_size=7) == len(resources)
+        assert batched.add_needs(iter(needs), chunk_size=7) == len(needs)
+
+        for table, key in (('resources', 'resource_id'), ('needs', 'need_id')):
+            query = f'SELECT * FROM {table} ORDER BY {key}'
+            expected = reference.conn.execute(query).fetchall()
+            assert len(expected) == (90 if table == 'resources' else 60)
+            assert single.conn.execute(query).fetchall() == expected
+            assert batched.conn.execute(query).fetchall() == expected
+        assert batched.resources == single.resources
+        assert batched.needs == single.needs
+
+        centers = [(float(rng.uniform(-90, 90)), float(rng.uniform(-180, 180))) for _ in range(10)]
+        assert batched.get_nearest_resources_batch(centers, k=5)[0] == \
+            single.get_nearest_resources_batch(centers, k=5)[0]
+    finally:
+        reference.close()
+        single.close()
+        batched.close()
+
+
+def _reference_dense_lp(needs, resources, data, objectives, compatibility_threshold=0.0):
+    """The original dense LP, with pairs below the threshold bounded to zero; returns the maximized objective."""
+    compatibility_matrix = data['compatibility_matrix']
+    cost_matrix = data['cost_matrix']
+    n_resources, n_needs = len(resources), len(needs)
+
+    c = []
+    for i in range(n_resources):
+        for j in range(n_needs):
+            c.append(-(compatibility_matrix[i, j] * objectives['satisfaction'] +
+                       (1 / max(cost_matrix[i, j], 0.01)) * objectives['efficiency'] +
+                       (1 - resources[i].environmental_impact) * objectives['sustainability'] +
+                       needs[j].urgency_level / 10 * objectives['equity']))
+
+    A_ub, b_ub = [], []
+    for i in range(n_resources):
+        constraint = [0] * (n_resources * n_needs)
+        for j in range(n_needs):
+            constraint[i * n_needs + j] = 1
+        A_ub.append(constraint)
+        b_ub.append(resources[i].quantity)
+
+    A_eq, b_eq = [], []
+    for j in range(n_needs):
+        constraint = [0] * (n_resources * n_needs)
+        for i in range(n_resources):
+            constraint[i * n_needs + j] = compatibility_matrix[i, j]
+        A_eq.append(constraint)
+        b_eq.append(sum(needs[j].resource_requirements.values()) * 0.8)
+
+    bounds = [(0, None) if compatibility_matrix[i, j] >= compatibility_threshold else (0, 0)
+              for i in range(n_resources) for j in range(n_needs)]
+    result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
+    return -result.fun if result.success else None
+
+
+def test_sparse_lp_matches_dense_lp():
+    rng = np.random.default_rng(39)
+    engine = GlobalOptimizationEngine(None)
+    objectives = engine.DEFAULT_OBJECTIVES
+    for trial in range(6):
+        needs = _random_needs(rng, int(rng.integers(5, 25)))
+        resources = _random_resources(rng, int(rng.integers(4, 15)))
+        if trial == 5:
+            # Too little supply for the 80% requirement equalities: both formulations are infeasible
+            for resource in resources:
+                resource.quantity = 0.01
+        data = engine._prepare_optimization_data(needs, resources)
+        coefficients = engine._objective_coefficients(data, objectives)
+        capacities = np.array([r.quantity for r in resources])
+
+        for threshold in (0.0, 0.35):
+            expected = _reference_dense_lp(needs, resources, data, objectives, threshold)
+            allocation_matrix, capacity_prices, _ = _solve_allocation_lp(
+                coefficients, data['compatibility_matrix'], capacities, data['need_requirements'] * 0.8, threshold)
+            if expected is None:
+                assert allocation_matrix is None and capacity_prices is None
+                continue
+
+            assert allocation_matrix is not None
+            assert float((coefficients * allocation_matrix).sum()) == pytest.approx(expected, rel=1e-7)
+            assert (allocation_matrix >= -1e-9).all()
+            assert (allocation_matrix[data['compatibility_matrix'] < threshold] == 0).all()
+            assert (allocation_matrix.sum(axis=1) <= capacities * (1 + 1e-7)).all()
+            np.testing.assert_allclose((allocation_matrix * data['compatibility_matrix']).sum(axis=0),
+                                       data['need_requirements'] * 0.8, rtol=1e-7)
+            assert capacity_prices.shape == (len(resources),) and (capacity_prices >= -1e-9).all()
+
+
+def _reference_solution_metrics(allocation_matrix, needs, resources, compatibility_matrix, cost_matrix):
+    """The original per-element metric loops."""
+    satisfaction_levels = []
+    total_satisfaction = 0.0
+    for j, need in enumerate(needs):
+        need_satisfaction = 0.0
+        for i in range(len(resources)):
+            need_satisfaction += allocation_matrix[i, j] * compatibility_matrix[i, j]
+        satisfaction_ratio = min(need_satisfaction / max(sum(need.resource_requirements.values()), 0.001), 1.0)
+        satisfaction_levels.append(satisfaction_ratio)
+        total_satisfaction += satisfaction_ratio * need.urgency_level
+    total_satisfaction /= max(sum(n.urgency_level for n in needs), 1)
+
+    total_cost = 0.0
+    total_benefit = 0.0
+    for i in range(len(resources)):
+        for j in range(len(needs)):
+            if allocation_matrix[i, j] > 0:
+                total_cost += allocation_matrix[i, j] * cost_matrix[i, j]
+                total_benefit += allocation_matrix[i, j] * compatibility_matrix[i, j]
+
+    rating_factors = {'renewable': 1.2, 'limited_renewable': 1.0}
+    sustainability_score = 0.0
+    total_allocation = 0.0
+    environmental_impact = 0.0
+    for i, resource in enumerate(resources):
+        resource_allocation = np.sum(allocation_matrix[i, :])
+        if resource_allocation > 0:
+            sustainability_factor = (1 - resource.environmental_impact) * \
+                rating_factors.get(resource.sustainability_rating, 0.8)
+            sustainability_score += resource_allocation * sustainability_factor
+            total_allocation += resource_allocation
+        environmental_impact += resource_allocation * resource.environmental_impact
+
+    if len(satisfaction_levels) > 1:
+        equity_score = 1 - np.std(satisfaction_levels) / max(np.mean(satisfaction_levels), 0.001)
+    else:
+        equity_score = 1.0
+
+    return {
+        'total_satisfaction': total_satisfaction,
+        'efficiency_score': total_benefit / max(total_cost, 0.001),
+        'sustainability_score': sustainability_score / max(total_allocation, 0.001),
+        'equity_score': max(min(equity_score, 1.0), 0.0),
+        'implementation_cost': total_cost,
+        'environmental_impact': environmental_impact / max(total_allocation, 0.001),
+        'confidence_level': 0.8
+    }
+
+
+def test_solution_metrics_match_per_element_loops():
+    rng = np.random.default_rng(40)
+    engine = GlobalOptimizationEngine(None)
+    for trial in range(8):
+        needs = _random_needs(rng, 1 if trial == 0 else int(rng.integers(2, 30)))
+        resources = _random_resources(rng, int(rng.integers(1, 20)))
+        data = engine._prepare_optimization_data(needs, resources)
+        allocation_matrix = rng.uniform(0, 20, (len(resources), len(needs)))
+        allocation_matrix[rng.random(allocation_matrix.shape) < 0.6] = 0.0
+        if trial == 1:
+            allocation_matrix[:] = 0.0
+
+        expected = _reference_solution_metrics(allocation_matrix, needs, resources,
+                                                data['compatibility_matrix'], data['cost_matrix'])
+        metrics = engine._calculate_solution_metrics(allocation_matrix, data, engine.DEFAULT_OBJECTIVES)
+        assert metrics.keys() == expected.keys()
+        for name, value in expected.items():
+            assert metrics[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def test_validated_allocations_match_per_resource_scaling():
+    rng = np.random.default_rng(401)
+    needs = _random_needs(rng, 25)
+    resources = _random_resources(rng, 12)
+    for resource in resources[::3]:
+        resource.quantity = 5.0
+    engine = GlobalOptimizationEngine(None)
+    allocations = {need.need_id: {resource.resource_id: float(rng.uniform(0, 10))
+                                  for resource in resources if rng.random() < 0.5}
+                   for need in needs}
+
+    # Reference: the original per-resource usage sums and in-place scaling
+    expected = {need_id: dict(row) for need_id, row in allocations.items()}
+    for resource in resources:
+        usage = sum(row.get(resource.resource_id, 0.0) for row in expected.values())
+        if usage > resource.quantity:
+            for row in expected.values():
+                if resource.resource_id in row:
+                    row[resource.resource_id] *= resource.quantity / usage
+
+    solution = engine._create_fallback_solution(engine._prepare_optimization_data(needs, resources))
+    solution.resource_allocations = allocations
+    validated = engine._validate_solution(solution, needs, resources)
+    assert validated.resource_allocations.keys() == expected.keys()
+    for need_id, row in expected.items():
+        assert list(validated.resource_allocations[need_id]) == list(row)
+        np.testing.assert_allclose(list(validated.resource_allocations[need_id].values()), list(row.values()),
+                                   rtol=1e-12)
+
+
+def _random_activities(rng, count):
+    components = {
+        'direct_energy_inputs': ['solar_kwh', 'wind_kwh', 'fossil_kwh', 'geothermal_kwh'],
+        'indirect_energy_inputs': ['transport_km', 'human_hour', 'processing_unit'],
+        'materials': ['steel', 'timber', 'concrete'],
+        'basic_outputs': ['nutrition', 'shelter', 'clean_water'],
+        'development_outputs': ['education', 'healthcare'],
+        'enhancement_outputs': ['creativity', 'social_connection', 'recreation']
+    }
+    activities = []
+    for _ in range(count):
+        activity = {component: {str(key): float(rng.uniform(0, 100))
+                                for key in rng.choice(keys, int(rng.integers(0, len(keys) + 1)), replace=False)}
+                    for component, keys in components.items() if rng.random() < 0.7}
+        if rng.random() < 0.5:
+            activity['opportunity_factor'] = float(rng.uniform(0, 0.5))
+        activities.append(activity)
+    return activities
+
+
+def test_batch_accounting_matches_per_activity_methods():
+    rng = np.random.default_rng(44)
+    accounting = EnergyValueAccountingSystem()
+    accounting.conversion_factors['steel_embodied'] = 5.5
+    activities = _random_activities(rng, 300)
+    # An empty activity and one with value but no energy
+    activities += [{}, {'basic_outputs': {'nutrition': 3.0}}]
+    try:
+        table, opportunity_factors = accounting.activities_to_table(activities)
+        batch = accounting.calculate_batch(table, len(activities), opportunity_factors)
+        assert len(batch) == len(activities)
+
+        for index, activity in enumerate(activities):
+            energy_cost = accounting.calculate_energy_cost(activity)
+            life_support_value = accounting.calculate_life_support_value(activity)
+            row = batch.iloc[index]
+            for name, value in {**energy_cost, **life_support_value}.items():
+                assert row[name] == pytest.approx(value, rel=1e-12, abs=1e-12), name
+            assert row['efficiency_ratio'] == pytest.approx(
+                accounting.calculate_efficiency_ratio(energy_cost, life_support_value), rel=1e-12)
+
+        # Without explicit factors every activity uses the default opportunity factor
+        defaults = accounting.calculate_batch(table[table['activity'] < 50], 50)
+        for index in range(50):
+            activity = {key: value for key, value in activities[index].items() if key != 'opportunity_factor'}
+            assert defaults['total_energy'].iloc[index] == pytest.approx(
+                accounting.calculate_energy_cost(activity)['total_energy'], rel=1e-12, abs=1e-12)
+    finally:
+        accounting.close()
+
+
+def _reference_account_report(account):
+    """The original report over an in-memory account dict."""
+    total_energy = account.get('total_energy', 0)
+    renewable_ratio = account.get('renewable_energy', 0) / max(account.get('total_energy', 1), 1)
+    efficiency_ratio = account.get('total_value', 0) / max(account.get('total_energy', 1), 1)
+    recommendations = []
+    if efficiency_ratio < 1.0:
+        recommendations.append("Consider process optimization to improve energy efficiency")
+    if renewable_ratio < 0.8:
+        recommendations.append("Increase use of renewable energy sources")
+    if account.get('environmental_impact', 0) > 0.3:
+        recommendations.append("Implement measures to reduce environmental impact")
+    return {
+        'efficiency_metrics': {
+            'energy_intensity': total_energy / max(account.get('output_quantity', 1), 1),
+            'value_density': account.get('total_value', 0) / max(account.get('total_energy', 1), 1),
+            'sustainability_score': min(max(renewable_ratio * (1 - account.get('environmental_impact', 0.5)),
+                                            0.0), 1.0)
+        },
+        'recommendations': recommendations
+    }
+
+
+def test_ledger_balances_match_in_memory_accounts(tmp_path):
+    rng = np.random.default_rng(45)
+    accounting = EnergyValueAccountingSystem(str(tmp_path / 'ledger.db'))
+    account_ids = [f"account_{k:02d}" for k in range(23)]
+    accounts = {}
+    impact_energy = {}
+
+    def remember(account_id, flows):
+        account = accounts.setdefault(account_id, {})
+        for name in EnergyValueAccountingSystem.LEDGER_FIELDS[:-1]:
+            account[name] = account.get(name, 0.0) + flows.get(name, 0.0)
+        impact_energy[account_id] = impact_energy.get(account_id, 0.0) + \
+            flows.get('environmental_impact', 0.0) * flows.get('total_energy', 0.0)
+
+    try:
+        for activity in _random_activities(rng, 200):
+            account_id = str(rng.choice(account_ids))
+            flows = accounting.record_activity(account_id, activity, float(rng.uniform(0, 50)),
+                                               float(rng.uniform(0, 1)))
+            remember(account_id, flows)
+
+        entries = [(str(rng.choice(account_ids)), {'direct_energy': float(rng.uniform(0, 10)),
+                                                   'total_value': float(rng.uniform(0, 30)),
+                                                   'output_quantity': float(rng.uniform(0, 5))})
+                   for _ in range(500)]
+        entries.append(('account_zero', {'total_value': 4.0}))
+        for entry in entries:
+            entry[1]['total_energy'] = entry[1].get('direct_energy', 0.0)
+        assert accounting.post_entries(iter(entries), chunk_size=64) == len(entries)
+        for account_id, flows in entries:
+            remember(account_id, flows)
+
+        for account_id, account in accounts.items():
+            if account['total_energy'] > 0:
+                account['environmental_impact'] = impact_energy[account_id] / account['total_energy']
+
+        assert sorted(accounting.energy_accounts) == sorted(accounts)
+        assert len(accounting.energy_accounts) == len(accounts)
+        reports = [report for chunk in accounting.iter_account_reports(chunk_size=5) for report in chunk]
+        assert [report['account_id'] for report in reports] == sorted(accounts)
+
+        for report in reports:
+            account_id = report['account_id']
+            expected = accounts[account_id]
+            ledger_account = accounting.get_account(account_id)
+            assert ledger_account.keys() - {'entry_count', 'last_updated'} == expected.keys()
+            for name, value in expected.items():
+                assert ledger_account[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+            assert ledger_account['entry_count'] == len(accounting.get_account_entries(account_id))
+
+            expected_report = _reference_account_report(expected)
+            for single in (report, accounting.generate_energy_account_report(account_id)):
+                assert single['recommendations'] == expected_report['recommendations']
+                for name, value in expected_report['efficiency_metrics'].items():
+                    assert single['efficiency_metrics'][name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+        # Running totals agree with the append-only entries they summarize
+        entry_sums = accounting.get_account_entries('account_00')[list(EnergyValueAccountingSystem.LEDGER_FIELDS)].sum()
+        for name in EnergyValueAccountingSystem.LEDGER_FIELDS[:-1]:
+            assert entry_sums[name] == pytest.approx(accounts['account_00'][name], rel=1e-9, abs=1e-9)
+        assert accounting.generate_energy_account_report('missing') == {'error': 'Account not found'}
+    finally:
+        accounting.close()